@@ -0,0 +1,90 @@
+"""
+Сравнение скорости чтения XLSX: read_operations_from_excel, iter_operations_from_excel
+и iter_operations_from_xlsx (разбор XML без openpyxl).
+
+Строки из data/transactions_excel.xlsx размножаются до нужного количества
+и записываются во временный файл, после чего оба загрузчика читают его.
+
+Запуск из корня проекта:
+    python benchmarks/bench_excel_ingest.py --rows 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from openpyxl import Workbook, load_workbook  # noqa: E402
+
+from src.file_operations.file_operations import (  # noqa: E402
+    iter_operations_from_excel,
+    read_operations_from_excel,
+)
+from src.file_operations.xlsx_reader import iter_operations_from_xlsx  # noqa: E402
+
+SOURCE_PATH = os.path.join(project_root, "data", "transactions_excel.xlsx")
+
+
+def build_scaled_workbook(target_path: str, rows: int) -> None:
+    """Записывает книгу с rows строками данных, повторяя строки исходного файла."""
+    source = load_workbook(SOURCE_PATH, read_only=True)
+    source_rows = list(source.active.iter_rows(values_only=True))
+    source.close()
+    header, data = source_rows[0], source_rows[1:]
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for i in range(rows):
+        row = list(data[i % len(data)])
+        row[0] = i + 1  # Уникальные id
+        sheet.append(row)
+    workbook.save(target_path)
+
+
+def measure(name: str, func) -> None:
+    """
+    Печатает время работы и пиковое потребление памяти функции.
+    Память измеряется отдельным прогоном: tracemalloc сильно замедляет выполнение.
+    """
+    started = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<32} {count:>9} строк  {elapsed:8.2f} с  пик {peak / 2**20:8.1f} МБ")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000, help="Количество строк")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "scaled.xlsx")
+        build_scaled_workbook(path, args.rows)
+        print(f"Файл: {args.rows} строк, {os.path.getsize(path) / 2**20:.1f} МБ")
+
+        measure(
+            "read_operations_from_excel", lambda: len(read_operations_from_excel(path))
+        )
+        measure(
+            "iter_operations_from_excel",
+            lambda: sum(1 for _ in iter_operations_from_excel(path)),
+        )
+        measure(
+            "iter_operations_from_xlsx",
+            lambda: sum(1 for _ in iter_operations_from_xlsx(path)),
+        )
+
+
+if __name__ == "__main__":
+    main()
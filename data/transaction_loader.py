@@ -1,6 +1,8 @@
 import csv
 import logging
 import os
+from itertools import islice
+from typing import Iterator
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -16,6 +18,52 @@ file_handler.setFormatter(formatter)
 logger.addHandler(file_handler)
 
 
+# Обязательные заголовки CSV-файла с транзакциями
+REQUIRED_HEADERS = [
+    "id",
+    "description",
+    "amount",
+    "currency",
+    "date",
+    "status",
+    "from",
+    "to",
+]
+
+
+def _read_transactions(file_path: str) -> Iterator[dict]:
+    """
+    Построчно читает транзакции из CSV-файла.
+    Некорректные строки записываются в лог и пропускаются,
+    ошибки чтения самого файла пробрасываются вызывающему коду.
+    """
+    with open(file_path, mode="r", newline="", encoding="utf-8") as csvfile:
+        reader = csv.DictReader(csvfile)
+        if not all(header in reader.fieldnames for header in REQUIRED_HEADERS):
+            logger.error(
+                f"Отсутствуют обязательные заголовки в CSV-файле: {REQUIRED_HEADERS}. Найдено: {reader.fieldnames}"
+            )
+            return
+
+        for row in reader:
+            try:
+                yield {
+                    "id": int(row["id"]),
+                    "description": row["description"],
+                    "amount": float(row["amount"]),
+                    "currency": row["currency"],
+                    "date": row["date"],
+                    "status": row["status"],
+                    # .get() на случай отсутствия значения
+                    "from": row.get("from", ""),
+                    "to": row.get("to", ""),
+                }
+            except (ValueError, KeyError) as e:
+                logger.warning(
+                    f"Пропущена строка из-за некорректных данных: {row}. Ошибка: {e}"
+                )
+
+
 def load_transactions_from_csv(file_path: str) -> list[dict]:
     """
     Загружает данные о банковских операциях из CSV-файла.
@@ -31,61 +79,52 @@ def load_transactions_from_csv(file_path: str) -> list[dict]:
         list[dict]: Список словарей, где каждый словарь представляет одну транзакцию.
                     Возвращает пустой список, если файл не найден или произошла ошибка.
     """
-    transactions = []
     if not os.path.exists(file_path):
         logger.error(f"Файл не найден: {file_path}")
         return []
 
     try:
-        with open(file_path, mode="r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            # Обновленный список обязательных полей
-            required_headers = [
-                "id",
-                "description",
-                "amount",
-                "currency",
-                "date",
-                "status",
-                "from",
-                "to",
-            ]
-            if not all(header in reader.fieldnames for header in required_headers):
-                logger.error(
-                    f"Отсутствуют обязательные заголовки в CSV-файле: {required_headers}. Найдено: {reader.fieldnames}"
-                )
-                return []
-
-            for row in reader:
-                try:
-                    transaction = {
-                        "id": int(row["id"]),
-                        "description": row["description"],
-                        "amount": float(row["amount"]),
-                        "currency": row["currency"],
-                        "date": row["date"],  # Добавлено
-                        "status": row["status"],  # Добавлено
-                        "from": row.get(
-                            "from", ""
-                        ),  # Добавлено, используем .get() на случай отсутствия
-                        "to": row.get(
-                            "to", ""
-                        ),  # Добавлено, используем .get() на случай отсутствия
-                    }
-                    transactions.append(transaction)
-                except (ValueError, KeyError) as e:
-                    logger.warning(
-                        f"Пропущена строка из-за некорректных данных: {row}. Ошибка: {e}"
-                    )
-            logger.info(
-                f"Успешно загружено {len(transactions)} транзакций из {file_path}."
-            )
+        transactions = list(_read_transactions(file_path))
+        logger.info(f"Успешно загружено {len(transactions)} транзакций из {file_path}.")
     except Exception as e:
         logger.error(f"Ошибка при чтении CSV файла {file_path}: {e}")
         transactions = []
     return transactions
 
 
+def iter_transactions_from_csv(
+    file_path: str, batch_size: int | None = None
+) -> Iterator:
+    """
+    Потоковый вариант load_transactions_from_csv.
+
+    Args:
+        file_path (str): Полный путь к CSV-файлу.
+        batch_size (int | None): Если задан, транзакции отдаются списками
+                                 не длиннее batch_size, иначе по одной.
+
+    Yields:
+        dict | list[dict]: Транзакция или пакет транзакций.
+                           При ошибке чтения файла генератор записывает ее в лог и завершается.
+    """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size должен быть положительным числом")
+
+    if not os.path.exists(file_path):
+        logger.error(f"Файл не найден: {file_path}")
+        return
+
+    try:
+        transactions = _read_transactions(file_path)
+        if batch_size is None:
+            yield from transactions
+        else:
+            while batch := list(islice(transactions, batch_size)):
+                yield batch
+    except Exception as e:
+        logger.error(f"Ошибка при чтении CSV файла {file_path}: {e}")
+
+
 if __name__ == "__main__":
     # Пример использования (можно удалить в финальной версии, но полезно для тестирования)
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -4,6 +4,11 @@ import os
 import re
 from collections import Counter
 
+from src.analysis.index_coverage import index_covers
+from src.analysis.keyword_matcher import matcher_for
+from src.analysis.text_index import TextIndex
+from src.utils.text_search import description_matcher
+
 # Настройка логгера для модуля
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -17,18 +22,24 @@ logger.addHandler(file_handler)
 
 
 def find_transactions_by_description(
-    transactions: list[dict], search_string: str
+    transactions: list[dict], search_string: str, index: TextIndex | None = None
 ) -> list[dict]:
     """
     Фильтрует список банковских операций, возвращая те, у которых в описании
     (поле 'description') содержится заданная строка поиска.
 
     Поиск выполняется с использованием регулярных выражений, без учета регистра.
+    Строка без метасимволов ищется как обычная подстрока, что заметно быстрее;
+    скомпилированные выражения кешируются между вызовами.
+    С индексом выражение проверяется один раз для каждого различного описания.
 
     Args:
         transactions (list[dict]): Список словарей с данными о банковских операциях.
                                    Каждый словарь должен содержать ключ 'description'.
         search_string (str): Строка или регулярное выражение для поиска в описании.
+        index (TextIndex | None): Текстовый индекс, построенный по transactions.
+                                  Индекс по другим операциям не используется:
+                                  тогда выполняется обычный просмотр.
 
     Returns:
         list[dict]: Отфильтрованный список словарей, соответствующих условию поиска.
@@ -43,15 +54,22 @@ def find_transactions_by_description(
         )
         return transactions
 
-    filtered_transactions = []
+    if index is not None and not index_covers(index, transactions):
+        logger.warning(
+            "Текстовый индекс построен не по переданным транзакциям и не будет использован."
+        )
+        index = None
+
     try:
-        # Компилируем регулярное выражение для более эффективного поиска
-        # re.IGNORECASE для поиска без учета регистра
-        pattern = re.compile(search_string, re.IGNORECASE)
-        for transaction in transactions:
-            description = transaction.get("description", "")
-            if pattern.search(description):
-                filtered_transactions.append(transaction)
+        if index is not None:
+            filtered_transactions = index.search(search_string)
+        else:
+            matches = description_matcher(search_string)
+            filtered_transactions = [
+                transaction
+                for transaction in transactions
+                if matches(transaction.get("description", ""))
+            ]
         logger.info(
             f"Найдено {len(filtered_transactions)} транзакций с описанием, содержащим '{search_string}'."
         )
@@ -94,23 +112,35 @@ def count_transactions_by_category(
         logger.warning("Передан пустой список категорий для подсчета.")
         return {}
 
-    category_counts = Counter()
+    # Каждое описание просматривается один раз автоматом по всем ключевым словам
+    keywords = tuple(dict.fromkeys(cat.lower() for cat in categories if cat))
+    matcher = matcher_for(keywords) if keywords else None
+    keyword_counts = [0] * len(keywords)
+    described = 0
+    # Описания повторяются, поэтому найденные в описании слова запоминаются
+    found_by_description = {}
 
     for transaction in transactions:
         description = transaction.get("description", "")
         if description:
-            # Преобразуем описание к нижнему регистру один раз для сравнения
-            lower_description = description.lower()
-            for category_name in categories:
-                # Теперь ищем категорию как подстроку в описании без использования re
-                # Так как по условию re нужен только для первой функции
-                if category_name.lower() in lower_description:
-                    category_counts[category_name] += 1
-
-    # Убедимся, что все запрошенные категории присутствуют в словаре, даже если их count=0
+            described += 1
+            found = found_by_description.get(description)
+            if found is None:
+                found = matcher.find(description.lower()) if matcher else ()
+                found_by_description[description] = found
+            for number in found:
+                keyword_counts[number] += 1
+
+    # Как и при проверке каждой категории по очереди: повторяющаяся категория
+    # учитывается столько раз, сколько она указана, а пустая строка
+    # совпадает с любым непустым описанием
+    keyword_numbers = {keyword: number for number, keyword in enumerate(keywords)}
+    category_counts = Counter()
     for cat in categories:
-        if cat not in category_counts:
-            category_counts[cat] = 0
+        if cat:
+            category_counts[cat] += keyword_counts[keyword_numbers[cat.lower()]]
+        else:
+            category_counts[cat] += described
 
     logger.info(f"Подсчет категорий завершен. Результат: {dict(category_counts)}")
     return dict(category_counts)
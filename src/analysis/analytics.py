@@ -1,6 +1,11 @@
 # src/analysis/analytics.py
 import logging
 from datetime import datetime
+from typing import Iterable
+
+from src.analysis.date_index import DateIndex
+from src.analysis.index_coverage import index_covers
+from src.utils.dates import parse_date
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -25,14 +30,31 @@ if not any(
     logger.addHandler(file_handler)
 
 
+def _checked_index(
+    index: DateIndex | None, transactions: list[dict]
+) -> DateIndex | None:
+    """Возвращает индекс, если он построен по transactions, иначе None с предупреждением."""
+    if index is None or index_covers(index, transactions):
+        return index
+    logger.warning(
+        "Индекс дат построен не по переданным транзакциям и не будет использован."
+    )
+    return None
+
+
 def get_transactions_by_date(
-    transactions: list[dict], target_date_str: str
+    transactions: list[dict], target_date_str: str, index: DateIndex | None = None
 ) -> list[dict]:
     """
     Фильтрует список транзакций, возвращая только те, которые произошли в указанную дату.
     Args:
         transactions (list[dict]): Список словарей, представляющих транзакции.
         target_date_str (str): Целевая дата в формате 'ДД.ММ.ГГГГ'.
+            Даты транзакций могут быть в формате 'ДД.ММ.ГГГГ' или ISO.
+        index (DateIndex | None): Индекс дат, построенный по transactions.
+            С ним запрос выполняется бинарным поиском, без просмотра всего списка;
+            найденные транзакции идут в хронологическом порядке.
+            Индекс по другим транзакциям не используется: выполняется обычный просмотр.
     Returns:
         list[dict]: Список транзакций, произошедших в указанную дату.
     """
@@ -40,25 +62,30 @@ def get_transactions_by_date(
     try:
         target_date = datetime.strptime(target_date_str, "%d.%m.%Y").date()
         logger.debug(f"Поиск транзакций за дату: {target_date_str}")
+        index = _checked_index(index, transactions)
+        if index is not None:
+            filtered_transactions = index.on_day(target_date)
+            logger.info(
+                f"Найдено {len(filtered_transactions)} транзакций за {target_date_str} (по индексу)."
+            )
+            return filtered_transactions
         for transaction in transactions:
-            try:
-                transaction_date_str = transaction.get("date")
-                if transaction_date_str:
-                    transaction_date = datetime.strptime(
-                        transaction_date_str, "%d.%m.%Y"
-                    ).date()
-                    if transaction_date == target_date:
-                        filtered_transactions.append(transaction)
-            except ValueError:
+            transaction_date_str = transaction.get("date")
+            if not transaction_date_str:
+                continue
+            if not isinstance(transaction_date_str, str):
                 logger.warning(
-                    f"Некорректный формат даты в транзакции: {transaction.get('date')}. Пропущена."
+                    f"Тип данных даты в транзакции некорректен: {transaction_date_str}. Пропущена."
                 )
                 continue
-            except TypeError:
+            transaction_date = parse_date(transaction_date_str)
+            if transaction_date is None:
                 logger.warning(
-                    f"Тип данных даты в транзакции некорректен: {transaction.get('date')}. Пропущена."
+                    f"Некорректный формат даты в транзакции: {transaction_date_str}. Пропущена."
                 )
                 continue
+            if transaction_date.date() == target_date:
+                filtered_transactions.append(transaction)
         logger.info(
             f"Найдено {len(filtered_transactions)} транзакций за {target_date_str}."
         )
@@ -71,6 +98,71 @@ def get_transactions_by_date(
     return filtered_transactions
 
 
+def get_transactions_by_dates(
+    transactions: Iterable[dict],
+    target_date_strs: Iterable[str],
+    index: DateIndex | None = None,
+) -> dict[str, list[dict]]:
+    """
+    Пакетный вариант get_transactions_by_date: группирует транзакции
+    сразу по нескольким датам за один проход.
+    Дата каждой транзакции разбирается ровно один раз,
+    поэтому месячная выписка не требует 30 полных просмотров.
+    Args:
+        transactions (Iterable[dict]): Транзакции (список или потоковый загрузчик).
+        target_date_strs (Iterable[str]): Целевые даты в формате 'ДД.ММ.ГГГГ'.
+        index (DateIndex | None): Индекс дат, построенный по transactions;
+            с ним каждая дата ищется бинарным поиском.
+            Индекс по другим транзакциям не используется: выполняется обычный просмотр.
+    Returns:
+        dict[str, list[dict]]: Транзакции для каждой корректной целевой даты
+            (ключи — целевые даты в том виде, как они переданы).
+            Некорректные целевые даты записываются в лог и в результат не попадают.
+    """
+    targets = {}
+    for target_date_str in target_date_strs:
+        try:
+            targets[target_date_str] = datetime.strptime(
+                target_date_str, "%d.%m.%Y"
+            ).date()
+        except (ValueError, TypeError):
+            logger.error(
+                f"Некорректный формат целевой даты: '{target_date_str}'. Ожидается ДД.ММ.ГГГГ."
+            )
+
+    if index is not None:
+        # Для проверки индекса потоковый вход нужно материализовать
+        if not isinstance(transactions, list):
+            transactions = list(transactions)
+        index = _checked_index(index, transactions)
+        if index is not None:
+            return {
+                target_date_str: index.on_day(target_date)
+                for target_date_str, target_date in targets.items()
+            }
+
+    buckets = {target_date: [] for target_date in targets.values()}
+    skipped = 0
+    for transaction in transactions:
+        transaction_date = parse_date(transaction.get("date"))
+        if transaction_date is None:
+            skipped += 1
+            continue
+        bucket = buckets.get(transaction_date.date())
+        if bucket is not None:
+            bucket.append(transaction)
+    if skipped:
+        logger.warning(
+            f"Пропущено {skipped} транзакций без даты или с некорректной датой."
+        )
+
+    logger.info(f"Транзакции сгруппированы по {len(buckets)} датам за один проход.")
+    return {
+        target_date_str: list(buckets[target_date])
+        for target_date_str, target_date in targets.items()
+    }
+
+
 def get_card_number_masked(card_number: str) -> str:
     """
     Маскирует номер карты, оставляя открытыми первые 6 и последние 4 цифры.
@@ -0,0 +1,164 @@
+# src/analysis/bitmap_index.py
+# Битовые индексы по полям с небольшим числом значений (статус, валюта).
+from collections import defaultdict
+from itertools import compress
+from typing import Iterable
+
+from src.models.versioned_list import VersionedList, VersionedListView
+
+# Индексируемые по умолчанию поля плоской схемы
+DEFAULT_FIELDS = ("state", "currency_code")
+
+# Перевод строки из '0'/'1' в байты 0/1 для itertools.compress
+_BIT_TABLE = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def bitmap_to_mask(bitmap: int) -> bytes:
+    """Маска из байтов 0/1 (позиция 0 — первый байт) для итерации по битам bitmap."""
+    return format(bitmap, "b")[::-1].encode("ascii").translate(_BIT_TABLE)
+
+
+class BitmapIndex:
+    """
+    Битовый индекс одного поля: для каждого значения — целое число,
+    в котором бит i установлен, если у операции с позицией i это значение.
+
+    Пересечение и объединение условий — это & и | над целыми числами,
+    которые Python выполняет по машинным словам, а не по операциям.
+
+    Добавленные позиции сначала копятся в списках и переводятся в биты
+    одним проходом при первом запросе, поэтому пополнение по одной операции
+    не пересоздает большие числа на каждом шаге.
+    """
+
+    def __init__(self, field: str, operations: Iterable = ()):
+        self.field = field
+        self.size = 0
+        self._bitmaps: dict[object, int] = {}
+        self._pending: dict[object, list[int]] = defaultdict(list)
+        self.extend(operations)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, operation) -> None:
+        self._pending[operation.get(self.field)].append(self.size)
+        self.size += 1
+
+    def extend(self, operations: Iterable) -> None:
+        pending = self._pending
+        field = self.field
+        position = self.size
+        for operation in operations:
+            pending[operation.get(field)].append(position)
+            position += 1
+        self.size = position
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        for value, positions in self._pending.items():
+            # Позиции возрастают, поэтому буфер покрывает только добавленный
+            # диапазон байтов, а не весь индекс от нулевой позиции
+            first_byte = positions[0] >> 3
+            bits = bytearray((positions[-1] >> 3) - first_byte + 1)
+            for position in positions:
+                bits[(position >> 3) - first_byte] |= 1 << (position & 7)
+            delta = int.from_bytes(bits, "little") << (first_byte * 8)
+            self._bitmaps[value] = self._bitmaps.get(value, 0) | delta
+        self._pending.clear()
+
+    def values(self) -> list:
+        """Значения поля, встречающиеся в индексе."""
+        self._flush()
+        return list(self._bitmaps)
+
+    def bitmap(self, *values) -> int:
+        """Битовая маска операций, у которых поле равно любому из values."""
+        self._flush()
+        result = 0
+        for value in values:
+            result |= self._bitmaps.get(value, 0)
+        return result
+
+    def count(self, *values) -> int:
+        return self.bitmap(*values).bit_count()
+
+
+class OperationIndex:
+    """
+    Операции вместе с битовыми индексами по нескольким полям.
+
+    Индексы строятся один раз и пополняются при append/extend.
+    Условия вида «EXECUTED и (USD или EUR)» вычисляются как
+    index.bitmap("state", "EXECUTED") & index.bitmap("currency_code", "USD", "EUR"),
+    а select превращает результат в список операций в исходном порядке.
+
+    operations — представление только для чтения над VersionedList:
+    пополнять индекс можно только через append/extend, иначе битовые маски
+    разошлись бы с данными. Кеш результатов запросов (QueryCache)
+    замечает пополнение индекса по operations.version.
+    """
+
+    def __init__(
+        self, operations: Iterable = (), fields: Iterable[str] = DEFAULT_FIELDS
+    ):
+        self._operations = VersionedList()
+        self._view = VersionedListView(self._operations)
+        self.indexes = {field: BitmapIndex(field) for field in fields}
+        self.extend(operations)
+
+    @property
+    def operations(self) -> VersionedListView:
+        """Операции индекса только для чтения (всегда один и тот же объект)."""
+        return self._view
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def append(self, operation) -> None:
+        self._operations.append(operation)
+        for index in self.indexes.values():
+            index.append(operation)
+
+    def extend(self, operations: Iterable) -> None:
+        start = len(self._operations)
+        self._operations.extend(operations)
+        added = self._operations[start:]
+        for index in self.indexes.values():
+            index.extend(added)
+
+    @property
+    def all(self) -> int:
+        """Маска всех операций (для отрицания: index.all & ~mask)."""
+        return (1 << len(self._operations)) - 1
+
+    def bitmap(self, field: str, *values) -> int:
+        """Маска операций, у которых field равно любому из values (ИЛИ)."""
+        return self.indexes[field].bitmap(*values)
+
+    def where(self, **conditions) -> int:
+        """
+        Маска по условиям на поля, объединенным через И.
+        Значение условия — одно значение или кортеж/список/множество значений (ИЛИ).
+        """
+        result = self.all
+        for field, values in conditions.items():
+            if not isinstance(values, (tuple, list, set, frozenset)):
+                values = (values,)
+            result &= self.bitmap(field, *values)
+        return result
+
+    def select(self, bitmap: int) -> list:
+        """Операции, отмеченные в bitmap, в исходном порядке."""
+        return list(compress(self._operations, bitmap_to_mask(bitmap)))
+
+    # --- Аналоги функций для списков ---
+
+    def filter_by_state(self, state: str = "EXECUTED") -> list:
+        """Аналог processing.filter_by_state."""
+        return self.select(self.bitmap("state", state))
+
+    def filter_by_currency(self, currency_code: str) -> list:
+        """Аналог generators.filter_by_currency для операций плоской схемы."""
+        return self.select(self.bitmap("currency_code", currency_code.upper()))
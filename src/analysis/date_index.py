@@ -0,0 +1,66 @@
+# src/analysis/date_index.py
+# Отсортированный индекс дат для быстрых запросов по дню и диапазону.
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from src.utils.dates import MISSING_DATE, epoch_microseconds, to_epoch_microseconds
+
+
+class DateIndex:
+    """
+    Индекс операций по дате, который строится один раз по набору данных.
+
+    Ключи дат хранятся в отсортированном array('q'), а рядом — индексы операций
+    в исходном списке. Любой запрос по дню, неделе, месяцу или диапазону
+    находит границы двумя бинарными поисками за O(log n) и возвращает
+    k найденных операций за O(k), без полного просмотра и повторного разбора дат.
+
+    Операции без распознанной даты в индекс не попадают.
+    Найденные операции возвращаются в хронологическом порядке,
+    а при одинаковой дате — в исходном порядке.
+    """
+
+    def __init__(self, operations: Iterable):
+        self.operations = list(operations)
+        keys = array(
+            "q", (to_epoch_microseconds(op.get("date")) for op in self.operations)
+        )
+        order = sorted(
+            (i for i, key in enumerate(keys) if key != MISSING_DATE),
+            key=keys.__getitem__,
+        )
+        self.positions = array("q", order)
+        self.keys = array("q", (keys[i] for i in order))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _slice(self, low: int, high: int) -> list:
+        start = bisect_left(self.keys, low)
+        end = bisect_left(self.keys, high, start)
+        operations = self.operations
+        return [operations[i] for i in self.positions[start:end]]
+
+    def range(self, start: date | datetime, end: date | datetime) -> list:
+        """Операции с датой в полуинтервале [start, end)."""
+        return self._slice(epoch_microseconds(start), epoch_microseconds(end))
+
+    def on_day(self, day: date | datetime | str) -> list:
+        """Операции за календарный день; строка принимается в формате ДД.ММ.ГГГГ."""
+        if isinstance(day, str):
+            day = datetime.strptime(day, "%d.%m.%Y")
+        start = datetime(day.year, day.month, day.day)
+        return self.range(start, start + timedelta(days=1))
+
+    def in_week(self, day: date | datetime) -> list:
+        """Операции за календарную неделю (с понедельника), в которую входит day."""
+        start = datetime(day.year, day.month, day.day) - timedelta(days=day.weekday())
+        return self.range(start, start + timedelta(days=7))
+
+    def in_month(self, year: int, month: int) -> list:
+        """Операции за календарный месяц."""
+        start = datetime(year, month, 1)
+        end = datetime(year + month // 12, month % 12 + 1, 1)
+        return self.range(start, end)
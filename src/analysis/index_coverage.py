@@ -0,0 +1,19 @@
+# src/analysis/index_coverage.py
+# Проверка, что индекс (DateIndex, TextIndex) построен по переданным операциям.
+from typing import Sequence
+
+
+def index_covers(index, operations: Sequence) -> bool:
+    """
+    Проверяет, что индекс построен ровно по этим операциям и в том же порядке.
+
+    Индексы хранят свой список операций, поэтому сравниваются сами объекты:
+    индекс по другому или устаревшему списку вернул бы чужие строки.
+    Проверка идет за O(n) сравнений по identity, без разбора дат и описаний.
+    """
+    indexed = index.operations
+    if indexed is operations:
+        return True
+    if len(indexed) != len(operations):
+        return False
+    return all(a is b for a, b in zip(indexed, operations))
@@ -0,0 +1,75 @@
+# src/analysis/keyword_matcher.py
+# Поиск сразу многих ключевых слов в тексте за один проход (алгоритм Ахо — Корасик).
+from collections import deque
+from functools import lru_cache
+from typing import Iterable
+
+# Сколько автоматов для различных наборов ключевых слов хранится в кеше
+MATCHER_CACHE_SIZE = 32
+
+
+class KeywordMatcher:
+    """
+    Автомат Ахо — Корасик для набора непустых ключевых слов.
+
+    find проходит текст один раз и возвращает номера всех ключевых слов,
+    которые встречаются в нем как подстроки, включая перекрывающиеся
+    и вложенные друг в друга. Время — O(длина текста + число совпадений)
+    независимо от количества ключевых слов.
+    Сравнение точное, регистр приводится вызывающей стороной.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(keywords)
+        if not all(self.keywords):
+            raise ValueError("Ключевые слова не должны быть пустыми")
+
+        # Бор: переходы, ссылка неудачи и номера слов, заканчивающихся в состоянии
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+
+        for number, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (number,)
+
+        # Ссылки неудачи обходом в ширину; выходы наследуются по ссылке неудачи
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> set[int]:
+        """Номера ключевых слов, которые встречаются в text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def matcher_for(keywords: tuple[str, ...]) -> KeywordMatcher:
+    """Автомат для набора ключевых слов, построенный один раз на набор."""
+    return KeywordMatcher(keywords)
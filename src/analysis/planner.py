@@ -0,0 +1,266 @@
+# src/analysis/planner.py
+# Планировщик условий запроса: порядок проверки по селективности и стоимости.
+from collections import Counter
+from typing import Callable, Iterable, Iterator
+
+from src.analysis.bitmap_index import DEFAULT_FIELDS, OperationIndex
+from src.utils.dates import MISSING_DATE, to_epoch_microseconds
+
+# Относительная стоимость проверки одной строки для каждого вида условия
+COST_EQUALITY = 1.0
+COST_DATE = 4.0
+COST_CUSTOM = 10.0
+COST_REGEX = 20.0
+
+# Оценки селективности, когда статистики по столбцу нет
+DEFAULT_SELECTIVITY = {
+    "eq": 0.3,
+    "date": 0.3,
+    "description": 0.1,
+    "custom": 0.5,
+}
+
+
+class Condition:
+    """
+    Одно условие запроса: вид, поле, значения, функция проверки и стоимость.
+
+    Вид 'eq' (равенство полю одного из values) может вычисляться по битовому индексу,
+    'date' — диапазон [low, high) по ключу даты, 'description' — регулярное выражение,
+    'custom' — произвольная функция.
+    """
+
+    __slots__ = ("kind", "field", "values", "test", "cost", "label")
+
+    def __init__(
+        self,
+        kind: str,
+        test: Callable[[object], bool],
+        cost: float,
+        label: str,
+        field: str | None = None,
+        values: tuple = (),
+    ):
+        self.kind = kind
+        self.test = test
+        self.cost = cost
+        self.label = label
+        self.field = field
+        self.values = values
+
+    def __repr__(self) -> str:
+        return f"Condition({self.label})"
+
+
+class ColumnStats:
+    """Число строк, частоты значений полей и границы дат набора данных."""
+
+    def __init__(
+        self, operations: Iterable = (), fields: Iterable[str] = DEFAULT_FIELDS
+    ):
+        self.fields = tuple(fields)
+        self.counts = {field: Counter() for field in self.fields}
+        self.rows = 0
+        self.min_date = None
+        self.max_date = None
+        for op in operations:
+            self.rows += 1
+            for field in self.fields:
+                self.counts[field][op.get(field)] += 1
+            key = to_epoch_microseconds(op.get("date"))
+            if key != MISSING_DATE:
+                if self.min_date is None or key < self.min_date:
+                    self.min_date = key
+                if self.max_date is None or key > self.max_date:
+                    self.max_date = key
+
+    def equality_selectivity(self, field: str, values: tuple) -> float | None:
+        counts = self.counts.get(field)
+        if counts is None or not self.rows:
+            return None
+        return sum(counts[value] for value in values) / self.rows
+
+    def range_selectivity(self, low: int, high: int) -> float | None:
+        """Доля строк в [low, high) в предположении равномерного распределения дат."""
+        if self.min_date is None or not self.rows:
+            return None
+        span = self.max_date - self.min_date + 1
+        overlap = min(high, self.max_date + 1) - max(low, self.min_date)
+        return max(0.0, min(1.0, overlap / span))
+
+
+class Stage:
+    """Шаг плана с оценкой и фактическим числом строк (заполняется при explain)."""
+
+    __slots__ = ("description", "conditions", "selectivity", "visited", "passed")
+
+    def __init__(self, description: str, conditions: list, selectivity: float):
+        self.description = description
+        self.conditions = conditions
+        self.selectivity = selectivity
+        self.visited = None
+        self.passed = None
+
+
+class Plan:
+    """Выбранный порядок выполнения условий."""
+
+    def __init__(self, index_stage: Stage | None, filter_stages: list, index=None):
+        self.index_stage = index_stage
+        self.filter_stages = filter_stages
+        self.index = index
+
+    def _uses_index(self, source) -> bool:
+        return self.index_stage is not None and source is self.index.operations
+
+    def _index_candidates(self) -> list:
+        mask = self.index.all
+        for condition in self.index_stage.conditions:
+            mask &= self.index.bitmap(condition.field, *condition.values)
+        return self.index.select(mask)
+
+    def run(self, source: Iterable) -> Iterator:
+        """Выполняет условия одним проходом (после отбора по индексу, если он есть)."""
+        stages = self.filter_stages
+        if self._uses_index(source):
+            source = self._index_candidates()
+        elif self.index_stage is not None:
+            stages = [self.index_stage] + stages
+
+        tests = [condition.test for stage in stages for condition in stage.conditions]
+        if not tests:
+            return iter(source)
+        if len(tests) == 1:
+            return filter(tests[0], source)
+
+        def fused(op) -> bool:
+            for test in tests:
+                if not test(op):
+                    return False
+            return True
+
+        return filter(fused, source)
+
+    def run_counted(self, source: Iterable) -> Iterator:
+        """Как run, но считает просмотренные и прошедшие строки на каждом шаге."""
+        stages = list(self.filter_stages)
+        if self._uses_index(source):
+            self.index_stage.visited = len(self.index.operations)
+            source = self._index_candidates()
+            self.index_stage.passed = len(source)
+        elif self.index_stage is not None:
+            stages.insert(0, self.index_stage)
+
+        iterator = iter(source)
+        for stage in stages:
+            iterator = self._counting_filter(stage, iterator)
+        return iterator
+
+    @staticmethod
+    def _counting_filter(stage: Stage, iterator: Iterator) -> Iterator:
+        stage.visited = stage.passed = 0
+        tests = [condition.test for condition in stage.conditions]
+        for op in iterator:
+            stage.visited += 1
+            if all(test(op) for test in tests):
+                stage.passed += 1
+                yield op
+
+    def stages(self) -> list:
+        return ([self.index_stage] if self.index_stage else []) + self.filter_stages
+
+
+class Planner:
+    """
+    Упорядочивает условия запроса по оценке селективности и стоимости.
+
+    Статистика (частоты значений state и currency_code, границы дат) собирается
+    один раз по набору данных. Если передан OperationIndex, условия на
+    индексированные поля вычисляются по битовым маскам до просмотра строк,
+    а остальные проверяются только на отобранных строках.
+
+    Остальные условия сортируются по стоимости / (1 - селективность):
+    дешевые и сильно отсекающие проверки идут первыми, дорогие регулярные
+    выражения — последними.
+    Без данных (Planner()) используются оценки по умолчанию.
+    """
+
+    def __init__(
+        self,
+        operations: Iterable | None = None,
+        index: OperationIndex | None = None,
+    ):
+        self.index = index
+        if index is not None:
+            self.stats = ColumnStats(index.operations, index.indexes)
+        elif operations is not None:
+            self.stats = ColumnStats(operations)
+        else:
+            self.stats = None
+
+    def selectivity(self, condition: Condition) -> float:
+        estimate = None
+        if self.stats is not None:
+            if condition.kind == "eq":
+                estimate = self.stats.equality_selectivity(
+                    condition.field, condition.values
+                )
+            elif condition.kind == "date":
+                estimate = self.stats.range_selectivity(*condition.values)
+        if estimate is None:
+            estimate = DEFAULT_SELECTIVITY[condition.kind]
+        return estimate
+
+    def plan(self, conditions: Iterable[Condition]) -> Plan:
+        index_conditions = []
+        filter_conditions = []
+        for condition in conditions:
+            if (
+                self.index is not None
+                and condition.kind == "eq"
+                and condition.field in self.index.indexes
+            ):
+                index_conditions.append(condition)
+            else:
+                filter_conditions.append(condition)
+
+        index_stage = None
+        if index_conditions:
+            selectivity = 1.0
+            for condition in index_conditions:
+                selectivity *= self.selectivity(condition)
+            index_stage = Stage(
+                "индекс: " + " AND ".join(c.label for c in index_conditions),
+                index_conditions,
+                selectivity,
+            )
+
+        def rank(condition: Condition) -> float:
+            rejected = 1.0 - self.selectivity(condition)
+            return condition.cost / rejected if rejected > 0 else float("inf")
+
+        filter_stages = [
+            Stage(
+                f"фильтр: {condition.label} (стоимость {condition.cost:g})",
+                [condition],
+                self.selectivity(condition),
+            )
+            for condition in sorted(filter_conditions, key=rank)
+        ]
+        return Plan(index_stage, filter_stages, self.index)
+
+
+def format_plan(plan: Plan, rows: int | None, tail: list[str]) -> str:
+    """Текст EXPLAIN: шаги с оценкой селективности и фактическим числом строк."""
+    header = "План запроса"
+    if rows is not None:
+        header += f" (строк на входе: {rows})"
+    lines = [header + ":"]
+    for number, stage in enumerate(plan.stages(), start=1):
+        line = f"  {number}. {stage.description}, оценка селективности {stage.selectivity:.3f}"
+        if stage.visited is not None:
+            line += f" — просмотрено {stage.visited}, прошло {stage.passed}"
+        lines.append(line)
+    for number, text in enumerate(tail, start=len(plan.stages()) + 1):
+        lines.append(f"  {number}. {text}")
+    return "\n".join(lines)
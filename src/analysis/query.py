@@ -0,0 +1,213 @@
+# src/analysis/query.py
+# Составной запрос к операциям: фильтры сливаются в один проход по данным.
+import logging
+import os
+import re
+from datetime import date, datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from src.analysis.planner import (
+    COST_CUSTOM,
+    COST_DATE,
+    COST_EQUALITY,
+    COST_REGEX,
+    Condition,
+    Planner,
+    format_plan,
+)
+from src.processing import top_k_by_date
+from src.utils.dates import epoch_microseconds, to_epoch_microseconds
+from src.utils.text_search import description_matcher
+from src.utils.utils import sort_operations_by_date
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+log_dir = "logs"
+os.makedirs(log_dir, exist_ok=True)
+file_handler = logging.FileHandler(
+    os.path.join(log_dir, "query.log"), mode="w", encoding="utf-8"
+)
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler.setFormatter(formatter)
+logger.addHandler(file_handler)
+
+Predicate = Callable[[object], bool]
+
+# Планировщик без статистики: упорядочивает условия только по стоимости проверки
+DEFAULT_PLANNER = Planner()
+
+
+def _never(op) -> bool:
+    return False
+
+
+class Query:
+    """
+    Ленивый запрос к операциям (словарям плоской схемы или Operation).
+
+    Методы фильтрации не просматривают данные, а добавляют условие и возвращают
+    новый Query, поэтому запросы можно собирать по шагам и переиспользовать.
+    При выполнении все условия проверяются за один проход по источнику,
+    без промежуточных списков; сортировка и ограничение количества
+    применяются в конце (сортировка с limit — через кучу размера limit).
+
+    Порядок проверки условий выбирает планировщик (см. planner.Planner);
+    explain() показывает выбранный план и число строк на каждом шаге.
+
+    Пример:
+        Query(operations).state("EXECUTED").currency("RUB").sort_by_date().limit(10)
+    """
+
+    def __init__(self, source: Iterable, planner: Planner | None = None):
+        self.source = source
+        self.planner = planner or DEFAULT_PLANNER
+        self.conditions: tuple[Condition, ...] = ()
+        self.sort_descending: bool | None = None
+        self.max_results: int | None = None
+
+    def _with(self, **changes) -> "Query":
+        query = Query.__new__(Query)
+        query.__dict__.update(self.__dict__)
+        query.__dict__.update(changes)
+        return query
+
+    # --- Условия ---
+
+    def _add(self, condition: Condition) -> "Query":
+        return self._with(conditions=self.conditions + (condition,))
+
+    def where(self, predicate: Predicate, cost: float = COST_CUSTOM) -> "Query":
+        """Добавляет произвольное условие; cost — относительная стоимость проверки."""
+        label = getattr(predicate, "__name__", "условие")
+        return self._add(Condition("custom", predicate, cost, label))
+
+    def equals(self, field: str, *values) -> "Query":
+        """Операции, у которых field равно одному из values."""
+        if len(values) == 1:
+            value = values[0]
+            test = lambda op: op.get(field) == value  # noqa: E731
+            label = f"{field} = {value!r}"
+        else:
+            value_set = frozenset(values)
+            test = lambda op: op.get(field) in value_set  # noqa: E731
+            label = f"{field} IN {values!r}"
+        return self._add(Condition("eq", test, COST_EQUALITY, label, field, values))
+
+    def state(self, state: str = "EXECUTED") -> "Query":
+        """Аналог processing.filter_by_state."""
+        return self.equals("state", state)
+
+    def currency(self, *currency_codes: str) -> "Query":
+        """Операции в одной из указанных валют (по полю 'currency_code')."""
+        return self.equals("currency_code", *(code.upper() for code in currency_codes))
+
+    def description(self, search_string: str) -> "Query":
+        """
+        Аналог find_transactions_by_description: регулярное выражение без учета регистра.
+        Пустая строка условие не добавляет; некорректное выражение не находит ничего.
+        """
+        if not search_string:
+            return self
+        try:
+            matches = description_matcher(search_string)
+        except re.error as e:
+            logger.error(f"Некорректное регулярное выражение '{search_string}': {e}.")
+            return self._add(
+                Condition("custom", _never, 0.0, f"description ~ {search_string!r}")
+            )
+        return self._add(
+            Condition(
+                "description",
+                lambda op: matches(op.get("description") or ""),
+                COST_REGEX,
+                f"description ~ {search_string!r}",
+                "description",
+                (search_string,),
+            )
+        )
+
+    def between(self, start: date | datetime, end: date | datetime) -> "Query":
+        """Операции с датой в полуинтервале [start, end)."""
+        low, high = epoch_microseconds(start), epoch_microseconds(end)
+        return self._add(
+            Condition(
+                "date",
+                lambda op: low <= to_epoch_microseconds(op.get("date")) < high,
+                COST_DATE,
+                f"date in [{start.isoformat()}, {end.isoformat()})",
+                "date",
+                (low, high),
+            )
+        )
+
+    # --- Порядок и количество ---
+
+    def sort_by_date(self, descending: bool = True) -> "Query":
+        """
+        Сортирует результат по дате, как sort_operations_by_date:
+        операции без распознанной даты в результат не попадают.
+        """
+        return self._with(sort_descending=descending)
+
+    def limit(self, count: int) -> "Query":
+        return self._with(max_results=count)
+
+    # --- Выполнение ---
+
+    def _filtered(self) -> Iterator:
+        return self.planner.plan(self.conditions).run(self.source)
+
+    def __iter__(self) -> Iterator:
+        return self._finish(self._filtered())
+
+    def _finish(self, operations: Iterator) -> Iterator:
+        if self.sort_descending is None:
+            if self.max_results is not None:
+                return islice(operations, self.max_results)
+            return operations
+        if self.max_results is not None:
+            return iter(
+                top_k_by_date(
+                    operations, self.max_results, descending=self.sort_descending
+                )
+            )
+        return iter(
+            sort_operations_by_date(
+                list(operations), reverse=self.sort_descending, in_place=True
+            )
+        )
+
+    def to_list(self) -> list:
+        return list(self)
+
+    def count(self) -> int:
+        return sum(1 for _ in self)
+
+    def exists(self) -> bool:
+        """
+        Есть ли хотя бы одна подходящая операция (просмотр до первой найденной).
+        Для источника-итератора просмотренные операции будут израсходованы.
+        """
+        return next(self._filtered(), None) is not None
+
+    def explain(self) -> str:
+        """
+        Выполняет запрос и возвращает текст плана: порядок условий,
+        оценку селективности и фактическое число просмотренных и прошедших строк
+        на каждом шаге. Для источника-итератора данные будут израсходованы.
+        """
+        plan = self.planner.plan(self.conditions)
+        result = list(self._finish(plan.run_counted(self.source)))
+
+        tail = []
+        if self.sort_descending is not None:
+            order = "по убыванию" if self.sort_descending else "по возрастанию"
+            tail.append(f"сортировка по дате ({order})")
+        if self.max_results is not None:
+            tail.append(f"limit {self.max_results}")
+        tail.append(f"результат: {len(result)} строк")
+
+        rows = len(self.source) if hasattr(self.source, "__len__") else None
+        return format_plan(plan, rows, tail)
@@ -0,0 +1,159 @@
+# src/analysis/query_cache.py
+# LRU-кеш результатов повторяющихся запросов к одному набору операций.
+import sys
+from collections import OrderedDict
+
+from src.analysis.planner import Condition
+from src.analysis.query import Query
+
+DEFAULT_MAX_ENTRIES = 256
+# Предельный примерный объем памяти под списки результатов
+DEFAULT_MAX_RESULT_BYTES = 64 * 1024 * 1024
+
+
+def _condition_key(condition: Condition) -> tuple:
+    if condition.kind == "custom":
+        # Произвольная функция сравнивается по тождеству объекта
+        return (condition.kind, condition.test)
+    if condition.kind == "eq":
+        return (condition.kind, condition.field, frozenset(condition.values))
+    return (condition.kind, condition.field, condition.values)
+
+
+def query_key(query: Query) -> tuple:
+    """
+    Нормализованный ключ запроса: условия объединены через И,
+    поэтому их порядок и повторы не важны; порядок значений в state/currency тоже.
+    """
+    return (
+        frozenset(_condition_key(condition) for condition in query.conditions),
+        query.sort_descending,
+        query.max_results,
+    )
+
+
+def _result_size(result: tuple) -> int:
+    """Сами операции принадлежат набору данных, считается только память под ссылки."""
+    return sys.getsizeof(result)
+
+
+class CacheStats:
+    """Счетчики обращений к кешу."""
+
+    __slots__ = ("hits", "misses", "bypassed", "evictions", "invalidations")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, "
+            f"bypassed={self.bypassed}, evictions={self.evictions}, "
+            f"invalidations={self.invalidations}, hit_rate={self.hit_rate:.2f})"
+        )
+
+
+class QueryCache:
+    """
+    LRU-кеш результатов Query для наборов данных со счетчиком версий.
+
+    Ключ записи — набор данных, его version и нормализованный запрос
+    (условия, сортировка, limit). Источник должен иметь атрибут version,
+    который меняется при каждом изменении, — VersionedList или
+    OperationIndex.operations. Когда версия набора меняется, записи,
+    посчитанные по старой версии, удаляются при следующем обращении к этому набору.
+    Запросы к источникам без version (обычные списки, итераторы) выполняются
+    без кеша и учитываются в stats.bypassed.
+
+    Вытеснение — по давности использования, когда превышено число записей
+    max_entries или примерный объем max_bytes списков результатов.
+
+    Пример:
+        cache = QueryCache()
+        rows = cache.run(Query(dataset).state().currency("RUB"))
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_RESULT_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self.size_bytes = 0
+        # (id набора, version, ключ запроса) -> (набор, результат, размер)
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        # id набора -> последняя увиденная версия
+        self._versions: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def run(self, query: Query) -> list:
+        """Результат query списком: из кеша или после выполнения запроса."""
+        source = query.source
+        version = getattr(source, "version", None)
+        if version is None:
+            self.stats.bypassed += 1
+            return query.to_list()
+
+        self._check_version(source, version)
+        key = (id(source), version, query_key(query))
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is source:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return list(entry[1])
+
+        self.stats.misses += 1
+        result = tuple(query)
+        size = _result_size(result)
+        if size <= self.max_bytes:
+            self._store(key, (source, result, size))
+        return list(result)
+
+    def _check_version(self, source, version: int) -> None:
+        source_id = id(source)
+        known = self._versions.get(source_id)
+        if known is not None and known != version:
+            self._drop(lambda key: key[0] == source_id and key[1] != version)
+            self.stats.invalidations += 1
+        self._versions[source_id] = version
+
+    def _store(self, key: tuple, entry: tuple) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size_bytes -= old[2]
+        self._entries[key] = entry
+        self.size_bytes += entry[2]
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.size_bytes -= size
+            self.stats.evictions += 1
+
+    def _drop(self, predicate) -> None:
+        for key in [key for key in self._entries if predicate(key)]:
+            self.size_bytes -= self._entries.pop(key)[2]
+
+    def invalidate(self, source=None) -> None:
+        """Удаляет записи для набора source или, без аргумента, все записи."""
+        if source is None:
+            self._entries.clear()
+            self._versions.clear()
+            self.size_bytes = 0
+            return
+        source_id = id(source)
+        self._drop(lambda key: key[0] == source_id)
+        self._versions.pop(source_id, None)
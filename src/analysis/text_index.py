@@ -0,0 +1,171 @@
+# src/analysis/text_index.py
+# Инвертированный индекс слов в описаниях операций.
+import re
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import chain
+from typing import Iterable
+
+from src.utils.text_search import description_matcher
+
+_WORD = re.compile(r"\w+")
+
+# Окончания, которые отбрасывает простой стеммер (сначала более длинные)
+_SUFFIXES = tuple(
+    sorted(
+        "ами ями ого его ому ему ыми ими ых их ой ей ий ый ая яя ое ее ые ие "
+        "ов ев ам ям ах ях ом ем ую юю а я о е ы и у ю ь ing ed es s".split(),
+        key=len,
+        reverse=True,
+    )
+)
+# Минимальная длина основы после отбрасывания окончания
+MIN_STEM_LENGTH = 3
+
+
+def normalize(text: str) -> str:
+    """Приводит текст к одному регистру (casefold) и заменяет 'ё' на 'е'."""
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text: str) -> list[str]:
+    """Слова текста после normalize."""
+    return _WORD.findall(normalize(text))
+
+
+def stem_word(word: str) -> str:
+    """Отбрасывает одно типичное окончание русского или английского слова."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[: -len(suffix)]
+    return word
+
+
+class TextIndex:
+    """
+    Инвертированный индекс слов поля 'description', строится один раз по набору данных.
+
+    Описания в выгрузках сильно повторяются, поэтому индексируются различные
+    описания: для каждого слова хранятся номера описаний, в которых оно встречается,
+    а для каждого описания — позиции операций с ним в исходном списке.
+    Запрос находит описания по словарю и возвращает k операций за O(k),
+    не просматривая остальные строки.
+
+    Слова сравниваются после casefold и замены 'ё' на 'е'; при stem=True
+    word и phrase сравнивают основы слов ('переводы' находит 'перевода').
+    Найденные операции возвращаются в исходном порядке.
+    """
+
+    def __init__(self, operations: Iterable, stem: bool = False):
+        self.operations = list(operations)
+        self.stem = stem
+        self.descriptions: list[str] = []
+        self.terms: list[list[str]] = []
+        self.rows: list[array] = []
+        self.postings: dict[str, array] = defaultdict(lambda: array("q"))
+        self._stems: dict[str, list[str]] = defaultdict(list)
+        self._vocabulary: list[str] | None = None
+
+        ids: dict[str, int] = {}
+        for position, op in enumerate(self.operations):
+            description = op.get("description") or ""
+            doc = ids.get(description)
+            if doc is None:
+                doc = ids[description] = len(self.descriptions)
+                terms = tokenize(description)
+                self.descriptions.append(description)
+                self.terms.append(terms)
+                self.rows.append(array("q"))
+                for term in dict.fromkeys(terms):
+                    self.postings[term].append(doc)
+            self.rows[doc].append(position)
+
+        self.postings = dict(self.postings)
+        if stem:
+            for term in self.postings:
+                self._stems[stem_word(term)].append(term)
+        self._stems = dict(self._stems)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def _key(self, term: str) -> str:
+        return stem_word(term) if self.stem else term
+
+    def _docs_for_word(self, term: str) -> set[int]:
+        if not self.stem:
+            return set(self.postings.get(term, ()))
+        return set(
+            chain.from_iterable(
+                self.postings[raw] for raw in self._stems.get(stem_word(term), ())
+            )
+        )
+
+    def _select(self, docs: Iterable[int]) -> list:
+        """Операции с описаниями docs в исходном порядке."""
+        operations = self.operations
+        positions = sorted(chain.from_iterable(self.rows[doc] for doc in docs))
+        return [operations[i] for i in positions]
+
+    def word(self, word: str) -> list:
+        """Операции, в описании которых есть слово word."""
+        terms = tokenize(word)
+        if len(terms) != 1:
+            return self.phrase(word)
+        return self._select(self._docs_for_word(terms[0]))
+
+    def phrase(self, text: str) -> list:
+        """Операции, в описании которых слова text идут подряд в том же порядке."""
+        terms = tokenize(text)
+        if not terms:
+            return []
+        candidates = None
+        for term in sorted(set(terms), key=lambda t: len(self.postings.get(t, ()))):
+            docs = self._docs_for_word(term)
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return []
+
+        keys = [self._key(term) for term in terms]
+        width = len(keys)
+
+        def contains(doc: int) -> bool:
+            doc_keys = [self._key(term) for term in self.terms[doc]]
+            for start in range(len(doc_keys) - width + 1):
+                if doc_keys[start] == keys[0] and all(
+                    doc_keys[start + i] == keys[i] for i in range(1, width)
+                ):
+                    return True
+            return False
+
+        return self._select(doc for doc in candidates if contains(doc))
+
+    def prefix(self, prefix: str) -> list:
+        """Операции, в описании которых есть слово, начинающееся с prefix."""
+        prefix = normalize(prefix.strip())
+        if not prefix:
+            return []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        docs = set()
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix):
+                break
+            docs.update(self.postings[vocabulary[i]])
+        return self._select(docs)
+
+    def search(self, search_string: str) -> list:
+        """
+        Аналог find_transactions_by_description (подстрока или регулярное
+        выражение без учета регистра), но выражение проверяется один раз
+        для каждого различного описания, а не для каждой операции.
+
+        Raises:
+            re.error: Если строка не является корректным регулярным выражением.
+        """
+        matches = description_matcher(search_string)
+        return self._select(
+            doc for doc, text in enumerate(self.descriptions) if matches(text)
+        )
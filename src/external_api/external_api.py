@@ -1,8 +1,11 @@
 import os
+from decimal import ROUND_HALF_UP, Decimal
 
 import requests
 from dotenv import load_dotenv
 
+from src.models.operation import MINOR_UNITS, Operation, to_minor_units
+
 load_dotenv()
 EXCHANGE_RATES_API_KEY = os.getenv("EXCHANGE_RATES_API_KEY")
 BASE_URL = "https://api.apilayer.com/exchangerates_data/"
@@ -44,17 +47,29 @@ def get_exchange_rate(from_currency, to_currency="RUB"):
         return None
 
 
-def get_transaction_amount_in_rub(transaction):
+def convert_minor_units(amount_minor, rate):
     """
-    Возвращает сумму транзакции в рублях.
+    Переводит сумму в копейках/центах по курсу в копейки/центы другой валюты.
+
+    Курс переводится в Decimal через строковое представление, а результат
+    округляется до целых копеек, поэтому погрешность float не накапливается.
 
     Args:
-        transaction (dict): Словарь с данными о транзакции.
+        amount_minor (int): Сумма в копейках/центах исходной валюты.
+        rate (float): Курс исходной валюты к целевой.
 
     Returns:
-        float: Сумма транзакции в рублях.
-               Возвращает None, если не удалось определить или конвертировать сумму.
+        int: Сумма в копейках/центах целевой валюты.
     """
+    value = Decimal(amount_minor) * Decimal(str(rate))
+    return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _amount_and_currency(transaction):
+    """Сумма в копейках/центах и код валюты из Operation или словаря JSON."""
+    if isinstance(transaction, Operation):
+        return transaction.amount_minor, transaction.currency_code
+
     operation_amount = transaction.get("operationAmount")
     if not operation_amount:
         return None
@@ -66,24 +81,79 @@ def get_transaction_amount_in_rub(transaction):
         return None
 
     try:
-        amount = float(amount_str)
-        currency_code = currency_info.get("code")
-
-        if currency_code == "RUB":
-            return amount
-        elif currency_code in ["USD", "EUR"]:
-            exchange_rate = get_exchange_rate(currency_code)
-            if exchange_rate is not None:
-                return amount * exchange_rate
-            else:
-                print(f"Не удалось получить курс {currency_code} к RUB.")
-                return None
-        else:
-            print(f"Неподдерживаемая валюта: {currency_code}")
-            return None
+        amount_minor = to_minor_units(amount_str)
     except ValueError:
         print(f"Некорректное значение суммы: {amount_str}")
         return None
+    return amount_minor, currency_info.get("code")
+
+
+def _amount_minor_and_rate(transaction):
+    """
+    Сумма транзакции в копейках/центах и курс ее валюты к рублю
+    (None для рублей). Возвращает None, если сумму нельзя перевести в рубли.
+    """
+    amount_and_currency = _amount_and_currency(transaction)
+    if amount_and_currency is None:
+        return None
+    amount_minor, currency_code = amount_and_currency
+
+    if currency_code == "RUB":
+        return amount_minor, None
+    elif currency_code in ["USD", "EUR"]:
+        exchange_rate = get_exchange_rate(currency_code)
+        if exchange_rate is not None:
+            return amount_minor, exchange_rate
+        else:
+            print(f"Не удалось получить курс {currency_code} к RUB.")
+            return None
+    else:
+        print(f"Неподдерживаемая валюта: {currency_code}")
+        return None
+
+
+def get_transaction_amount_in_rub_minor(transaction):
+    """
+    Возвращает сумму транзакции в копейках.
+    Сконвертированная сумма округляется до целых копеек (см. convert_minor_units).
+
+    Args:
+        transaction (Operation | dict): Операция или словарь с данными о транзакции.
+
+    Returns:
+        int: Сумма транзакции в копейках.
+             Возвращает None, если не удалось определить или конвертировать сумму.
+    """
+    amount_and_rate = _amount_minor_and_rate(transaction)
+    if amount_and_rate is None:
+        return None
+    amount_minor, exchange_rate = amount_and_rate
+    if exchange_rate is None:
+        return amount_minor
+    return convert_minor_units(amount_minor, exchange_rate)
+
+
+def get_transaction_amount_in_rub(transaction):
+    """
+    Возвращает сумму транзакции в рублях.
+    Результат конвертации не округляется; сумму в целых копейках
+    возвращает get_transaction_amount_in_rub_minor.
+
+    Args:
+        transaction (Operation | dict): Операция или словарь с данными о транзакции.
+
+    Returns:
+        float: Сумма транзакции в рублях.
+               Возвращает None, если не удалось определить или конвертировать сумму.
+    """
+    amount_and_rate = _amount_minor_and_rate(transaction)
+    if amount_and_rate is None:
+        return None
+    amount_minor, exchange_rate = amount_and_rate
+    amount = amount_minor / MINOR_UNITS
+    if exchange_rate is None:
+        return amount
+    return amount * exchange_rate
 
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+# Дисковый кеш разобранных выгрузок операций.
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Callable, Iterable
+
+from src.models.operation import Operation, to_operations
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+log_dir = "logs"
+os.makedirs(log_dir, exist_ok=True)
+file_handler = logging.FileHandler(
+    os.path.join(log_dir, "cache.log"), mode="w", encoding="utf-8"
+)
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler.setFormatter(formatter)
+logger.addHandler(file_handler)
+
+DEFAULT_CACHE_DIR = ".cache"
+# Предельный суммарный размер файлов кеша, после которого удаляются самые старые
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+# Увеличивается при изменении формата записи, старые записи тогда игнорируются
+CACHE_FORMAT_VERSION = 1
+CACHE_SUFFIX = ".pkl"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """Хеш содержимого файла (BLAKE2b), читается блоками по 1 МБ."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedCache:
+    """
+    Кеш нормализованных операций на диске, по одному файлу на исходную выгрузку.
+
+    Запись привязана к абсолютному пути, размеру, mtime и хешу содержимого исходного файла.
+    Если размер и mtime совпадают, запись отдается без чтения исходного файла;
+    если изменился только mtime, сравнивается хеш содержимого.
+    Операции хранятся кортежами полей в pickle, поэтому повторяющиеся строки
+    записываются один раз, а загрузка не требует повторной проверки записей.
+
+    Когда суммарный размер кеша превышает max_bytes, удаляются записи,
+    которые дольше всего не использовались (время использования — mtime файла записи).
+
+    Кеш читает pickle, поэтому каталог кеша должен быть доступен для записи только владельцу.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, path: str) -> str:
+        key = hashlib.blake2b(
+            os.path.abspath(path).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def get(self, path: str) -> list[Operation] | None:
+        """Возвращает операции из кеша или None, если записи нет или она устарела."""
+        entry_path = self._entry_path(path)
+        try:
+            stat = os.stat(path)
+            with open(entry_path, "rb") as f:
+                header = pickle.load(f)
+                if (
+                    header.get("version") != CACHE_FORMAT_VERSION
+                    or header.get("path") != os.path.abspath(path)
+                    or header.get("size") != stat.st_size
+                ):
+                    return None
+                if header.get("mtime_ns") != stat.st_mtime_ns:
+                    if header.get("digest") != file_digest(path):
+                        return None
+                    refresh = True
+                else:
+                    refresh = False
+                rows = pickle.load(f)
+            operations = [Operation(*row) for row in rows]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Обрезанный или испорченный pickle может выбросить почти любое
+            # исключение (ValueError, KeyError, ImportError и др.): это промах кеша
+            logger.warning(
+                f"Поврежденная запись кеша {entry_path} удалена ({type(e).__name__})."
+            )
+            self._remove(entry_path)
+            return None
+
+        if refresh:
+            # Файл только «потрогали»: содержимое то же, обновляем mtime в заголовке
+            self.put(path, operations)
+        else:
+            os.utime(entry_path)
+        logger.info(f"Операции для {path} взяты из кеша ({len(operations)} шт.).")
+        return operations
+
+    def put(self, path: str, operations: Iterable) -> None:
+        """Сохраняет операции (словари любого загрузчика или Operation) для файла path."""
+        stat = os.stat(path)
+        header = {
+            "version": CACHE_FORMAT_VERSION,
+            "path": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": file_digest(path),
+        }
+        rows = [
+            tuple(getattr(op, attr) for attr in Operation.__slots__)
+            for op in to_operations(operations)
+        ]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Запись во временный файл и os.replace: читатель не увидит недописанный файл
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(path))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def load(self, path: str, loader: Callable[[str], Iterable]) -> list[Operation]:
+        """
+        Возвращает операции файла из кеша, а при промахе загружает их loader,
+        нормализует в Operation и сохраняет в кеш. Пустой результат не кешируется.
+        """
+        operations = self.get(path)
+        if operations is not None:
+            return operations
+
+        operations = list(to_operations(loader(path), path))
+        if operations:
+            try:
+                self.put(path, operations)
+            except OSError as e:
+                logger.warning(f"Не удалось сохранить кеш для {path}: {e}")
+        return operations
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Удаляет запись для файла path или, если path не задан, весь кеш."""
+        if path is not None:
+            self._remove(self._entry_path(path))
+            return
+        for entry_path, _, _ in self._entries():
+            self._remove(entry_path)
+
+    def evict(self) -> None:
+        """Удаляет давно не использованные записи, пока кеш больше max_bytes."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for entry_path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(entry_path)
+            total -= size
+            logger.info(f"Запись кеша {entry_path} вытеснена по размеру.")
+
+    def _entries(self) -> list[tuple[str, int, int]]:
+        """Записи кеша: (путь, время последнего использования, размер)."""
+        try:
+            scanned = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return []
+        entries = []
+        for entry in scanned:
+            if entry.name.endswith(CACHE_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        return entries
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
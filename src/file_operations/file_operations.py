@@ -1,12 +1,25 @@
 import csv
+import io
 import json
 import logging
+import mmap
 import os
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat, zip_longest
+from typing import Iterator
 
 from openpyxl import load_workbook
 from openpyxl.utils.exceptions import InvalidFileException
 
+from src.file_operations.rows import (
+    REQUIRED_HEADERS,
+    csv_row_to_operation,
+    excel_row_to_operation,
+    has_required_excel_headers,
+    is_empty_excel_row,
+    log_excel_row_error,
+)
+
 # Настройка логирования для file_operations.py
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -20,6 +33,9 @@ formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(messag
 file_handler.setFormatter(formatter)
 logger.addHandler(file_handler)
 
+# Минимальный размер диапазона байт, который отдается одному процессу
+CSV_PARALLEL_MIN_CHUNK_BYTES = 4 * 1024 * 1024
+
 
 def load_operations_from_json(json_filepath: str) -> list[dict]:
     """
@@ -54,6 +70,55 @@ def load_operations_from_json(json_filepath: str) -> list[dict]:
         return []
 
 
+def _log_csv_row_error(
+    csv_filepath: str, row_number: int, row: dict, error: Exception
+) -> None:
+    """Записывает в лог ошибку обработки строки CSV в едином формате."""
+    if isinstance(error, KeyError):
+        logger.error(
+            f"Ошибка при обработке строки {row_number} в CSV файле '{csv_filepath}': Отсутствует ключ {error}. Строка: {row}"
+        )
+    elif isinstance(error, ValueError):
+        logger.error(
+            f"Ошибка преобразования данных в строке {row_number} в CSV файле '{csv_filepath}': {error}. Строка: {row}"
+        )
+    else:
+        logger.error(
+            f"Неожиданная ошибка при обработке строки {row_number} в CSV файле '{csv_filepath}': {error}. Строка: {row}"
+        )
+
+
+def _read_csv_operations(csv_filepath: str) -> Iterator[dict]:
+    """
+    Построчно читает операции из CSV файла с разделителем ';'.
+    Некорректные строки записываются в лог и пропускаются;
+    ошибки чтения самого файла пробрасываются вызывающему коду.
+    """
+    with open(csv_filepath, "r", encoding="utf-8") as file:
+        reader = csv.DictReader(file, delimiter=";")
+
+        if not all(header in reader.fieldnames for header in REQUIRED_HEADERS):
+            missing_headers = [
+                header for header in REQUIRED_HEADERS if header not in reader.fieldnames
+            ]
+            logger.error(
+                f"CSV файл '{csv_filepath}' не содержит всех обязательных заголовков: {missing_headers}. "
+                f"Найдено: {reader.fieldnames}"
+            )
+            return
+
+        for i, row in enumerate(reader):
+            # Пропускаем полностью пустые строки (например, если в конце файла есть лишняя пустая строка)
+            if not any(row.values()):
+                continue
+
+            try:
+                yield csv_row_to_operation(row)
+            except Exception as e:
+                _log_csv_row_error(csv_filepath, i + 1, row, e)
+                continue
+
+
 def read_operations_from_csv(csv_filepath: str) -> list[dict]:
     """
     Читает список финансовых операций из CSV файла.
@@ -63,77 +128,168 @@ def read_operations_from_csv(csv_filepath: str) -> list[dict]:
         logger.error(f"CSV файл не найден: {csv_filepath}")
         return []
 
+    try:
+        operations = list(_read_csv_operations(csv_filepath))
+        logger.info(
+            f"Успешно загружено {len(operations)} операций из CSV файла: {csv_filepath}"
+        )
+        return operations
+    except Exception as e:
+        logger.error(f"Ошибка при чтении CSV файла {csv_filepath}: {e}")
+        return []
+
+
+def iter_operations_from_csv(
+    csv_filepath: str, batch_size: int | None = None
+) -> Iterator:
+    """
+    Потоковый вариант read_operations_from_csv.
+    Без batch_size отдает операции по одной, с batch_size — списками
+    не длиннее batch_size (последний список может быть короче).
+    В памяти держится не больше одного пакета, поэтому обработка
+    может начинаться до того, как файл прочитан целиком.
+    """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size должен быть положительным числом")
+
+    if not os.path.exists(csv_filepath):
+        logger.error(f"CSV файл не найден: {csv_filepath}")
+        return
+
+    try:
+        operations = _read_csv_operations(csv_filepath)
+        if batch_size is None:
+            yield from operations
+        else:
+            while batch := list(islice(operations, batch_size)):
+                yield batch
+    except Exception as e:
+        logger.error(f"Ошибка при чтении CSV файла {csv_filepath}: {e}")
+
+
+def _split_into_line_ranges(
+    mm: mmap.mmap, start: int, end: int, parts: int
+) -> list[tuple[int, int]]:
+    """
+    Делит байты [start, end) на parts диапазонов примерно одинакового размера.
+    Каждая граница сдвигается к началу следующей строки, поэтому строка
+    никогда не разрывается между диапазонами.
+    """
+    bounds = [start]
+    step = (end - start) // parts
+    for i in range(1, parts):
+        newline = mm.find(b"\n", max(start + i * step, bounds[-1]), end)
+        if newline == -1:
+            break
+        if newline + 1 > bounds[-1]:
+            bounds.append(newline + 1)
+    if bounds[-1] != end:
+        bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_csv_range(
+    csv_filepath: str, start: int, end: int, fieldnames: list[str]
+) -> tuple[list[dict], int, list[tuple[int, dict, Exception]]]:
+    """
+    Разбирает байты [start, end) CSV файла в процессе-исполнителе.
+    Возвращает операции, количество прочитанных строк и ошибки строк
+    с номерами внутри диапазона: логирует их родительский процесс,
+    чтобы нумерация и порядок сообщений совпадали с последовательным чтением.
+    """
+    with (
+        open(csv_filepath, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        text = mm[start:end].decode("utf-8")
+
     operations = []
-    # Обновленные обязательные заголовки для CSV с учетом currency_code
-    required_headers = [
-        "id",
-        "state",
-        "date",
-        "amount",
-        "currency_name",
-        "currency_code",
-        "description",
-    ]
+    problems = []
+    row_count = 0
+    # newline=None включает универсальные переводы строк, как у open() в текстовом режиме
+    reader = csv.DictReader(
+        io.StringIO(text, newline=None), fieldnames=fieldnames, delimiter=";"
+    )
+    for i, row in enumerate(reader):
+        row_count = i + 1
+        if not any(row.values()):
+            continue
+        try:
+            operations.append(csv_row_to_operation(row))
+        except Exception as e:
+            problems.append((i, row, e))
+    return operations, row_count, problems
+
+
+def read_operations_from_csv_parallel(
+    csv_filepath: str,
+    max_workers: int | None = None,
+    min_chunk_bytes: int = CSV_PARALLEL_MIN_CHUNK_BYTES,
+) -> list[dict]:
+    """
+    Параллельный вариант read_operations_from_csv для больших файлов.
+
+    Файл отображается в память и делится на диапазоны байт по границам строк,
+    диапазоны разбираются в пуле процессов, результаты склеиваются в исходном порядке.
+    Ошибки строк записываются в лог с теми же номерами и текстом,
+    что и при последовательном чтении.
+    Если файл меньше двух диапазонов по min_chunk_bytes или max_workers == 1,
+    используется read_operations_from_csv.
+
+    Ограничение: поля в кавычках не должны содержать переводов строк.
+    """
+    if not os.path.exists(csv_filepath):
+        logger.error(f"CSV файл не найден: {csv_filepath}")
+        return []
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or os.path.getsize(csv_filepath) < 2 * min_chunk_bytes:
+        return read_operations_from_csv(csv_filepath)
 
     try:
-        with open(csv_filepath, "r", encoding="utf-8") as file:
-            # Изменяем разделитель на ';'
-            reader = csv.DictReader(file, delimiter=";")
+        with (
+            open(csv_filepath, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            header_end = mm.find(b"\n")
+            if header_end == -1:
+                return read_operations_from_csv(csv_filepath)
+            header_line = mm[:header_end].decode("utf-8").rstrip("\r")
+            fieldnames = next(csv.reader([header_line], delimiter=";"))
 
-            if not all(header in reader.fieldnames for header in required_headers):
+            if not all(header in fieldnames for header in REQUIRED_HEADERS):
                 missing_headers = [
-                    header
-                    for header in required_headers
-                    if header not in reader.fieldnames
+                    header for header in REQUIRED_HEADERS if header not in fieldnames
                 ]
                 logger.error(
                     f"CSV файл '{csv_filepath}' не содержит всех обязательных заголовков: {missing_headers}. "
-                    f"Найдено: {reader.fieldnames}"
+                    f"Найдено: {fieldnames}"
                 )
                 return []
 
-            for i, row in enumerate(reader):
-                # Пропускаем полностью пустые строки (например, если в конце файла есть лишняя пустая строка)
-                if not any(row.values()):
-                    continue
+            size = len(mm)
+            parts = max(1, min(workers * 4, (size - header_end) // min_chunk_bytes))
+            ranges = _split_into_line_ranges(mm, header_end + 1, size, parts)
+
+        operations = []
+        rows_before = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _parse_csv_range,
+                repeat(csv_filepath),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+                repeat(fieldnames),
+            )
+            for range_operations, row_count, problems in results:
+                for i, row, error in problems:
+                    _log_csv_row_error(csv_filepath, rows_before + i + 1, row, error)
+                operations.extend(range_operations)
+                rows_before += row_count
 
-                try:
-                    # Приводим 'state' к верхнему регистру для единообразия с JSON
-                    status = str(row.get("state", "")).upper()
-
-                    operation = {
-                        "id": int(row["id"]),
-                        "description": str(row["description"]),
-                        "amount": float(row["amount"]),
-                        "currency_name": str(row["currency_name"]),  # Добавлено
-                        "currency_code": str(
-                            row["currency_code"]
-                        ),  # Добавлено, ключевой для фильтрации
-                        "date": str(
-                            row["date"]
-                        ),  # Дата остается строкой, форматируется позже
-                        "state": status,  # Используем 'state' вместо 'status'
-                        "from": str(row.get("from", "")),
-                        "to": str(row.get("to", "")),
-                    }
-                    operations.append(operation)
-                except KeyError as e:
-                    logger.error(
-                        f"Ошибка при обработке строки {i + 1} в CSV файле '{csv_filepath}': Отсутствует ключ {e}. Строка: {row}"
-                    )
-                    continue
-                except ValueError as e:
-                    logger.error(
-                        f"Ошибка преобразования данных в строке {i + 1} в CSV файле '{csv_filepath}': {e}. Строка: {row}"
-                    )
-                    continue
-                except Exception as e:
-                    logger.error(
-                        f"Неожиданная ошибка при обработке строки {i + 1} в CSV файле '{csv_filepath}': {e}. Строка: {row}"
-                    )
-                    continue
         logger.info(
-            f"Успешно загружено {len(operations)} операций из CSV файла: {csv_filepath}"
+            f"Успешно загружено {len(operations)} операций из CSV файла: {csv_filepath} "
+            f"({len(ranges)} диапазонов, {workers} процессов)"
         )
         return operations
     except Exception as e:
@@ -150,16 +306,6 @@ def read_operations_from_excel(excel_filepath: str) -> list[dict]:
         return []
 
     operations = []
-    # Обновленные обязательные заголовки для Excel с учетом currency_code
-    required_headers = [
-        "id",
-        "state",
-        "date",
-        "amount",
-        "currency_name",
-        "currency_code",
-        "description",
-    ]
 
     try:
         workbook = load_workbook(excel_filepath)
@@ -168,12 +314,7 @@ def read_operations_from_excel(excel_filepath: str) -> list[dict]:
         # Получаем заголовки из первой строки
         header = [cell.value for cell in sheet[1]]
 
-        if not all(h in header for h in required_headers):
-            missing_headers = [h for h in required_headers if h not in header]
-            logger.error(
-                f"Excel файл '{excel_filepath}' не содержит всех обязательных заголовков: {missing_headers}. "
-                f"Найдено: {header}"
-            )
+        if not has_required_excel_headers(logger, excel_filepath, header):
             return []
 
         # Создаем маппинг колонок по именам заголовков
@@ -189,61 +330,13 @@ def read_operations_from_excel(excel_filepath: str) -> list[dict]:
                 row_data[h] = cell_value
 
             # Пропускаем полностью пустые строки
-            if not any(
-                value
-                for key, value in row_data.items()
-                if key not in ["from", "to", "description"] and value is not None
-            ):
+            if is_empty_excel_row(row_data):
                 continue
 
             try:
-                date_value = row_data.get("date")
-                if isinstance(date_value, datetime):
-                    date_str = date_value.strftime(
-                        "%Y-%m-%dT%H:%M:%SZ"
-                    )  # Сохраняем формат JSON
-                elif date_value is not None:
-                    date_str = str(date_value)
-                else:
-                    date_str = ""
-
-                # Приводим 'state' к верхнему регистру для единообразия с JSON
-                status = str(row_data.get("state", "")).upper()
-
-                operation = {
-                    "id": int(row_data["id"]),
-                    "description": str(row_data["description"]),
-                    "amount": float(row_data["amount"]),
-                    "currency_name": str(row_data["currency_name"]),  # Добавлено
-                    "currency_code": str(
-                        row_data["currency_code"]
-                    ),  # Добавлено, ключевой для фильтрации
-                    "date": date_str,
-                    "state": status,
-                    "from": str(
-                        row_data.get("from", "")
-                        if row_data.get("from") is not None
-                        else ""
-                    ),
-                    "to": str(
-                        row_data.get("to", "") if row_data.get("to") is not None else ""
-                    ),
-                }
-                operations.append(operation)
-            except KeyError as e:
-                logger.error(
-                    f"Ошибка при обработке строки {row_index} в Excel файле '{excel_filepath}': Отсутствует ключ {e}. Строка: {row_data}"
-                )
-                continue
-            except ValueError as e:
-                logger.error(
-                    f"Ошибка преобразования данных в строке {row_index} в Excel файле '{excel_filepath}': {e}. Строка: {row_data}"
-                )
-                continue
+                operations.append(excel_row_to_operation(row_data))
             except Exception as e:
-                logger.error(
-                    f"Неожиданная ошибка при обработке строки {row_index} в Excel файле '{excel_filepath}': {e}. Строка: {row_data}"
-                )
+                log_excel_row_error(logger, excel_filepath, row_index, row_data, e)
                 continue
         logger.info(
             f"Успешно загружено {len(operations)} операций из Excel файла: {excel_filepath}"
@@ -257,3 +350,52 @@ def read_operations_from_excel(excel_filepath: str) -> list[dict]:
     except Exception as e:
         logger.error(f"Ошибка при чтении Excel файла {excel_filepath}: {e}")
         return []
+
+
+def iter_operations_from_excel(excel_filepath: str) -> Iterator[dict]:
+    """
+    Потоковый вариант read_operations_from_excel.
+    Открывает книгу в режиме только для чтения и проходит строки активного листа
+    последовательно, не строя модель всего листа в памяти.
+    Возвращает те же операции, что и read_operations_from_excel.
+    """
+    if not os.path.exists(excel_filepath):
+        logger.error(f"Excel файл не найден: {excel_filepath}")
+        return
+
+    count = 0
+    try:
+        workbook = load_workbook(excel_filepath, read_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = list(next(rows, ()))
+
+            if not has_required_excel_headers(logger, excel_filepath, header):
+                return
+
+            width = len(header)
+            for row_index, values in enumerate(rows, start=2):
+                # В режиме только для чтения строка может быть короче заголовка
+                row_data = dict(zip_longest(header, values[:width]))
+
+                if is_empty_excel_row(row_data):
+                    continue
+
+                try:
+                    operation = excel_row_to_operation(row_data)
+                except Exception as e:
+                    log_excel_row_error(logger, excel_filepath, row_index, row_data, e)
+                    continue
+                count += 1
+                yield operation
+        finally:
+            workbook.close()
+        logger.info(
+            f"Успешно загружено {count} операций из Excel файла (потоково): {excel_filepath}"
+        )
+    except InvalidFileException as e:
+        logger.error(
+            f"Ошибка: Файл '{excel_filepath}' не является действительным файлом Excel. {e}"
+        )
+    except Exception as e:
+        logger.error(f"Ошибка при чтении Excel файла {excel_filepath}: {e}")
@@ -0,0 +1,161 @@
+# Параллельная загрузка каталога с выгрузками операций (JSON, CSV, XLSX).
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.file_operations.file_operations import read_operations_from_csv
+from src.file_operations.xlsx_reader import read_operations_from_xlsx
+from src.models.operation import Operation, to_operations
+from src.utils.utils import load_operations_from_json
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+log_dir = "logs"
+os.makedirs(log_dir, exist_ok=True)
+file_handler = logging.FileHandler(
+    os.path.join(log_dir, "ingest.log"), mode="w", encoding="utf-8"
+)
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler.setFormatter(formatter)
+logger.addHandler(file_handler)
+
+# Загрузчик для каждого поддерживаемого расширения файла
+LOADERS = {
+    ".json": load_operations_from_json,
+    ".csv": read_operations_from_csv,
+    ".xlsx": read_operations_from_xlsx,
+}
+
+
+class _ErrorCollector(logging.Handler):
+    """
+    Запоминает предупреждения и ошибки, которые загрузчики пишут в свои логгеры:
+    отклоненные строки и записи, а также ошибки чтения файла.
+    """
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append((record.levelno, record.getMessage()))
+
+    @property
+    def errors(self) -> list[str]:
+        return [message for level, message in self.records if level >= logging.ERROR]
+
+    @property
+    def messages(self) -> list[str]:
+        return [message for _, message in self.records]
+
+
+def _load_file(path: str) -> tuple[str, list[Operation], str | None, list[str]]:
+    """
+    Загружает один файл подходящим загрузчиком и приводит операции к Operation.
+    Выполняется в процессе-исполнителе, поэтому ошибки возвращаются, а не пробрасываются.
+
+    Загрузчики не пробрасывают ошибки разбора, а пишут их в лог и возвращают [],
+    поэтому пустой результат считается ошибкой, только если загрузчик сообщил
+    об ошибке; корректный файл без записей загружается как пустой.
+    Сообщения об отклоненных строках и записях возвращаются последним элементом.
+    """
+    loader = LOADERS[os.path.splitext(path)[1].lower()]
+    collector = _ErrorCollector()
+    # Логгеры всех модулей src.* передают записи родительскому логгеру "src"
+    src_logger = logging.getLogger("src")
+    src_logger.addHandler(collector)
+    try:
+        operations = list(to_operations(loader(path), path))
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}", collector.messages
+    finally:
+        src_logger.removeHandler(collector)
+    messages = collector.messages
+    errors = collector.errors
+    if not operations and errors:
+        messages.remove(errors[0])
+        return path, [], errors[0], messages
+    return path, operations, None, messages
+
+
+def list_operation_files(directory: str, recursive: bool = False) -> list[str]:
+    """Возвращает отсортированный список файлов каталога с поддерживаемыми расширениями."""
+    if recursive:
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(directory)
+            for name in names
+        ]
+    else:
+        paths = [entry.path for entry in os.scandir(directory) if entry.is_file()]
+    return sorted(
+        path for path in paths if os.path.splitext(path)[1].lower() in LOADERS
+    )
+
+
+def ingest_directory(
+    directory: str,
+    max_workers: int | None = None,
+    ordered: bool = True,
+    recursive: bool = False,
+) -> tuple[list[Operation], dict[str, dict]]:
+    """
+    Загружает все файлы JSON/CSV/XLSX из каталога в пуле процессов
+    и объединяет их в один список нормализованных операций Operation.
+
+    Args:
+        directory (str): Каталог с выгрузками.
+        max_workers (int | None): Количество процессов; None — по числу ядер,
+                                  1 — загрузка в текущем процессе без пула.
+        ordered (bool): True — операции идут в порядке имен файлов,
+                        False — в порядке завершения загрузки. Список возвращается
+                        целиком в обоих случаях, после загрузки всех файлов.
+        recursive (bool): Обходить ли вложенные каталоги.
+
+    Returns:
+        tuple[list[Operation], dict[str, dict]]: Объединенные операции и отчет по файлам
+            вида {путь: {"count": количество операций, "error": текст ошибки или None,
+            "rejected": сообщения об отклоненных строках и записях файла}}.
+    """
+    if not os.path.isdir(directory):
+        logger.error(f"Каталог не найден: {directory}")
+        return [], {}
+
+    paths = list_operation_files(directory, recursive)
+    if not paths:
+        logger.warning(f"В каталоге {directory} нет файлов JSON/CSV/XLSX.")
+        return [], {}
+
+    if max_workers == 1:
+        results = map(_load_file, paths)
+        return _merge(results, paths)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_load_file, path) for path in paths]
+        if ordered:
+            results = (future.result() for future in futures)
+        else:
+            results = (future.result() for future in as_completed(futures))
+        return _merge(results, paths)
+
+
+def _merge(results, paths: list[str]) -> tuple[list[Operation], dict[str, dict]]:
+    """Объединяет результаты загрузки файлов и составляет отчет."""
+    operations = []
+    report = {}
+    for path, file_operations, error, rejected in results:
+        operations.extend(file_operations)
+        report[path] = {
+            "count": len(file_operations),
+            "error": error,
+            "rejected": rejected,
+        }
+        if error:
+            logger.warning(f"Файл {path} не загружен: {error}")
+
+    failed = sum(1 for item in report.values() if item["error"])
+    logger.info(
+        f"Загружено {len(operations)} операций из {len(paths) - failed} файлов, ошибок: {failed}."
+    )
+    return operations, report
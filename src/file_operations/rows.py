@@ -0,0 +1,121 @@
+# Общие правила преобразования строк CSV и Excel в операции.
+# Модуль не зависит от openpyxl, чтобы его могли использовать легкие загрузчики.
+import logging
+from datetime import datetime
+
+from src.models.operation import MINOR_UNITS, to_minor_units
+
+# Обязательные заголовки для CSV и Excel с учетом currency_code
+REQUIRED_HEADERS = [
+    "id",
+    "state",
+    "date",
+    "amount",
+    "currency_name",
+    "currency_code",
+    "description",
+]
+
+
+def csv_row_to_operation(row: dict) -> dict:
+    """
+    Преобразует строку CSV (словарь из csv.DictReader) в операцию.
+    Вызывает KeyError или ValueError для некорректной строки.
+    """
+    # Приводим 'state' к верхнему регистру для единообразия с JSON
+    status = str(row.get("state", "")).upper()
+    # Сумма разбирается из текста ячейки через Decimal, без промежуточного float
+    amount_minor = to_minor_units(row["amount"])
+
+    return {
+        "id": int(row["id"]),
+        "description": str(row["description"]),
+        "amount": amount_minor / MINOR_UNITS,
+        "amount_minor": amount_minor,
+        "currency_name": str(row["currency_name"]),
+        "currency_code": str(row["currency_code"]),  # Ключевой для фильтрации
+        "date": str(row["date"]),  # Дата остается строкой, форматируется позже
+        "state": status,  # Используем 'state' вместо 'status'
+        "from": str(row.get("from", "")),
+        "to": str(row.get("to", "")),
+    }
+
+
+def is_empty_excel_row(row_data: dict) -> bool:
+    """Проверяет, что в строке Excel нет значимых данных (кроме from/to/description)."""
+    return not any(
+        value
+        for key, value in row_data.items()
+        if key not in ["from", "to", "description"] and value is not None
+    )
+
+
+def excel_row_to_operation(row_data: dict) -> dict:
+    """
+    Преобразует строку Excel (словарь заголовок -> значение ячейки) в операцию.
+    Вызывает KeyError или ValueError для некорректной строки.
+    """
+    date_value = row_data.get("date")
+    if isinstance(date_value, datetime):
+        date_str = date_value.strftime("%Y-%m-%dT%H:%M:%SZ")  # Сохраняем формат JSON
+    elif date_value is not None:
+        date_str = str(date_value)
+    else:
+        date_str = ""
+
+    # Приводим 'state' к верхнему регистру для единообразия с JSON
+    status = str(row_data.get("state", "")).upper()
+    # Числовая ячейка Excel хранится как double; str() дает ее кратчайшую
+    # десятичную запись, из которой Decimal получает точные копейки
+    amount_minor = to_minor_units(row_data["amount"])
+
+    return {
+        "id": int(row_data["id"]),
+        "description": str(row_data["description"]),
+        "amount": amount_minor / MINOR_UNITS,
+        "amount_minor": amount_minor,
+        "currency_name": str(row_data["currency_name"]),
+        "currency_code": str(row_data["currency_code"]),  # Ключевой для фильтрации
+        "date": date_str,
+        "state": status,
+        "from": str(
+            row_data.get("from", "") if row_data.get("from") is not None else ""
+        ),
+        "to": str(row_data.get("to", "") if row_data.get("to") is not None else ""),
+    }
+
+
+def log_excel_row_error(
+    logger: logging.Logger,
+    excel_filepath: str,
+    row_index: int,
+    row_data: dict,
+    error: Exception,
+) -> None:
+    """Записывает в лог ошибку обработки строки Excel в едином формате."""
+    if isinstance(error, KeyError):
+        logger.error(
+            f"Ошибка при обработке строки {row_index} в Excel файле '{excel_filepath}': Отсутствует ключ {error}. Строка: {row_data}"
+        )
+    elif isinstance(error, ValueError):
+        logger.error(
+            f"Ошибка преобразования данных в строке {row_index} в Excel файле '{excel_filepath}': {error}. Строка: {row_data}"
+        )
+    else:
+        logger.error(
+            f"Неожиданная ошибка при обработке строки {row_index} в Excel файле '{excel_filepath}': {error}. Строка: {row_data}"
+        )
+
+
+def has_required_excel_headers(
+    logger: logging.Logger, excel_filepath: str, header: list
+) -> bool:
+    """Проверяет заголовки листа Excel и записывает в лог недостающие."""
+    if all(h in header for h in REQUIRED_HEADERS):
+        return True
+    missing_headers = [h for h in REQUIRED_HEADERS if h not in header]
+    logger.error(
+        f"Excel файл '{excel_filepath}' не содержит всех обязательных заголовков: {missing_headers}. "
+        f"Найдено: {header}"
+    )
+    return False
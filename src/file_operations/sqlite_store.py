@@ -0,0 +1,213 @@
+# Хранилище операций в SQLite с индексами для частых запросов.
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from src.models.operation import Operation, to_operations
+from src.utils.dates import EPOCH, MISSING_DATE, ONE_MICROSECOND, to_epoch_microseconds
+from src.utils.text_search import compile_pattern
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+log_dir = "logs"
+os.makedirs(log_dir, exist_ok=True)
+file_handler = logging.FileHandler(
+    os.path.join(log_dir, "sqlite_store.log"), mode="w", encoding="utf-8"
+)
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler.setFormatter(formatter)
+logger.addHandler(file_handler)
+
+ONE_DAY = timedelta(days=1)
+
+# Количество строк в одном вызове executemany
+INSERT_BATCH_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    date_us INTEGER,
+    state TEXT NOT NULL,
+    amount_minor INTEGER NOT NULL,
+    currency_code TEXT NOT NULL,
+    currency_name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    recipient TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_operations_state ON operations (state);
+CREATE INDEX IF NOT EXISTS idx_operations_date ON operations (date_us);
+CREATE INDEX IF NOT EXISTS idx_operations_currency ON operations (currency_code);
+-- Описания ищутся только через REGEXP, который не использует индексы
+DROP INDEX IF EXISTS idx_operations_description;
+"""
+
+INSERT_SQL = (
+    "INSERT OR REPLACE INTO operations (id, date, date_us, state, amount_minor, "
+    "currency_code, currency_name, description, sender, recipient) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Порядок столбцов совпадает с порядком аргументов Operation
+COLUMN_NAMES = (
+    "id",
+    "date",
+    "state",
+    "amount_minor",
+    "currency_code",
+    "currency_name",
+    "description",
+    "sender",
+    "recipient",
+)
+COLUMNS = ", ".join(COLUMN_NAMES)
+
+
+def _regexp(pattern: str, value: str) -> bool:
+    """Функция REGEXP для SQLite: 'value REGEXP pattern' без учета регистра."""
+    return value is not None and compile_pattern(pattern).search(value) is not None
+
+
+def _to_row(op: Operation) -> tuple:
+    date_us = to_epoch_microseconds(op.date)
+    return (
+        int(op.id),
+        op.date,
+        None if date_us == MISSING_DATE else date_us,
+        op.state,
+        op.amount_minor,
+        op.currency_code,
+        op.currency_name,
+        op.description,
+        op.from_,
+        op.to,
+    )
+
+
+class OperationStore:
+    """
+    Операции в локальном файле SQLite.
+
+    Подходит для истории за годы: данные загружаются один раз, а запросы
+    возвращают только найденные операции, не поднимая всю базу в память.
+    База открывается в режиме WAL, поэтому чтение не блокируется записью.
+
+    Операция с уже существующим id заменяется, так что повторная загрузка
+    того же файла не создает дубликатов.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.create_function("REGEXP", 2, _regexp, deterministic=True)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "OperationStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM operations").fetchone()[0]
+
+    # --- Загрузка ---
+
+    def bulk_load(
+        self, operations: Iterable, batch_size: int = INSERT_BATCH_SIZE
+    ) -> int:
+        """
+        Загружает операции (словари любого загрузчика или Operation) пачками
+        через executemany в одной транзакции. Принимает и потоковые загрузчики.
+
+        Returns:
+            int: Количество загруженных операций.
+        """
+        rows = map(_to_row, to_operations(operations))
+        total = 0
+        with self.connection:
+            while batch := list(islice(rows, batch_size)):
+                self.connection.executemany(INSERT_SQL, batch)
+                total += len(batch)
+        logger.info(f"В {self.db_path} загружено {total} операций.")
+        return total
+
+    def load_file(self, path: str, loader: Callable[[str], Iterable]) -> int:
+        """Загружает файл выгрузки любым из загрузчиков (load_operations_from_json и др.)."""
+        return self.bulk_load(loader(path))
+
+    # --- Запросы ---
+
+    def _iter_where(self, where: str = "1", params: tuple = ()) -> Iterator:
+        """
+        Лениво отдает операции по условию SQL в порядке загрузки.
+        where — только постоянный текст из этого модуля, значения передаются в params.
+        """
+        cursor = self.connection.execute(
+            f"SELECT {COLUMNS} FROM operations WHERE {where} ORDER BY rowid", params
+        )
+        for row in cursor:
+            yield Operation(*row)
+
+    def iter_operations(self, **equals) -> Iterator:
+        """
+        Лениво отдает операции в порядке загрузки; именованные аргументы задают
+        условия равенства по столбцам, например iter_operations(state="EXECUTED").
+        Значения передаются параметрами запроса, имена столбцов проверяются
+        по списку COLUMN_NAMES (ValueError для неизвестного столбца).
+        """
+        unknown = set(equals) - set(COLUMN_NAMES)
+        if unknown:
+            raise ValueError(f"Неизвестные столбцы: {sorted(unknown)}")
+        where = " AND ".join(f"{column} = ?" for column in equals) or "1"
+        return self._iter_where(where, tuple(equals.values()))
+
+    def filter_by_state(self, state: str = "EXECUTED") -> list[Operation]:
+        """Аналог processing.filter_by_state."""
+        return list(self.iter_operations(state=state))
+
+    def filter_by_currency(self, currency_code: str) -> list[Operation]:
+        """Аналог generators.filter_by_currency."""
+        return list(self.iter_operations(currency_code=currency_code.upper()))
+
+    def find_transactions_by_description(self, search_string: str) -> list[Operation]:
+        """
+        Аналог additional_analytics.find_transactions_by_description:
+        поиск по регулярному выражению без учета регистра.
+        Для некорректного выражения возвращается пустой список.
+        """
+        if not search_string:
+            return list(self.iter_operations())
+        try:
+            compile_pattern(search_string)
+        except re.error as e:
+            logger.error(f"Некорректное регулярное выражение '{search_string}': {e}.")
+            return []
+        return list(self._iter_where("description REGEXP ?", (search_string,)))
+
+    def get_transactions_by_date(self, target_date_str: str) -> list[Operation]:
+        """
+        Аналог analytics.get_transactions_by_date: дата в формате ДД.ММ.ГГГГ.
+        Для некорректной даты возвращается пустой список.
+        """
+        try:
+            day = datetime.strptime(target_date_str, "%d.%m.%Y")
+        except ValueError:
+            logger.error(
+                f"Некорректный формат целевой даты: '{target_date_str}'. Ожидается ДД.ММ.ГГГГ."
+            )
+            return []
+        start = (day - EPOCH) // ONE_MICROSECOND
+        end = start + ONE_DAY // ONE_MICROSECOND
+        return list(self._iter_where("date_us >= ? AND date_us < ?", (start, end)))
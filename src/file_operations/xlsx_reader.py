@@ -0,0 +1,392 @@
+# Легкий загрузчик XLSX без openpyxl.
+# Разбирает XML листа и таблицу общих строк прямо из zip-архива: лист — потоковым
+# парсером expat с приемником событий, общие строки — через iterparse.
+import logging
+import os
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import datetime, timedelta
+from itertools import zip_longest
+from typing import Iterator
+
+from src.file_operations.rows import (
+    excel_row_to_operation,
+    has_required_excel_headers,
+    is_empty_excel_row,
+    log_excel_row_error,
+)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+log_dir = "logs"
+os.makedirs(log_dir, exist_ok=True)
+file_handler = logging.FileHandler(
+    os.path.join(log_dir, "xlsx_reader.log"), mode="w", encoding="utf-8"
+)
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler.setFormatter(formatter)
+logger.addHandler(file_handler)
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+ROW_TAG = f"{MAIN_NS}row"
+CELL_TAG = f"{MAIN_NS}c"
+V_TAG = f"{MAIN_NS}v"
+F_TAG = f"{MAIN_NS}f"
+IS_TAG = f"{MAIN_NS}is"
+T_TAG = f"{MAIN_NS}t"
+
+WORKBOOK_PATH = "xl/workbook.xml"
+WORKBOOK_RELS_PATH = "xl/_rels/workbook.xml.rels"
+SHARED_STRINGS_TYPE = "/sharedStrings"
+STYLES_TYPE = "/styles"
+
+# Встроенные форматы чисел Excel, которые означают дату или время
+BUILTIN_DATE_FORMATS = {14, 15, 16, 17, 18, 19, 20, 21, 22, 45, 46, 47}
+
+WINDOWS_EPOCH = datetime(1899, 12, 30)
+MAC_EPOCH = datetime(1904, 1, 1)
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Убираем из формата строки в кавычках, экранированные символы и [цвет]/[условия]
+_FORMAT_NOISE_RE = re.compile(r'"[^"]*"|\\.|\[(?!(?:h+|m+|s+)\])[^\]]*\]')
+_DATE_TOKEN_RE = re.compile(r"[dmyhs]", re.IGNORECASE)
+_CELL_REF_RE = re.compile(r"([A-Z]+)")
+
+
+def _is_date_format(format_code: str) -> bool:
+    """Определяет, что пользовательский формат числа отображает дату или время."""
+    first_section = format_code.split(";")[0]
+    return bool(_DATE_TOKEN_RE.search(_FORMAT_NOISE_RE.sub("", first_section)))
+
+
+def _column_index(cell_ref: str) -> int:
+    """Переводит ссылку на ячейку ('C7') в индекс колонки с нуля (2)."""
+    letters = _CELL_REF_RE.match(cell_ref).group(1)
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def _from_excel_serial(value: float, epoch: datetime):
+    """Переводит серийный номер даты Excel в datetime, как это делает openpyxl."""
+    day, fraction = divmod(value, 1)
+    diff = timedelta(milliseconds=round(fraction * SECONDS_PER_DAY * 1000))
+    if 0 <= value < 1 and diff.days == 0:
+        return (datetime.min + diff).time()
+    if 0 < value < 60 and epoch == WINDOWS_EPOCH:
+        # Excel считает 1900 год високосным, до 1 марта сдвигаем на день
+        day += 1
+    return epoch + timedelta(days=day) + diff
+
+
+def _cast_number(value: str):
+    """Число из XML ячейки: int для целых записей, float для остальных."""
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _resolve_target(target: str) -> str:
+    """Путь части пакета из атрибута Target в xl/_rels/workbook.xml.rels."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def _read_workbook_layout(
+    archive: zipfile.ZipFile,
+) -> tuple[str, str | None, str | None, datetime]:
+    """
+    Находит пути активного листа, таблицы общих строк и стилей,
+    а также систему дат книги (1900 или 1904).
+    """
+    relationships = {}
+    shared_strings_path = None
+    styles_path = None
+    with archive.open(WORKBOOK_RELS_PATH) as f:
+        for rel in ET.parse(f).getroot().iter(f"{PKG_REL_NS}Relationship"):
+            target = _resolve_target(rel.get("Target", ""))
+            rel_type = rel.get("Type", "")
+            relationships[rel.get("Id")] = target
+            if rel_type.endswith(SHARED_STRINGS_TYPE):
+                shared_strings_path = target
+            elif rel_type.endswith(STYLES_TYPE):
+                styles_path = target
+
+    with archive.open(WORKBOOK_PATH) as f:
+        workbook = ET.parse(f).getroot()
+
+    workbook_pr = workbook.find(f"{MAIN_NS}workbookPr")
+    date1904 = workbook_pr is not None and workbook_pr.get("date1904") in ("1", "true")
+
+    view = workbook.find(f"{MAIN_NS}bookViews/{MAIN_NS}workbookView")
+    active_tab = int(view.get("activeTab", 0)) if view is not None else 0
+    sheets = workbook.findall(f"{MAIN_NS}sheets/{MAIN_NS}sheet")
+    if not sheets:
+        raise ValueError("книга не содержит листов")
+    sheet = sheets[active_tab] if active_tab < len(sheets) else sheets[0]
+    sheet_path = relationships[sheet.get(f"{REL_NS}id")]
+
+    return (
+        sheet_path,
+        shared_strings_path,
+        styles_path,
+        MAC_EPOCH if date1904 else WINDOWS_EPOCH,
+    )
+
+
+def _read_shared_strings(archive: zipfile.ZipFile, path: str | None) -> list[str]:
+    """Читает таблицу общих строк инкрементально, освобождая разобранные элементы."""
+    if path is None or path not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open(path) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag != f"{MAIN_NS}si":
+                continue
+            plain = elem.find(T_TAG)
+            if plain is not None:
+                strings.append(plain.text or "")
+            else:
+                # Форматированная строка: склеиваем фрагменты r/t, пропуская фонетику rPh
+                strings.append(
+                    "".join(
+                        t.text or ""
+                        for r in elem.findall(f"{MAIN_NS}r")
+                        for t in r.findall(T_TAG)
+                    )
+                )
+            elem.clear()
+    return strings
+
+
+def _read_date_styles(archive: zipfile.ZipFile, path: str | None) -> set[int]:
+    """Возвращает индексы стилей ячеек (атрибут s), которые отображают дату."""
+    if path is None or path not in archive.namelist():
+        return set()
+
+    with archive.open(path) as f:
+        styles = ET.parse(f).getroot()
+
+    date_formats = set(BUILTIN_DATE_FORMATS)
+    for num_fmt in styles.iterfind(f"{MAIN_NS}numFmts/{MAIN_NS}numFmt"):
+        if _is_date_format(num_fmt.get("formatCode", "")):
+            date_formats.add(int(num_fmt.get("numFmtId")))
+
+    return {
+        style_index
+        for style_index, xf in enumerate(
+            styles.iterfind(f"{MAIN_NS}cellXfs/{MAIN_NS}xf")
+        )
+        if int(xf.get("numFmtId", 0)) in date_formats
+    }
+
+
+def _convert_cell(
+    raw: str,
+    cell_type: str | None,
+    style: str | None,
+    shared_strings: list[str],
+    date_styles: set[int],
+    epoch: datetime,
+):
+    """Значение ячейки в том же виде, в каком его возвращает openpyxl."""
+    if cell_type is None or cell_type == "n":
+        value = _cast_number(raw)
+        if style is not None and date_styles and int(style) in date_styles:
+            return _from_excel_serial(value, epoch)
+        return value
+    if cell_type == "s":
+        return shared_strings[int(raw)]
+    if cell_type == "b":
+        return bool(int(raw))
+    if cell_type == "d":
+        return datetime.fromisoformat(raw)
+    # "str" (результат формулы) и "e" (ошибка) возвращаются строкой
+    return raw
+
+
+class _SheetRowsTarget:
+    """
+    Приемник событий expat для XML листа.
+    Не строит дерево элементов: собирает значения ячеек текущей строки
+    и складывает готовые строки в self.ready, откуда их забирает генератор.
+    """
+
+    def __init__(self, shared_strings: list[str], date_styles: set[int], epoch):
+        self.ready = []
+        self._shared_strings = shared_strings
+        self._date_styles = date_styles
+        self._epoch = epoch
+        self._columns = {}  # Кэш: буквы колонки -> индекс
+        self._next_row_number = 1
+        self._row_number = 0
+        self._values = []
+        self._position = 0
+        self._cell_ref = None
+        self._cell_type = None
+        self._cell_style = None
+        self._raw = None
+        self._formula = None
+        self._inline = None
+        self._text = None
+
+    def start(self, tag, attrib):
+        if tag == CELL_TAG:
+            self._cell_ref = attrib.get("r")
+            self._cell_type = attrib.get("t")
+            self._cell_style = attrib.get("s")
+            self._raw = self._formula = self._inline = None
+        elif tag == V_TAG or tag == F_TAG:
+            self._text = []
+        elif tag == IS_TAG:
+            self._inline = []
+        elif tag == T_TAG and self._inline is not None:
+            self._text = []
+        elif tag == ROW_TAG:
+            self._row_number = int(attrib.get("r", self._next_row_number))
+            self._next_row_number = self._row_number + 1
+            self._values = []
+            self._position = 0
+
+    def data(self, text):
+        if self._text is not None:
+            self._text.append(text)
+
+    def end(self, tag):
+        if tag == V_TAG:
+            self._raw = "".join(self._text)
+            self._text = None
+        elif tag == F_TAG:
+            self._formula = "".join(self._text)
+            self._text = None
+        elif tag == T_TAG and self._text is not None:
+            self._inline.append("".join(self._text))
+            self._text = None
+        elif tag == CELL_TAG:
+            self._end_cell()
+        elif tag == ROW_TAG:
+            self.ready.append((self._row_number, self._values))
+
+    def close(self):
+        return None
+
+    def _end_cell(self):
+        if self._formula:
+            value = f"={self._formula}"
+        elif self._inline is not None:
+            value = "".join(self._inline)
+        elif self._raw is None:
+            value = None
+        else:
+            value = _convert_cell(
+                self._raw,
+                self._cell_type,
+                self._cell_style,
+                self._shared_strings,
+                self._date_styles,
+                self._epoch,
+            )
+
+        if self._cell_ref:
+            letters = self._cell_ref.rstrip("0123456789")
+            column = self._columns.get(letters)
+            if column is None:
+                column = self._columns[letters] = _column_index(letters)
+        else:
+            column = self._position
+        self._position = column + 1
+
+        values = self._values
+        if column == len(values):
+            values.append(value)
+        else:
+            if column > len(values):
+                values.extend([None] * (column + 1 - len(values)))
+            values[column] = value
+
+
+def iter_xlsx_rows(
+    excel_filepath: str, chunk_size: int = 64 * 1024
+) -> Iterator[tuple[int, list]]:
+    """
+    Отдает строки активного листа как пары (номер строки, список значений).
+    Лист разбирается потоково блоками по chunk_size байт: в памяти находятся
+    только строки текущего блока и таблица общих строк.
+    Пустые строки, отсутствующие в XML, пропускаются.
+    """
+    with zipfile.ZipFile(excel_filepath) as archive:
+        sheet_path, shared_strings_path, styles_path, epoch = _read_workbook_layout(
+            archive
+        )
+        shared_strings = _read_shared_strings(archive, shared_strings_path)
+        date_styles = _read_date_styles(archive, styles_path)
+
+        target = _SheetRowsTarget(shared_strings, date_styles, epoch)
+        parser = ET.XMLParser(target=target)
+        with archive.open(sheet_path) as f:
+            while chunk := f.read(chunk_size):
+                parser.feed(chunk)
+                if target.ready:
+                    yield from target.ready
+                    target.ready = []
+        parser.close()
+        yield from target.ready
+
+
+def iter_operations_from_xlsx(excel_filepath: str) -> Iterator[dict]:
+    """
+    Потоково читает операции из XLSX файла без openpyxl.
+    Возвращает те же словари, что и read_operations_from_excel,
+    для простых табличных листов: заголовки в первой строке, данные ниже.
+    """
+    if not os.path.exists(excel_filepath):
+        logger.error(f"Excel файл не найден: {excel_filepath}")
+        return
+
+    count = 0
+    try:
+        rows = iter_xlsx_rows(excel_filepath)
+        first_row = next(rows, None)
+        header = first_row[1] if first_row is not None and first_row[0] == 1 else []
+
+        if not has_required_excel_headers(logger, excel_filepath, header):
+            return
+
+        width = len(header)
+        for row_index, values in rows:
+            row_data = dict(zip_longest(header, values[:width]))
+
+            # Пропускаем полностью пустые строки
+            if is_empty_excel_row(row_data):
+                continue
+
+            try:
+                operation = excel_row_to_operation(row_data)
+            except Exception as e:
+                log_excel_row_error(logger, excel_filepath, row_index, row_data, e)
+                continue
+            count += 1
+            yield operation
+        logger.info(
+            f"Успешно загружено {count} операций из Excel файла (XML): {excel_filepath}"
+        )
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        logger.error(
+            f"Ошибка: Файл '{excel_filepath}' не является действительным файлом Excel. {e}"
+        )
+    except Exception as e:
+        logger.error(f"Ошибка при чтении Excel файла {excel_filepath}: {e}")
+
+
+def read_operations_from_xlsx(excel_filepath: str) -> list[dict]:
+    """Списочный вариант iter_operations_from_xlsx."""
+    return list(iter_operations_from_xlsx(excel_filepath))
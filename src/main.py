@@ -6,22 +6,22 @@ import sys
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, project_root)
 
-from src.analysis.additional_analytics import (
-    count_transactions_by_category,
-    find_transactions_by_description,
-)
+from src.analysis.additional_analytics import count_transactions_by_category
 from src.analysis.analytics import (
     get_account_number_masked,
     get_card_number_masked,
     get_transactions_by_date,
 )
+from src.analysis.query import Query
+from src.file_operations.cache import ParsedCache
 from src.file_operations.file_operations import (
     read_operations_from_csv,
     read_operations_from_excel,
 )
+from src.models.operation import Operation, from_minor_units, to_operations
 
 # Переименовал load_operations на load_operations_from_json для ясности
-from src.utils.utils import load_operations_from_json, sort_operations_by_date
+from src.utils.utils import load_operations_from_json
 
 # Настройка логирования для main.py
 logger = logging.getLogger(__name__)
@@ -37,48 +37,26 @@ file_handler.setFormatter(formatter)
 logger.addHandler(file_handler)
 
 
-def get_currency_code(transaction: dict, file_type: str) -> str:
+def get_currency_code(transaction: Operation) -> str:
     """
-    Извлекает код валюты из транзакции в зависимости от типа исходного файла.
+    Возвращает код валюты операции.
+    Схема уже нормализована в Operation, поэтому тип исходного файла не нужен.
     """
-    if file_type == "json":
-        # Для JSON-файлов валюта находится в operationAmount.currency.code
-        return (
-            transaction.get("operationAmount", {})
-            .get("currency", {})
-            .get("code", "")
-            .upper()
-        )
-    elif file_type in ["csv", "excel"]:
-        # Для CSV/Excel валюта находится по ключу 'currency_code'
-        return transaction.get("currency_code", "").upper()
-    return ""
+    return transaction.currency_code
 
 
-def format_transaction(transaction: dict, file_type: str) -> str:
+def format_transaction(transaction: Operation) -> str:
     """
     Форматирует информацию о транзакции для вывода в соответствии с ТЗ.
-    Принимает file_type для корректного извлечения валюты.
     """
-    date = transaction.get("date", "Дата неизвестна")
-    description = transaction.get("description", "Описание неизвестно")
-
-    # Получаем сумму и валюту в зависимости от типа файла
-    if file_type == "json":
-        amount = transaction.get("operationAmount", {}).get("amount", "N/A")
-        currency_code = (
-            transaction.get("operationAmount", {})
-            .get("currency", {})
-            .get("code", "RUB")
-        )
-    else:  # csv или excel
-        amount = transaction.get("amount", "N/A")
-        currency_code = transaction.get(
-            "currency_code", "RUB"
-        )  # Изменено на 'currency_code'
+    date = transaction.date or "Дата неизвестна"
+    description = transaction.description or "Описание неизвестно"
+    # Сумма из целых копеек/центов, всегда с двумя знаками после запятой
+    amount = f"{from_minor_units(transaction.amount_minor):.2f}"
+    currency_code = transaction.currency_code or "RUB"
 
-    from_info = transaction.get("from", "")
-    to_info = transaction.get("to", "")
+    from_info = transaction.from_
+    to_info = transaction.to
 
     # Форматирование отправителя
     formatted_from = ""
@@ -132,8 +110,10 @@ def main():
     csv_path = os.path.join(data_dir, "transactions.csv")
     excel_path = os.path.join(data_dir, "transactions_excel.xlsx")
 
+    # Разобранные выгрузки кешируются на диске и не разбираются заново при каждом запуске
+    cache = ParsedCache(os.path.join(project_root, ".cache"))
+
     operations = []
-    selected_file_type = ""  # Переменная для хранения типа выбранного файла
 
     print("Привет! Добро пожаловать в программу работы с банковскими транзакциями.")
 
@@ -149,22 +129,17 @@ def main():
         if file_choice == "1":
             logger.info("Пользователь выбрал JSON-файл.")
             print("Для обработки выбран JSON-файл.")
-            operations = load_operations_from_json(
-                json_path
-            )  # Используем load_operations_from_json
-            selected_file_type = "json"
+            operations = cache.load(json_path, load_operations_from_json)
             break
         elif file_choice == "2":
             logger.info("Пользователь выбрал CSV-файл.")
             print("Для обработки выбран CSV-файл.")
-            operations = read_operations_from_csv(csv_path)
-            selected_file_type = "csv"
+            operations = cache.load(csv_path, read_operations_from_csv)
             break
         elif file_choice == "3":
             logger.info("Пользователь выбрал XLSX-файл.")
             print("Для обработки выбран XLSX-файл.")
-            operations = read_operations_from_excel(excel_path)
-            selected_file_type = "excel"
+            operations = cache.load(excel_path, read_operations_from_excel)
             break
         elif file_choice == "0":
             logger.info("Пользователь выбрал выход из программы.")
@@ -183,11 +158,12 @@ def main():
         )
         return
 
-    filtered_operations = list(operations)  # Копируем список для дальнейшей фильтрации
+    # Приводим операции любого формата к единой схеме Operation один раз при загрузке.
+    # Фильтры и сортировка собираются в один запрос и выполняются одним проходом в конце.
+    query = Query(list(to_operations(operations)))
 
     # --- Фильтрация по статусу ---
-    # Для CSV/Excel статус теперь 'state', для JSON - 'state'.
-    # В file_operations мы привели 'state' к верхнему регистру, поэтому здесь просто используем 'state'
+    # Статус в Operation уже приведен к верхнему регистру
     available_statuses = {"EXECUTED", "CANCELED", "PENDING"}
     while True:
         print("\nВведите статус, по которому необходимо выполнить фильтрацию.")
@@ -195,23 +171,16 @@ def main():
         status_input = input("Ваш статус: ").upper().strip()
 
         if status_input in available_statuses:
-            # Для JSON статус 'state', для CSV/Excel тоже 'state' после обработки в file_operations
-            filtered_operations = [
-                op
-                for op in filtered_operations
-                if op.get("state", "").upper() == status_input
-            ]
+            query = query.state(status_input)
             print(f'Операции отфильтрованы по статусу "{status_input}"')
-            logger.info(
-                f"Операции отфильтрованы по статусу: {status_input}. Осталось {len(filtered_operations)} операций."
-            )
+            logger.info(f"Операции отфильтрованы по статусу: {status_input}.")
             break
         else:
             print(f'Статус операции "{status_input}" недоступен.')
             logger.warning(f"Пользователь ввел недопустимый статус: {status_input}")
 
-    # Если после фильтрации по статусу список пуст, можем сразу выйти
-    if not filtered_operations:
+    # Если после фильтрации по статусу ничего не осталось, можем сразу выйти
+    if not query.exists():
         print(
             "\nНе найдено ни одной транзакции, подходящей под ваши условия фильтрации."
         )
@@ -232,15 +201,11 @@ def main():
                 .strip()
             )
             if sort_order_choice == "по возрастанию":
-                filtered_operations = sort_operations_by_date(
-                    filtered_operations, reverse=False
-                )
+                query = query.sort_by_date(descending=False)
                 logger.info("Операции отсортированы по возрастанию даты.")
                 break
             elif sort_order_choice == "по убыванию":
-                filtered_operations = sort_operations_by_date(
-                    filtered_operations, reverse=True
-                )
+                query = query.sort_by_date(descending=True)
                 logger.info("Операции отсортированы по убыванию даты.")
                 break
             else:
@@ -253,19 +218,13 @@ def main():
     else:
         logger.info("Пользователь отказался от сортировки по дате.")
 
-    # --- Фильтрация по рублям (исправлено с учетом типа файла) ---
+    # --- Фильтрация по рублям ---
     filter_rub_choice = (
         input("Выводить только рублевые транзакции? Да/Нет: ").lower().strip()
     )
     if filter_rub_choice == "да":
-        filtered_operations = [
-            op
-            for op in filtered_operations
-            if get_currency_code(op, selected_file_type) == "RUB"
-        ]
-        logger.info(
-            f"Операции отфильтрованы по валюте (только RUB). Осталось {len(filtered_operations)} операций."
-        )
+        query = query.currency("RUB")
+        logger.info("Операции отфильтрованы по валюте (только RUB).")
     else:
         logger.info("Пользователь отказался от фильтрации по рублям.")
 
@@ -280,12 +239,8 @@ def main():
     if filter_description_choice == "да":
         search_word = input("Введите слово для поиска в описании: ").strip()
         if search_word:
-            filtered_operations = find_transactions_by_description(
-                filtered_operations, search_word
-            )
-            logger.info(
-                f"Операции отфильтрованы по слову в описании: '{search_word}'. Осталось {len(filtered_operations)} операций."
-            )
+            query = query.description(search_word)
+            logger.info(f"Операции отфильтрованы по слову в описании: '{search_word}'.")
         else:
             print("Слово для поиска не введено. Фильтрация по описанию не выполнена.")
             logger.warning("Пустое слово для поиска описания.")
@@ -294,13 +249,15 @@ def main():
 
     print("\nРаспечатываю итоговый список транзакций...\n")
 
+    filtered_operations = query.to_list()
+
     if not filtered_operations:
         print("Не найдено ни одной транзакции, подходящей под ваши условия фильтрации")
         logger.info("Итоговая выборка пуста.")
     else:
         print(f"Всего банковских операций в выборке: {len(filtered_operations)}\n")
         for op in filtered_operations:
-            print(format_transaction(op, selected_file_type))
+            print(format_transaction(op))
             print("-" * 30)
         logger.info(f"Отображено {len(filtered_operations)} итоговых транзакций.")
 
@@ -0,0 +1,232 @@
+# Компактная нормализованная запись банковской операции.
+import logging
+import os
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Iterable, Iterator
+
+from src.utils.validation import RejectionReport
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+log_dir = "logs"
+os.makedirs(log_dir, exist_ok=True)
+file_handler = logging.FileHandler(
+    os.path.join(log_dir, "operation.log"), mode="w", encoding="utf-8"
+)
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler.setFormatter(formatter)
+logger.addHandler(file_handler)
+
+# Количество минимальных единиц (копеек, центов) в единице валюты
+MINOR_UNITS = 100
+
+
+class Operation:
+    """
+    Банковская операция в единой схеме для всех загрузчиков.
+
+    Поля уже нормализованы: код валюты и статус — в верхнем регистре,
+    отправитель и получатель — строки (пустые, если их нет).
+    Сумма разбирается один раз при загрузке и хранится целым числом копеек/центов
+    в amount_minor; amount — производное значение в единицах валюты.
+    Атрибут 'from' называется from_, потому что 'from' — ключевое слово Python.
+
+    За счет __slots__ запись не хранит собственный словарь атрибутов
+    и занимает в несколько раз меньше памяти, чем операция-словарь.
+    Для совместимости с функциями, которые работают со словарями,
+    поддерживаются get(), доступ по ключу и copy().
+    """
+
+    __slots__ = (
+        "id",
+        "date",
+        "state",
+        "amount_minor",
+        "currency_code",
+        "currency_name",
+        "description",
+        "from_",
+        "to",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        date: str,
+        state: str,
+        amount_minor: int,
+        currency_code: str,
+        currency_name: str = "",
+        description: str = "",
+        from_: str = "",
+        to: str = "",
+    ):
+        self.id = id
+        self.date = date
+        self.state = state
+        self.amount_minor = amount_minor
+        self.currency_code = currency_code
+        self.currency_name = currency_name
+        self.description = description
+        self.from_ = from_
+        self.to = to
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Operation":
+        """
+        Создает операцию из словаря любого загрузчика:
+        JSON (вложенный 'operationAmount'), CSV/Excel ('amount', 'currency_code')
+        или data.transaction_loader ('status', 'currency').
+        Если загрузчик уже перевел сумму в копейки/центы ('amount_minor'),
+        она берется без повторного разбора.
+        Вызывает KeyError, TypeError или ValueError для неполной записи.
+        """
+        op_amount = data.get("operationAmount")
+        if isinstance(op_amount, dict):
+            currency = op_amount["currency"]
+            amount = op_amount["amount"]
+            currency_code = currency.get("code")
+            currency_name = currency.get("name")
+        else:
+            amount = data["amount"]
+            currency_code = data.get("currency_code", data.get("currency"))
+            currency_name = data.get("currency_name")
+
+        amount_minor = data.get("amount_minor")
+        if amount_minor is None:
+            amount_minor = to_minor_units(amount)
+
+        return cls(
+            id=data["id"],
+            date=str(data.get("date") or ""),
+            state=str(data.get("state", data.get("status")) or "").upper(),
+            amount_minor=amount_minor,
+            currency_code=str(currency_code or "").upper(),
+            currency_name=str(currency_name or ""),
+            description=str(data.get("description") or ""),
+            from_=str(data.get("from") or ""),
+            to=str(data.get("to") or ""),
+        )
+
+    @property
+    def amount(self) -> float:
+        """Сумма в единицах валюты (для вывода и совместимости со словарями)."""
+        return self.amount_minor / MINOR_UNITS
+
+    def to_dict(self) -> dict:
+        """Возвращает операцию в плоской схеме read_operations_from_csv."""
+        return {key: getattr(self, attr) for key, attr in _ATTR_BY_KEY.items()}
+
+    def get(self, key: str, default=None):
+        """Доступ к полю по ключу плоской схемы, как у dict.get."""
+        attr = _ATTR_BY_KEY.get(key)
+        if attr is None:
+            return default
+        return getattr(self, attr)
+
+    def __getitem__(self, key: str):
+        attr = _ATTR_BY_KEY.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _ATTR_BY_KEY
+
+    def copy(self) -> "Operation":
+        return Operation(*(getattr(self, attr) for attr in self.__slots__))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Operation):
+            return NotImplemented
+        return all(
+            getattr(self, attr) == getattr(other, attr) for attr in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Operation(id={self.id!r}, date={self.date!r}, state={self.state!r}, "
+            f"amount={self.amount!r}, currency_code={self.currency_code!r}, "
+            f"description={self.description!r})"
+        )
+
+
+# Ключи плоской схемы -> атрибуты Operation
+_ATTR_BY_KEY = {
+    "id": "id",
+    "description": "description",
+    "amount": "amount",
+    "currency_name": "currency_name",
+    "currency_code": "currency_code",
+    "date": "date",
+    "state": "state",
+    "from": "from_",
+    "to": "to",
+}
+
+
+def to_operations(
+    items: Iterable[dict], source: str = "наборе операций"
+) -> Iterator[Operation]:
+    """
+    Преобразует словари любого загрузчика в Operation.
+    Уже готовые Operation пропускаются без изменений.
+    Принимает и списки, и потоковые загрузчики (iter_operations_from_*).
+
+    Записи, которые не удается преобразовать (например, с нечисловой суммой),
+    пропускаются; сводка по ним пишется в лог одним сообщением с указанием source.
+    """
+    report = RejectionReport()
+    try:
+        for index, item in enumerate(items):
+            if isinstance(item, Operation):
+                yield item
+                continue
+            try:
+                operation = Operation.from_dict(item)
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                report.reject(
+                    index, item, f"не удалось преобразовать ({type(e).__name__})"
+                )
+                continue
+            yield operation
+    finally:
+        report.log(logger, source)
+
+
+def to_minor_units(amount) -> int:
+    """
+    Переводит сумму ("31957.58", 31957.58, 16210) в целое число копеек/центов.
+    Вычисление идет через Decimal от строкового представления,
+    поэтому погрешность float не попадает в результат.
+    Вызывает ValueError для значения, которое не является конечным числом.
+    """
+    try:
+        value = Decimal(str(amount).strip()) * MINOR_UNITS
+        return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, OverflowError):
+        raise ValueError(f"Некорректное значение суммы: {amount!r}") from None
+
+
+def from_minor_units(amount_minor: int) -> Decimal:
+    """Точная сумма в единицах валюты для целого числа копеек/центов."""
+    return Decimal(amount_minor) / MINOR_UNITS
+
+
+def sum_minor_units(operations: Iterable[Operation]) -> int:
+    """Точная сумма операций в копейках/центах (без накопления ошибки float)."""
+    return sum(op.amount_minor for op in operations)
+
+
+def sum_minor_units_by(operations: Iterable[Operation], field: str) -> dict[str, int]:
+    """
+    Суммы операций в копейках/центах, сгруппированные по полю плоской схемы
+    (например, 'currency_code' или 'state').
+    """
+    attr = _ATTR_BY_KEY[field]
+    totals = defaultdict(int)
+    for op in operations:
+        totals[getattr(op, attr)] += op.amount_minor
+    return dict(totals)
@@ -0,0 +1,277 @@
+# Колоночное хранилище операций с векторными фильтрами.
+import sys
+from array import array
+from datetime import datetime, timedelta
+from itertools import compress
+from typing import Iterable
+
+from src.models.operation import Operation, to_operations
+from src.utils.dates import EPOCH, MISSING_DATE, ONE_MICROSECOND, to_epoch_microseconds
+from src.utils.text_search import compile_pattern, fold, is_literal
+
+# Словарное кодирование хранит коды в bytearray, поэтому значений не больше 256
+MAX_DICTIONARY_SIZE = 256
+
+
+def mask_and(*masks: bytes) -> bytes:
+    """Поэлементное И для масок из байтов 0/1 одинаковой длины."""
+    result = int.from_bytes(masks[0], "little")
+    for mask in masks[1:]:
+        result &= int.from_bytes(mask, "little")
+    return result.to_bytes(len(masks[0]), "little")
+
+
+def mask_or(*masks: bytes) -> bytes:
+    """Поэлементное ИЛИ для масок из байтов 0/1 одинаковой длины."""
+    result = int.from_bytes(masks[0], "little")
+    for mask in masks[1:]:
+        result |= int.from_bytes(mask, "little")
+    return result.to_bytes(len(masks[0]), "little")
+
+
+class _Dictionary:
+    """Словарное кодирование столбца: значение <-> код в одном байте."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            if len(self.values) >= MAX_DICTIONARY_SIZE:
+                raise ValueError(
+                    f"Слишком много различных значений для словарного кодирования: {value!r}"
+                )
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def translation(self, values: Iterable[str]) -> bytes:
+        """Таблица для bytes.translate: 1 для кодов values, 0 для остальных."""
+        table = bytearray(256)
+        for value in values:
+            code = self.codes.get(value)
+            if code is not None:
+                table[code] = 1
+        return bytes(table)
+
+
+class OperationTable:
+    """
+    Операции, разложенные по столбцам в типизированных массивах.
+
+    - ids, dates (микросекунды от эпохи), amounts (копейки/центы) — array('q');
+    - state и currency_code — байтовые коды словарного кодирования;
+    - описания, отправители и получатели — интернированные строки,
+      поэтому повторяющиеся значения хранятся один раз;
+    - folded_descriptions — описания, приведенные через casefold, для поиска
+      подстроки без учета регистра без преобразования строк при каждом запросе.
+
+    Фильтры строят маску из байтов 0/1 и выбирают строки через itertools.compress.
+    Для статуса и валюты маска получается одним вызовом bytes.translate,
+    то есть без цикла на Python по строкам.
+    Фильтры возвращают новую таблицу, поэтому их можно соединять в цепочку.
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.dates = array("q")
+        self.amounts = array("q")
+        self.states = bytearray()
+        self.currencies = bytearray()
+        self.date_strings = []
+        self.currency_names = []
+        self.descriptions = []
+        self.folded_descriptions = []
+        self.senders = []
+        self.recipients = []
+        self._state_dict = _Dictionary()
+        self._currency_dict = _Dictionary()
+
+    @classmethod
+    def from_operations(cls, items: Iterable) -> "OperationTable":
+        """Строит таблицу из вывода любого загрузчика (словари или Operation)."""
+        table = cls()
+        table.extend(items)
+        return table
+
+    def append(self, operation) -> None:
+        """Добавляет одну операцию (словарь любого загрузчика или Operation)."""
+        if not isinstance(operation, Operation):
+            operation = Operation.from_dict(operation)
+        # Сначала вычисляем все значения строки: если кодирование или преобразование
+        # упадет, ни один столбец не изменится и строки не разъедутся
+        row_id = int(operation.id)
+        date_key = to_epoch_microseconds(operation.date)
+        amount = operation.amount_minor
+        state = self._state_dict.encode(operation.state)
+        currency = self._currency_dict.encode(operation.currency_code)
+        # array('q') отвергает значения вне int64; проверяем до записи в столбцы
+        array("q", (row_id, amount))
+        date_string = sys.intern(operation.date)
+        currency_name = sys.intern(operation.currency_name)
+        description = sys.intern(operation.description)
+        folded_description = sys.intern(fold(operation.description))
+        sender = sys.intern(operation.from_)
+        recipient = sys.intern(operation.to)
+
+        self.ids.append(row_id)
+        self.dates.append(date_key)
+        self.amounts.append(amount)
+        self.states.append(state)
+        self.currencies.append(currency)
+        self.date_strings.append(date_string)
+        self.currency_names.append(currency_name)
+        self.descriptions.append(description)
+        self.folded_descriptions.append(folded_description)
+        self.senders.append(sender)
+        self.recipients.append(recipient)
+
+    def extend(self, items: Iterable) -> None:
+        for operation in to_operations(items):
+            self.append(operation)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, index: int) -> Operation:
+        """Собирает строку таблицы обратно в Operation."""
+        return Operation(
+            id=self.ids[index],
+            date=self.date_strings[index],
+            state=self._state_dict.values[self.states[index]],
+            amount_minor=self.amounts[index],
+            currency_code=self._currency_dict.values[self.currencies[index]],
+            currency_name=self.currency_names[index],
+            description=self.descriptions[index],
+            from_=self.senders[index],
+            to=self.recipients[index],
+        )
+
+    def to_operations(self) -> list[Operation]:
+        return [self.row(i) for i in range(len(self))]
+
+    # --- Маски ---
+
+    def state_mask(self, *states: str) -> bytes:
+        """Маска строк, статус которых входит в states."""
+        return self.states.translate(self._state_dict.translation(states))
+
+    def currency_mask(self, *codes: str) -> bytes:
+        """Маска строк, код валюты которых входит в codes."""
+        table = self._currency_dict.translation(code.upper() for code in codes)
+        return self.currencies.translate(table)
+
+    def date_range_mask(self, start: datetime, end: datetime) -> bytes:
+        """Маска строк с датой в полуинтервале [start, end)."""
+        low = (start - EPOCH) // ONE_MICROSECOND
+        high = (end - EPOCH) // ONE_MICROSECOND
+        return bytes(low <= value < high for value in self.dates)
+
+    def description_mask(self, search_string: str) -> bytes:
+        """
+        Маска строк, описание которых совпадает с search_string без учета регистра.
+        Строка без метасимволов ищется как подстрока в folded_descriptions,
+        остальные — как регулярное выражение (re.error пробрасывается).
+        """
+        if is_literal(search_string):
+            needle = search_string.casefold()
+            return bytes([needle in text for text in self.folded_descriptions])
+        search = compile_pattern(search_string).search
+        return bytes([search(text) is not None for text in self.descriptions])
+
+    # --- Выборка ---
+
+    def take(self, indices: Iterable[int]) -> "OperationTable":
+        """Новая таблица из строк с указанными индексами в указанном порядке."""
+        indices = list(indices)
+        return self._build(lambda column: [column[i] for i in indices])
+
+    def filter(self, mask: bytes) -> "OperationTable":
+        """Новая таблица из строк, для которых байт маски не равен нулю."""
+        return self._build(lambda column: compress(column, mask))
+
+    def _build(self, select) -> "OperationTable":
+        table = OperationTable()
+        table.ids = array("q", select(self.ids))
+        table.dates = array("q", select(self.dates))
+        table.amounts = array("q", select(self.amounts))
+        table.states = bytearray(select(self.states))
+        table.currencies = bytearray(select(self.currencies))
+        table.date_strings = list(select(self.date_strings))
+        table.currency_names = list(select(self.currency_names))
+        table.descriptions = list(select(self.descriptions))
+        table.folded_descriptions = list(select(self.folded_descriptions))
+        table.senders = list(select(self.senders))
+        table.recipients = list(select(self.recipients))
+        # Словари общие: коды в новой таблице те же самые
+        table._state_dict = self._state_dict
+        table._currency_dict = self._currency_dict
+        return table
+
+    # --- Агрегаты по суммам в копейках/центах ---
+
+    def total_amount(self, mask: bytes | None = None) -> int:
+        """Точная сумма amounts (по маске, если она задана) в копейках/центах."""
+        if mask is None:
+            return sum(self.amounts)
+        return sum(compress(self.amounts, mask))
+
+    def sum_by_currency(self) -> dict[str, int]:
+        """Суммы в копейках/центах по кодам валют."""
+        return self._sum_by_codes(self.currencies, self._currency_dict)
+
+    def sum_by_state(self) -> dict[str, int]:
+        """Суммы в копейках/центах по статусам."""
+        return self._sum_by_codes(self.states, self._state_dict)
+
+    def _sum_by_codes(
+        self, codes: bytearray, dictionary: _Dictionary
+    ) -> dict[str, int]:
+        totals = [0] * len(dictionary.values)
+        for code, amount in zip(codes, self.amounts):
+            totals[code] += amount
+        # Значения словаря, которых нет в этой выборке, в результат не попадают
+        present = set(codes)
+        return {
+            value: totals[code]
+            for code, value in enumerate(dictionary.values)
+            if code in present
+        }
+
+    # --- Аналоги функций для списков словарей ---
+
+    def filter_by_state(self, state: str = "EXECUTED") -> "OperationTable":
+        """Аналог processing.filter_by_state."""
+        return self.filter(self.state_mask(state))
+
+    def filter_by_currency(self, currency_code: str) -> "OperationTable":
+        """Аналог generators.filter_by_currency."""
+        return self.filter(self.currency_mask(currency_code))
+
+    def find_transactions_by_description(self, search_string: str) -> "OperationTable":
+        """Аналог additional_analytics.find_transactions_by_description."""
+        if not search_string:
+            return self
+        return self.filter(self.description_mask(search_string))
+
+    def argsort_by_date(self, descending: bool = True) -> list[int]:
+        """Индексы строк с распознанной датой в порядке сортировки по дате."""
+        dates = self.dates
+        valid = compress(range(len(dates)), bytes(d != MISSING_DATE for d in dates))
+        return sorted(valid, key=dates.__getitem__, reverse=descending)
+
+    def sort_by_date(self, descending: bool = True) -> "OperationTable":
+        """
+        Аналог processing.sort_by_date, но сравнивает настоящие даты, а не строки,
+        и отбрасывает операции с нераспознанной датой, как sort_operations_by_date.
+        """
+        return self.take(self.argsort_by_date(descending))
+
+    def get_transactions_by_date(self, target_date_str: str) -> "OperationTable":
+        """Аналог analytics.get_transactions_by_date: дата в формате ДД.ММ.ГГГГ."""
+        day = datetime.strptime(target_date_str, "%d.%m.%Y")
+        return self.filter(self.date_range_mask(day, day + timedelta(days=1)))
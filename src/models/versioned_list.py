@@ -0,0 +1,75 @@
+# src/models/versioned_list.py
+# Список операций со счетчиком изменений для проверки актуальности кешей.
+from collections.abc import Sequence
+from typing import Iterator
+
+
+def _mutating(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class VersionedList(list):
+    """
+    Обычный список, у которого version увеличивается при каждом изменении
+    (append, extend, присваивание и удаление элементов, sort и т.д.).
+
+    Кеши результатов сравнивают сохраненную версию с текущей
+    и не отдают результаты, посчитанные по старому содержимому.
+    Изменение самих операций внутри списка версию не меняет.
+    """
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.version = 0
+
+    append = _mutating("append")
+    extend = _mutating("extend")
+    insert = _mutating("insert")
+    pop = _mutating("pop")
+    remove = _mutating("remove")
+    clear = _mutating("clear")
+    sort = _mutating("sort")
+    reverse = _mutating("reverse")
+    __setitem__ = _mutating("__setitem__")
+    __delitem__ = _mutating("__delitem__")
+    __iadd__ = _mutating("__iadd__")
+    __imul__ = _mutating("__imul__")
+
+
+class VersionedListView(Sequence):
+    """
+    Представление VersionedList только для чтения: индексирование, len,
+    итерация и version исходного списка, но без методов изменения.
+
+    Владелец списка (например, OperationIndex) отдает наружу представление,
+    чтобы список нельзя было изменить в обход его собственных структур.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: VersionedList):
+        self._items = items
+
+    @property
+    def version(self) -> int:
+        return self._items.version
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._items!r})"
@@ -1,3 +1,10 @@
+import heapq
+from operator import itemgetter
+from typing import Callable, Iterable
+
+from src.utils.dates import MISSING_DATE, to_epoch_microseconds
+
+
 def filter_by_state(data: list, state: str = "EXECUTED") -> list:
     """Принимает список словарей с банковскими операциями и фильтрует по значению 'state'."""
     return [item for item in data if item.get("state") == state]
@@ -6,3 +13,36 @@ def filter_by_state(data: list, state: str = "EXECUTED") -> list:
 def sort_by_date(data: list, descending: bool = True) -> list:
     """Принимает список словарей с операциями и сортирует по ключу 'date'."""
     return sorted(data, key=lambda item: item.get("date", ""), reverse=descending)
+
+
+def top_k_by_date(
+    ops: Iterable,
+    k: int,
+    *,
+    descending: bool = True,
+    predicates: Iterable[Callable] = (),
+) -> list:
+    """
+    Возвращает k самых поздних (или самых ранних) операций без полной сортировки.
+
+    Операции проходят через кучу размера k, поэтому время O(n log k),
+    а в памяти одновременно не больше k операций. Принимает и списки,
+    и потоковые загрузчики (iter_operations_from_*).
+    Операции без распознанной даты пропускаются; при равных датах
+    раньше идет та, что раньше встретилась во входных данных.
+
+    Args:
+        ops: Операции (словари или Operation).
+        k: Сколько операций вернуть.
+        descending: True — самые поздние первыми, False — самые ранние первыми.
+        predicates: Условия отбора; операция учитывается, если все они истинны.
+    """
+    if k <= 0:
+        return []
+    predicates = tuple(predicates)
+    if predicates:
+        ops = (op for op in ops if all(predicate(op) for predicate in predicates))
+    keyed = ((to_epoch_microseconds(op.get("date")), op) for op in ops)
+    keyed = (item for item in keyed if item[0] != MISSING_DATE)
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return [op for _, op in select(k, keyed, key=itemgetter(0))]
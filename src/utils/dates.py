@@ -0,0 +1,174 @@
+# Разбор дат операций по форме строки, с кешем для повторяющихся значений.
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+# Сколько различных строк дат хранится в кеше разобранных значений
+DATE_CACHE_SIZE = 65536
+
+DIGITS = "0123456789"
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Ключ для операций без даты или с нераспознанной датой (минимум int64)
+MISSING_DATE = -(2**63)
+
+
+def _is_digits(text: str) -> bool:
+    return text.isascii() and text.isdigit()
+
+
+def _make_datetime(
+    year: str,
+    month: str,
+    day: str,
+    hour: str = "0",
+    minute: str = "0",
+    second: str = "0",
+    microsecond: int = 0,
+) -> datetime | None:
+    # Форма строки уже проверена; исключение здесь возможно только
+    # для несуществующей даты вроде 31.02.2023
+    try:
+        return datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+            microsecond,
+        )
+    except ValueError:
+        return None
+
+
+def _parse_iso_time(date_str: str) -> datetime | None:
+    """Разбирает 'YYYY-MM-DDTHH:MM:SS[.ffffff][Z|±HH:MM]' без попыток через исключения."""
+    if len(date_str) < 19 or date_str[13] != ":" or date_str[16] != ":":
+        return None
+    hour, minute, second = date_str[11:13], date_str[14:16], date_str[17:19]
+    if not _is_digits(hour + minute + second):
+        return None
+
+    rest = date_str[19:]
+    microsecond = 0
+    if rest[:1] == ".":
+        fraction = rest[1:]
+        fraction = fraction[: len(fraction) - len(fraction.lstrip(DIGITS))]
+        if not fraction:
+            return None
+        microsecond = int(fraction[:6].ljust(6, "0"))
+        fraction_end = 1 + len(fraction)
+        rest = rest[fraction_end:]
+
+    # Смещение часового пояса отбрасывается: все даты сравниваются как наивные
+    if rest and rest != "Z":
+        if not (
+            len(rest) == 6
+            and rest[0] in "+-"
+            and rest[3] == ":"
+            and _is_digits(rest[1:3] + rest[4:6])
+        ):
+            return None
+
+    return _make_datetime(
+        date_str[0:4],
+        date_str[5:7],
+        date_str[8:10],
+        hour,
+        minute,
+        second,
+        microsecond,
+    )
+
+
+def _parse_date_fallback(date_str: str) -> datetime | None:
+    """
+    Медленный путь для форм, которые не распознаны по виду строки:
+    ISO без секунд, со смещением '+0300', в базовом формате '20230101',
+    'Д.М.ГГГГ' без ведущих нулей и т.п. Принимает то же, что и прежний разбор.
+    """
+    try:
+        if "." in date_str and "-" not in date_str:
+            return datetime.strptime(date_str, "%d.%m.%Y")
+        return datetime.fromisoformat(date_str.replace("Z", "+00:00")).replace(
+            tzinfo=None
+        )
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_cached(date_str: str) -> datetime | None:
+    parsed = _parse_date_fast(date_str)
+    if parsed is None:
+        parsed = _parse_date_fallback(date_str)
+    return parsed
+
+
+def _parse_date_fast(date_str: str) -> datetime | None:
+    length = len(date_str)
+
+    # ДД.ММ.ГГГГ
+    if length == 10 and date_str[2] == "." and date_str[5] == ".":
+        day, month, year = date_str[0:2], date_str[3:5], date_str[6:10]
+        if not _is_digits(day + month + year):
+            return None
+        return _make_datetime(year, month, day)
+
+    # ГГГГ-ММ-ДД с необязательным временем
+    if length >= 10 and date_str[4] == "-" and date_str[7] == "-":
+        if not _is_digits(date_str[0:4] + date_str[5:7] + date_str[8:10]):
+            return None
+        if length == 10:
+            return _make_datetime(date_str[0:4], date_str[5:7], date_str[8:10])
+        if date_str[10] in "T ":
+            return _parse_iso_time(date_str)
+
+    return None
+
+
+def parse_date(date_str) -> datetime | None:
+    """
+    Разбирает дату операции в наивный datetime.
+
+    Поддерживаются 'ДД.ММ.ГГГГ', 'ГГГГ-ММ-ДД' и ISO со временем,
+    долями секунды, 'Z' или смещением (смещение отбрасывается).
+    Частые форматы определяются по форме строки, без перебора strptime через исключения;
+    остальные строки разбираются datetime.fromisoformat.
+    Результаты кешируются, поэтому повторяющиеся даты разбираются один раз.
+
+    Returns:
+        datetime | None: Дата или None для пустого или нераспознанного значения.
+    """
+    if not isinstance(date_str, str) or not date_str:
+        return None
+    return _parse_date_cached(date_str)
+
+
+def to_epoch_microseconds(date_str) -> int:
+    """
+    Дата операции как целое число микросекунд от 1970-01-01 или MISSING_DATE.
+    Такие ключи помещаются в array('q') и сравниваются быстрее, чем datetime.
+    """
+    parsed = parse_date(date_str)
+    if parsed is None:
+        return MISSING_DATE
+    return (parsed - EPOCH) // ONE_MICROSECOND
+
+
+def epoch_microseconds(moment: date | datetime) -> int:
+    """Ключ to_epoch_microseconds для уже разобранной даты или момента времени."""
+    if not isinstance(moment, datetime):
+        moment = datetime(moment.year, moment.month, moment.day)
+    return (moment.replace(tzinfo=None) - EPOCH) // ONE_MICROSECOND
+
+
+def date_cache_info():
+    """Статистика кеша разобранных дат (hits, misses, maxsize, currsize)."""
+    return _parse_date_cached.cache_info()
+
+
+def clear_date_cache() -> None:
+    _parse_date_cached.cache_clear()
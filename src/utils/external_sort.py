@@ -0,0 +1,179 @@
+# Внешняя сортировка операций по дате для наборов данных больше оперативной памяти.
+import heapq
+import json
+import logging
+import os
+import pickle
+import tempfile
+from itertools import islice
+from operator import itemgetter
+from typing import Iterable, Iterator
+
+from src.file_operations.file_operations import iter_operations_from_csv
+from src.file_operations.xlsx_reader import iter_operations_from_xlsx
+from src.models.operation import Operation
+from src.utils.dates import MISSING_DATE, to_epoch_microseconds
+from src.utils.utils import iter_operations_from_json
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+log_dir = "logs"
+os.makedirs(log_dir, exist_ok=True)
+file_handler = logging.FileHandler(
+    os.path.join(log_dir, "external_sort.log"), mode="w", encoding="utf-8"
+)
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler.setFormatter(formatter)
+logger.addHandler(file_handler)
+
+# Сколько операций одновременно держится в памяти при сортировке одного блока
+DEFAULT_MAX_IN_MEMORY = 200_000
+# Сколько записей прогона сериализуется одним вызовом pickle.dump
+RUN_BLOCK_SIZE = 1_000
+
+# Потоковые загрузчики для каждого поддерживаемого расширения файла
+STREAM_LOADERS = {
+    ".json": iter_operations_from_json,
+    ".csv": iter_operations_from_csv,
+    ".xlsx": iter_operations_from_xlsx,
+}
+
+
+def _keyed(operations: Iterable) -> Iterator[tuple[int, object]]:
+    """Пары (ключ даты, операция); операции без распознанной даты пропускаются."""
+    skipped = 0
+    for op in operations:
+        key = to_epoch_microseconds(op.get("date"))
+        if key == MISSING_DATE:
+            skipped += 1
+            continue
+        yield key, op
+    if skipped:
+        logger.warning(
+            f"Пропущено {skipped} операций без даты или с нераспознанной датой."
+        )
+
+
+def _write_run(run: list, tmp_dir: str) -> str:
+    """Сохраняет отсортированный блок во временный файл блоками pickle."""
+    fd, path = tempfile.mkstemp(dir=tmp_dir, suffix=".run")
+    with os.fdopen(fd, "wb") as f:
+        items = iter(run)
+        while block := list(islice(items, RUN_BLOCK_SIZE)):
+            pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path: str) -> Iterator[tuple[int, object]]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                return
+            yield from block
+
+
+def external_sort_by_date(
+    operations: Iterable,
+    reverse: bool = False,
+    max_in_memory: int = DEFAULT_MAX_IN_MEMORY,
+    tmp_dir: str | None = None,
+) -> Iterator:
+    """
+    Сортирует операции по дате, держа в памяти не больше max_in_memory операций.
+
+    Вход читается блоками по max_in_memory операций; каждый блок сортируется
+    и сбрасывается во временный файл (прогон). Затем прогоны сливаются
+    через heapq.merge, и операции отдаются потоком по одной.
+    Если весь вход поместился в один блок, временные файлы не создаются.
+
+    Порядок тот же, что у sort_operations_by_date: операции без даты пропускаются,
+    при равных датах сохраняется исходный порядок.
+
+    Args:
+        operations: Операции (списки или потоковые загрузчики iter_operations_from_*).
+        reverse: True — от поздних к ранним.
+        max_in_memory: Бюджет памяти в операциях на один блок.
+        tmp_dir: Каталог для временных файлов (по умолчанию системный).
+    """
+    if max_in_memory < 1:
+        raise ValueError("max_in_memory должен быть положительным числом")
+
+    keyed = _keyed(operations)
+    first_run = list(islice(keyed, max_in_memory))
+    first_run.sort(key=itemgetter(0), reverse=reverse)
+
+    # Первый блок неполный: входа больше нет, сливать нечего
+    if len(first_run) < max_in_memory:
+        for _, op in first_run:
+            yield op
+        return
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix="ops_sort_") as run_dir:
+        run_paths = [_write_run(first_run, run_dir)]
+        del first_run
+        while run := list(islice(keyed, max_in_memory)):
+            run.sort(key=itemgetter(0), reverse=reverse)
+            run_paths.append(_write_run(run, run_dir))
+        del run
+        logger.info(f"Слияние {len(run_paths)} отсортированных прогонов.")
+
+        merged = heapq.merge(
+            *(_read_run(path) for path in run_paths),
+            key=itemgetter(0),
+            reverse=reverse,
+        )
+        for _, op in merged:
+            yield op
+
+
+def write_operations_to_json(operations: Iterable, json_filepath: str) -> int:
+    """
+    Записывает операции в JSON-массив потоком, не собирая их в список.
+    Operation сохраняются в плоской схеме to_dict().
+
+    Returns:
+        int: Количество записанных операций.
+    """
+    count = 0
+    with open(json_filepath, "w", encoding="utf-8") as f:
+        f.write("[")
+        for op in operations:
+            if isinstance(op, Operation):
+                op = op.to_dict()
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(op, ensure_ascii=False, default=str))
+            count += 1
+        f.write("\n]\n" if count else "]\n")
+    return count
+
+
+def sort_file_by_date(
+    source_path: str,
+    output_path: str,
+    reverse: bool = False,
+    max_in_memory: int = DEFAULT_MAX_IN_MEMORY,
+    tmp_dir: str | None = None,
+) -> int:
+    """
+    Сортирует выгрузку JSON/CSV/XLSX по дате и записывает результат в JSON-файл,
+    не загружая выгрузку в память целиком.
+
+    Returns:
+        int: Количество записанных операций.
+    """
+    extension = os.path.splitext(source_path)[1].lower()
+    loader = STREAM_LOADERS.get(extension)
+    if loader is None:
+        raise ValueError(f"Неподдерживаемый формат файла: {source_path}")
+
+    sorted_operations = external_sort_by_date(
+        loader(source_path), reverse, max_in_memory, tmp_dir
+    )
+    count = write_operations_to_json(sorted_operations, output_path)
+    logger.info(
+        f"{source_path} отсортирован по дате в {output_path}: {count} операций."
+    )
+    return count
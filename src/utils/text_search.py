@@ -0,0 +1,45 @@
+# Поиск подстроки или регулярного выражения в описаниях операций без учета регистра.
+import re
+from functools import lru_cache
+from typing import Callable
+
+# Сколько скомпилированных регулярных выражений хранится в кеше
+PATTERN_CACHE_SIZE = 256
+# Сколько различных описаний хранится в кеше приведенных к одному регистру строк
+FOLD_CACHE_SIZE = 65536
+
+# Символы, при которых строка поиска обрабатывается как регулярное выражение
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+def is_literal(search_string: str) -> bool:
+    """Строка без метасимволов: регулярное выражение совпало бы с ней как с подстрокой."""
+    return REGEX_METACHARACTERS.isdisjoint(search_string)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(search_string: str) -> re.Pattern:
+    """re.compile(search_string, re.IGNORECASE) с кешем; re.error пробрасывается."""
+    return re.compile(search_string, re.IGNORECASE)
+
+
+# Описания операций сильно повторяются, поэтому приведение к одному регистру кешируется
+fold = lru_cache(maxsize=FOLD_CACHE_SIZE)(str.casefold)
+
+
+def description_matcher(search_string: str) -> Callable[[str], bool]:
+    """
+    Функция проверки описания для строки поиска, как re.search с re.IGNORECASE.
+
+    Строка без метасимволов ищется как подстрока в описании, приведенном через
+    casefold (для кириллицы и латиницы результат тот же, что у re.IGNORECASE,
+    кроме лигатур вроде 'ß'), остальные — скомпилированным выражением из кеша.
+
+    Raises:
+        re.error: Если строка не является корректным регулярным выражением.
+    """
+    if is_literal(search_string):
+        needle = search_string.casefold()
+        return lambda description: needle in fold(description)
+    search = compile_pattern(search_string).search
+    return lambda description: search(description) is not None
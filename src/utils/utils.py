@@ -1,7 +1,11 @@
 import json
 import logging
 import os
-from datetime import datetime
+from array import array
+from typing import Iterator
+
+from src.utils.dates import MISSING_DATE, to_epoch_microseconds
+from src.utils.validation import RejectionReport, filter_valid
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -16,6 +20,15 @@ file_handler.setFormatter(formatter)
 logger.addHandler(file_handler)
 
 
+# Размер блока, который потоковый загрузчик читает из файла за один раз
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+# Предельный размер одного элемента массива: дальше буфер не растет
+JSON_MAX_ITEM_SIZE = 16 * 1024 * 1024
+# Ошибка разбора ближе к концу буфера может означать, что элемент просто не дочитан
+# (обрезанное число, ключевое слово или escape-последовательность)
+_JSON_TRUNCATION_MARGIN = 16
+
+
 def load_operations_from_json(json_filepath: str) -> list[dict]:
     """
     Загружает список финансовых операций из JSON файла,
@@ -34,160 +47,203 @@ def load_operations_from_json(json_filepath: str) -> list[dict]:
                 )
                 return []
 
-            operations = []
-            # Определите все обязательные поля, включая вложенные
-            required_top_level_keys = [
-                "id",
-                "state",
-                "date",
-                "operationAmount",
-                "description",
-            ]
-            # 'from' и 'to' могут отсутствовать
-
-            for i, item in enumerate(data):
-                if not isinstance(item, dict):
-                    logger.warning(
-                        f"Элемент {i + 1} в JSON-файле не является словарем: {item}. Пропускаю."
-                    )
-                    continue
+            report = RejectionReport()
+            operations = list(filter_valid(data, report))
+            report.log(logger, json_filepath)
 
-                # Проверка обязательных верхнеуровневых ключей и их значений на None
-                missing_top_keys = [
-                    key
-                    for key in required_top_level_keys
-                    if key not in item or item[key] is None
-                ]
-                if missing_top_keys:
-                    logger.warning(
-                        f"Элемент {i + 1} (ID: {item.get('id')}) в JSON-файле не содержит все обязательные верхнеуровневые ключи или их значения None ({missing_top_keys}). Пропускаю."
-                    )
-                    continue
+            logger.info(
+                f"Успешно загружено {len(operations)} операций из JSON файла: {json_filepath}."
+            )
+            return operations
+    except json.JSONDecodeError as e:
+        logger.error(f"Ошибка декодирования JSON файла {json_filepath}: {e}")
+        return []
+    except Exception as e:
+        logger.error(f"Неожиданная ошибка при чтении JSON файла {json_filepath}: {e}")
+        return []
 
-                # Проверка operationAmount и currency
-                op_amount = item.get("operationAmount")
-                if not isinstance(op_amount, dict):
-                    logger.warning(
-                        f"Элемент {i + 1} (ID: {item.get('id')}) в JSON-файле: 'operationAmount' не является словарем. Пропускаю."
-                    )
-                    continue
 
-                required_op_amount_keys = ["amount", "currency"]
-                missing_op_amount_keys = [
-                    key
-                    for key in required_op_amount_keys
-                    if key not in op_amount or op_amount[key] is None
-                ]
-                if missing_op_amount_keys:
-                    logger.warning(
-                        f"Элемент {i + 1} (ID: {item.get('id')}) в JSON-файле: некорректный или неполный 'operationAmount' ({missing_op_amount_keys}). Пропускаю."
-                    )
-                    continue
+def _iter_json_array(
+    f,
+    chunk_size: int = JSON_STREAM_CHUNK_SIZE,
+    max_item_size: int = JSON_MAX_ITEM_SIZE,
+) -> Iterator:
+    """
+    Разбирает JSON-массив верхнего уровня из открытого текстового файла
+    и отдает его элементы по одному, не загружая весь файл в память.
+    В памяти одновременно находится только текущий блок и один элемент массива.
+    Вызывает json.JSONDecodeError при синтаксической ошибке (в том числе
+    для элемента длиннее max_item_size) и ValueError,
+    если верхний уровень файла не является списком.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
 
-                currency_info = op_amount.get("currency")
-                if not isinstance(currency_info, dict):
-                    logger.warning(
-                        f"Элемент {i + 1} (ID: {item.get('id')}) в JSON-файле: 'currency' не является словарем. Пропускаю."
-                    )
-                    continue
+    def fill() -> bool:
+        # Дочитывает следующий блок, отбрасывая уже разобранную часть буфера
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> bool:
+        # Пропускает пробелы; возвращает False, если файл закончился
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\n\r":
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if not fill():
+                return False
 
-                required_currency_keys = ["name", "code"]
-                missing_currency_keys = [
-                    key
-                    for key in required_currency_keys
-                    if key not in currency_info or currency_info[key] is None
-                ]
-                if missing_currency_keys:
-                    logger.warning(
-                        f"Элемент {i + 1} (ID: {item.get('id')}) в JSON-файле: некорректная или неполная 'currency' информация ({missing_currency_keys}). Пропускаю."
-                    )
+    if not skip_whitespace():
+        raise json.JSONDecodeError("Expecting value", buffer, pos)
+    if buffer[pos] != "[":
+        raise ValueError("Верхний уровень JSON не является списком")
+    pos += 1
+
+    if not skip_whitespace():
+        raise json.JSONDecodeError("Expecting value", buffer, pos)
+    if buffer[pos] == "]":
+        return
+
+    while True:
+        if not skip_whitespace():
+            raise json.JSONDecodeError("Expecting value", buffer, pos)
+        # Элемент может не поместиться в текущий блок: дочитываем, пока он не разберется.
+        # Если элемент заканчивается у самой границы буфера (например, число
+        # '12345.' перед дробной частью из следующего блока), тоже дочитываем,
+        # чтобы не обрезать его.
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Ошибка внутри уже прочитанного текста дочитыванием не исправится;
+                # незакрытая строка может быть просто длинной, ее ограничивает max_item_size
+                near_end = e.pos + _JSON_TRUNCATION_MARGIN >= len(buffer)
+                if not near_end and not e.msg.startswith("Unterminated string"):
+                    raise
+                if len(buffer) - pos > max_item_size:
+                    raise json.JSONDecodeError(
+                        f"Элемент массива длиннее {max_item_size} символов", buffer, pos
+                    ) from e
+                if fill():
                     continue
+                raise
+            if end + _JSON_TRUNCATION_MARGIN >= len(buffer) and fill():
+                continue
+            break
+        pos = end
+        yield item
 
-                operations.append(item)
+        if not skip_whitespace():
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+        if buffer[pos] == ",":
+            pos += 1
+        elif buffer[pos] == "]":
+            return
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
 
-            logger.info(
-                f"Успешно загружено {len(operations)} операций из JSON файла: {json_filepath}."
-            )
-            return operations
+
+def iter_operations_from_json(
+    json_filepath: str, chunk_size: int = JSON_STREAM_CHUNK_SIZE
+) -> Iterator[dict]:
+    """
+    Потоковый вариант load_operations_from_json: разбирает JSON-массив
+    по одному элементу и отдает только корректные операции.
+    Проверки записей те же, что и у load_operations_from_json, а расход памяти
+    не зависит от размера файла.
+    При ошибке разбора уже отданные операции остаются у вызывающего кода,
+    а генератор записывает ошибку в лог и завершается.
+    """
+    if not os.path.exists(json_filepath):
+        logger.error(f"JSON файл не найден: {json_filepath}")
+        return
+
+    count = 0
+    report = RejectionReport()
+    try:
+        with open(json_filepath, "r", encoding="utf-8") as f:
+            for item in filter_valid(_iter_json_array(f, chunk_size), report):
+                count += 1
+                yield item
+        logger.info(
+            f"Успешно загружено {count} операций из JSON файла (потоково): {json_filepath}."
+        )
     except json.JSONDecodeError as e:
         logger.error(f"Ошибка декодирования JSON файла {json_filepath}: {e}")
-        return []
+    except ValueError:
+        logger.error(
+            f"JSON файл {json_filepath} содержит некорректный формат данных (ожидается список)."
+        )
     except Exception as e:
         logger.error(f"Неожиданная ошибка при чтении JSON файла {json_filepath}: {e}")
-        return []
+    finally:
+        report.log(logger, json_filepath)
+
+
+def argsort_operations_by_date(operations: list, reverse: bool = False) -> list[int]:
+    """
+    Возвращает индексы операций в порядке сортировки по дате, не копируя сами операции.
+
+    Ключи дат вычисляются один раз в плоский массив целых микросекунд,
+    а сортируется список индексов. Операции с некорректной или отсутствующей
+    датой в перестановку не попадают. Порядок операций с одинаковой датой сохраняется.
+    """
+    keys = array("q")
+    indices = []
+    for i, op in enumerate(operations):
+        date_str = op.get("date")
+        key = to_epoch_microseconds(date_str)
+        keys.append(key)
+        if key != MISSING_DATE:
+            indices.append(i)
+        elif date_str:
+            logger.warning(
+                f"Пропущена операция с ID {op.get('id')} из-за нераспознанного формата даты '{date_str}'."
+            )
+        else:
+            logger.warning(
+                f"Пропущена операция с ID {op.get('id')} из-за отсутствия или пустой даты."
+            )
+
+    indices.sort(key=keys.__getitem__, reverse=reverse)
+    return indices
 
 
 def sort_operations_by_date(
-    operations: list[dict], reverse: bool = False
+    operations: list[dict], reverse: bool = False, in_place: bool = False
 ) -> list[dict]:
     """
     Сортирует список финансовых операций по дате.
     Дата может быть в различных форматах ISO (с Z, без Z, только дата) или DD.MM.YYYY.
     Операции с некорректными или отсутствующими датами будут отфильтрованы.
-    """
 
-    def parse_date(date_str: str) -> datetime:
-        # Убедимся, что все даты являются наивными для корректного сравнения
-        if date_str is None or not isinstance(date_str, str) or not date_str.strip():
-            raise ValueError("Пустая или некорректная строка даты")
-
-        # Попытка парсинга ISO формата с Z
-        try:
-            dt_obj = datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-            return dt_obj.replace(tzinfo=None)  # Делаем наивной
-        except ValueError:
-            pass
-
-        # Попытка парсинга DD.MM.YYYY формата
-        try:
-            return datetime.strptime(date_str, "%d.%m.%Y")
-        except ValueError:
-            pass
-
-        # Попытка парсинга ISO формата (без Z или с Z, но используя fromisoformat)
-        # fromisoformat может обрабатывать как даты, так и даты со временем и смещением
-        try:
-            dt_obj = datetime.fromisoformat(
-                date_str.replace("Z", "+00:00")
-            )  # Нормализуем Z для fromisoformat
-            return dt_obj.replace(tzinfo=None)  # Делаем наивной
-        except ValueError:
-            pass
-
-        # Если ни один формат не подошел
-        raise ValueError(f"Не удалось распознать формат даты: '{date_str}'")
+    По умолчанию возвращаются копии операций, а исходный список не меняется.
+    С in_place=True список operations переупорядочивается на месте
+    (операции без даты из него удаляются) и возвращается он же,
+    с исходными объектами и без копирования.
+    """
 
     try:
-        processed_operations = []
-        for op in operations:
-            if "date" in op and op["date"]:
-                try:
-                    parsed_date = parse_date(op["date"])
-                    op_copy = op.copy()  # Копируем операцию, чтобы не изменять оригинал
-                    op_copy["_parsed_date"] = (
-                        parsed_date  # Добавляем временный ключ для сортировки
-                    )
-                    processed_operations.append(op_copy)
-                except ValueError as e:
-                    logger.warning(
-                        f"Пропущена операция с ID {op.get('id')} из-за нераспознанного формата даты '{op.get('date')}': {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Пропущена операция с ID {op.get('id')} из-за отсутствия или пустой даты."
-                )
-
-        sorted_ops = sorted(
-            processed_operations, key=lambda x: x["_parsed_date"], reverse=reverse
-        )
+        order = argsort_operations_by_date(operations, reverse)
 
-        # Удаляем временный ключ после сортировки и возвращаем только исходные поля
-        final_sorted_ops = []
-        for op_copy in sorted_ops:
-            op_copy_clean = op_copy.copy()
-            if "_parsed_date" in op_copy_clean:
-                del op_copy_clean["_parsed_date"]
-            final_sorted_ops.append(op_copy_clean)
+        if in_place:
+            operations[:] = [operations[i] for i in order]
+            final_sorted_ops = operations
+        else:
+            # Возвращаем копии, чтобы не изменять исходные операции
+            final_sorted_ops = [operations[i].copy() for i in order]
 
         logger.info(
             f"Операции отсортированы по дате (обратный порядок: {reverse}). Количество отсортированных: {len(final_sorted_ops)}"
@@ -0,0 +1,121 @@
+# Декларативная схема операций и скомпилированный по ней валидатор.
+import logging
+from collections import Counter
+from typing import Callable, Iterable, Iterator
+
+# Маркер обязательного поля: значение должно присутствовать и не быть None
+REQUIRED = object()
+
+# Обязательные поля операции из JSON; 'from' и 'to' могут отсутствовать.
+# Вложенный словарь означает, что значение тоже должно быть словарем с этими полями.
+OPERATION_SCHEMA = {
+    "id": REQUIRED,
+    "state": REQUIRED,
+    "date": REQUIRED,
+    "operationAmount": {
+        "amount": REQUIRED,
+        "currency": {"name": REQUIRED, "code": REQUIRED},
+    },
+    "description": REQUIRED,
+}
+
+# Сколько отклоненных записей сохраняется как примеры для лога
+DEFAULT_SAMPLE_SIZE = 10
+
+NOT_A_DICT = "элемент не является словарем"
+
+
+def compile_validator(schema: dict) -> Callable[[object], str | None]:
+    """
+    Компилирует схему в одну функцию без циклов и временных списков.
+
+    Функция возвращает None для корректной записи и причину отказа
+    для некорректной. Сначала проверяется наличие всех полей уровня,
+    затем вложенные словари.
+    """
+    lines = [
+        "def validate(item):",
+        "    if not isinstance(item, dict):",
+        f"        return {NOT_A_DICT!r}",
+    ]
+    counter = 0
+
+    def emit(level: dict, var: str, path: str) -> None:
+        nonlocal counter
+        nested = []
+        for key, rule in level.items():
+            counter += 1
+            value_var = f"v{counter}"
+            full_key = f"{path}.{key}" if path else key
+            lines.append(f"    {value_var} = {var}.get({key!r})")
+            lines.append(f"    if {value_var} is None:")
+            lines.append(f"        return {f'нет поля {full_key!r}'!r}")
+            if isinstance(rule, dict):
+                nested.append((rule, value_var, full_key))
+            elif rule is not REQUIRED:
+                raise ValueError(f"Неизвестное правило для поля {full_key!r}: {rule!r}")
+        for rule, value_var, full_key in nested:
+            lines.append(f"    if not isinstance({value_var}, dict):")
+            lines.append(f"        return {f'{full_key!r} не является словарем'!r}")
+            emit(rule, value_var, full_key)
+
+    emit(schema, "item", "")
+    lines.append("    return None")
+
+    namespace = {}
+    exec(compile("\n".join(lines), "<validator>", "exec"), namespace)
+    return namespace["validate"]
+
+
+validate_operation = compile_validator(OPERATION_SCHEMA)
+
+
+class RejectionReport:
+    """
+    Сводка отклоненных записей: количество по причинам и ограниченная выборка примеров.
+    Пишется в лог одним сообщением, поэтому стоимость не растет с числом плохих записей.
+    """
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.counts = Counter()
+        self.samples = []
+
+    def reject(self, index: int, item, reason: str) -> None:
+        self.counts[reason] += 1
+        if len(self.samples) < self.sample_size:
+            item_id = item.get("id") if isinstance(item, dict) else None
+            self.samples.append((index, item_id, reason))
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def log(self, logger: logging.Logger, source: str) -> None:
+        """Пишет сводку в лог одним предупреждением (если что-то было отклонено)."""
+        if not self.counts:
+            return
+        reasons = "; ".join(
+            f"{reason} — {count}" for reason, count in self.counts.most_common()
+        )
+        samples = ", ".join(
+            f"элемент {index + 1} (ID: {item_id})" for index, item_id, _ in self.samples
+        )
+        logger.warning(
+            f"В {source} пропущено {self.total} некорректных записей: {reasons}. "
+            f"Примеры: {samples}."
+        )
+
+
+def filter_valid(
+    items: Iterable,
+    report: RejectionReport,
+    validator: Callable[[object], str | None] = validate_operation,
+) -> Iterator:
+    """Отдает корректные записи, а отклоненные учитывает в report."""
+    for index, item in enumerate(items):
+        reason = validator(item)
+        if reason is None:
+            yield item
+        else:
+            report.reject(index, item, reason)
@@ -1,4 +1,5 @@
 from src.masks import mask_account_number, mask_card_number
+from src.utils.dates import parse_date
 
 
 def mask_input_string(data: str) -> str:
@@ -20,9 +21,7 @@ def mask_input_string(data: str) -> str:
 
 def get_date(date_str: str) -> str:
     """Преобразуем дату в привычный формат"""
-    date_part = date_str.split("T")[0]
-    date_elements = date_part.split("-")
-    year = date_elements[0]
-    month = date_elements[1]
-    day = date_elements[2]
-    return f"{day}.{month}.{year}"
+    parsed = parse_date(date_str)
+    if parsed is None:
+        raise ValueError(f"Не удалось распознать формат даты: '{date_str}'")
+    return parsed.strftime("%d.%m.%Y")
@@ -0,0 +1,90 @@
+import pytest
+
+from src.analysis.bitmap_index import BitmapIndex, OperationIndex, bitmap_to_mask
+
+OPERATIONS = [
+    {"id": 1, "state": "EXECUTED", "currency_code": "USD"},
+    {"id": 2, "state": "CANCELED", "currency_code": "EUR"},
+    {"id": 3, "state": "EXECUTED", "currency_code": "RUB"},
+    {"id": 4, "state": "EXECUTED", "currency_code": "EUR"},
+    {"id": 5, "state": "PENDING", "currency_code": "USD"},
+]
+
+
+@pytest.fixture
+def index():
+    return OperationIndex(OPERATIONS)
+
+
+def ids(operations):
+    return [op["id"] for op in operations]
+
+
+def test_bitmap_to_mask():
+    assert bitmap_to_mask(0b1011) == bytes([1, 1, 0, 1])
+    assert bitmap_to_mask(0) == bytes([0])
+
+
+def test_bitmap_index_counts_and_values():
+    index = BitmapIndex("state", OPERATIONS)
+    assert sorted(index.values()) == ["CANCELED", "EXECUTED", "PENDING"]
+    assert index.count("EXECUTED") == 3
+    assert index.count("EXECUTED", "PENDING") == 4
+    assert index.bitmap("UNKNOWN") == 0
+
+
+def test_and_or_combinations(index):
+    executed_usd_or_eur = index.bitmap("state", "EXECUTED") & index.bitmap(
+        "currency_code", "USD", "EUR"
+    )
+    assert ids(index.select(executed_usd_or_eur)) == [1, 4]
+    assert ids(
+        index.select(index.where(state="EXECUTED", currency_code=("USD", "EUR")))
+    ) == [1, 4]
+    assert ids(index.select(index.all & ~index.bitmap("state", "EXECUTED"))) == [2, 5]
+
+
+def test_list_function_analogues(index):
+    assert ids(index.filter_by_state()) == [1, 3, 4]
+    assert ids(index.filter_by_currency("usd")) == [1, 5]
+
+
+def test_incremental_append_matches_rebuild(index):
+    index.filter_by_state()  # Индекс уже построен
+    extra = [
+        {"id": 6, "state": "EXECUTED", "currency_code": "USD"},
+        {"id": 7, "state": "NEW", "currency_code": "GBP"},
+    ]
+    index.append(extra[0])
+    index.extend(iter(extra[1:]))
+    rebuilt = OperationIndex(OPERATIONS + extra)
+    for state in ("EXECUTED", "NEW", "CANCELED"):
+        assert index.bitmap("state", state) == rebuilt.bitmap("state", state)
+    assert ids(index.filter_by_currency("USD")) == [1, 5, 6]
+    assert len(index) == 7
+
+
+def test_flush_after_offset_matches_rebuild():
+    operations = [{"state": "EXECUTED" if i % 3 else "CANCELED"} for i in range(1003)]
+    index = BitmapIndex("state", operations[:997])
+    index.count("EXECUTED")  # Первая часть уже переведена в биты
+    index.extend(operations[997:])
+    rebuilt = BitmapIndex("state", operations)
+    for state in ("EXECUTED", "CANCELED"):
+        assert index.bitmap(state) == rebuilt.bitmap(state)
+
+
+def test_operations_are_read_only(index):
+    operations = index.operations
+    assert operations is index.operations
+    assert ids(operations) == [1, 2, 3, 4, 5] and len(operations) == 5
+    with pytest.raises(AttributeError):
+        operations.append({"id": 6, "state": "EXECUTED"})
+    with pytest.raises(TypeError):
+        del operations[0]
+    with pytest.raises(TypeError):
+        operations[0] = {"id": 6}
+    version = operations.version
+    index.append({"id": 6, "state": "EXECUTED", "currency_code": "USD"})
+    assert operations.version > version
+    assert ids(index.filter_by_state()) == [1, 3, 4, 6]
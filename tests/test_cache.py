@@ -0,0 +1,127 @@
+import os
+import pickle
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.file_operations.cache import ParsedCache
+from src.models.operation import Operation
+
+CSV_TEXT = (
+    "id;state;date;amount;currency_name;currency_code;description;from;to\n"
+    "1;EXECUTED;2023-01-15;100.50;Рубли;RUB;Оплата;Карта 1;Счет 1\n"
+)
+
+OPERATION = {
+    "id": 1,
+    "state": "EXECUTED",
+    "date": "2023-01-15",
+    "amount": 100.5,
+    "currency_name": "Рубли",
+    "currency_code": "RUB",
+    "description": "Оплата",
+    "from": "Карта 1",
+    "to": "Счет 1",
+}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "transactions.csv"
+    path.write_text(CSV_TEXT, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParsedCache(str(tmp_path / "cache"))
+
+
+def test_load_uses_cache_until_source_changes(cache, source):
+    loader = MagicMock(return_value=[OPERATION])
+
+    first = cache.load(source, loader)
+    second = cache.load(source, loader)
+    assert first == second == [Operation.from_dict(OPERATION)]
+    assert loader.call_count == 1
+
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("2;PENDING;2023-01-16;1;Рубли;RUB;;;\n")
+    cache.load(source, loader)
+    assert loader.call_count == 2
+
+
+def test_touched_file_with_same_content_is_a_hit(cache, source):
+    loader = MagicMock(return_value=[OPERATION])
+    cache.load(source, loader)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert cache.load(source, loader) == [Operation.from_dict(OPERATION)]
+    assert loader.call_count == 1
+
+
+def test_invalidate_and_empty_results(cache, source):
+    loader = MagicMock(return_value=[OPERATION])
+    cache.load(source, loader)
+    cache.invalidate(source)
+    cache.load(source, loader)
+    assert loader.call_count == 2
+
+    cache.invalidate()
+    assert cache.get(source) is None
+    assert cache.load(source, MagicMock(return_value=[])) == []
+    assert cache.get(source) is None
+
+
+def test_corrupted_entry_is_dropped(cache, source):
+    cache.put(source, [OPERATION])
+    with open(cache._entry_path(source), "wb") as f:
+        f.write(b"not a pickle")
+    assert cache.get(source) is None
+    assert not os.path.exists(cache._entry_path(source))
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"\x80\x09",
+        b"cno_such_module\nX\n.",
+        b"coperator\ngetitem\n}X\x01\x00\x00\x00x\x86R.",
+    ],
+    ids=["ValueError", "ModuleNotFoundError", "KeyError"],
+)
+@pytest.mark.parametrize("valid_header", [False, True])
+def test_any_unpickling_error_is_a_miss(cache, source, payload, valid_header):
+    cache.put(source, [OPERATION])
+    entry_path = cache._entry_path(source)
+    with open(entry_path, "rb") as f:
+        header = pickle.load(f)
+    with open(entry_path, "wb") as f:
+        if valid_header:
+            pickle.dump(header, f)
+        f.write(payload)
+    assert cache.get(source) is None
+    assert not os.path.exists(entry_path)
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    sources = []
+    for name in ("a.csv", "b.csv", "c.csv"):
+        path = tmp_path / name
+        path.write_text(CSV_TEXT, encoding="utf-8")
+        sources.append(str(path))
+
+    cache = ParsedCache(str(tmp_path / "cache"))
+    for i, path in enumerate(sources):
+        cache.put(path, [OPERATION])
+        os.utime(cache._entry_path(path), ns=(i * 10**9, i * 10**9))
+    entry_size = os.path.getsize(cache._entry_path(sources[0]))
+
+    cache.get(sources[0])  # Запись "a" становится самой свежей
+    cache.max_bytes = entry_size * 2
+    cache.evict()
+
+    assert cache.get(sources[1]) is None
+    assert cache.get(sources[0]) is not None
+    assert cache.get(sources[2]) is not None
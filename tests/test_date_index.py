@@ -0,0 +1,76 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.analysis.analytics import get_transactions_by_date, get_transactions_by_dates
+from src.analysis.date_index import DateIndex
+
+TRANSACTIONS = [
+    {"id": 1, "date": "2023-01-31T23:59:59.999999"},
+    {"id": 2, "date": "01.02.2023"},
+    {"id": 3, "date": "2023-01-15T12:00:00Z"},
+    {"id": 4, "date": "не дата"},
+    {"id": 5, "date": "2023-01-15T08:00:00"},
+    {"id": 6, "date": "2022-12-31T10:00:00"},
+    {"id": 7, "date": "2023-01-15T12:00:00"},
+]
+
+
+@pytest.fixture
+def index():
+    return DateIndex(TRANSACTIONS)
+
+
+def ids(transactions):
+    return [t["id"] for t in transactions]
+
+
+def test_index_skips_undated(index):
+    assert len(index) == 6
+
+
+def test_day_queries(index):
+    assert ids(index.on_day("15.01.2023")) == [5, 3, 7]
+    assert ids(index.on_day(date(2023, 2, 1))) == [2]
+    assert index.on_day("16.01.2023") == []
+
+
+def test_range_week_and_month(index):
+    assert ids(index.range(datetime(2023, 1, 15, 12), date(2023, 2, 1))) == [3, 7, 1]
+    assert ids(index.in_week(date(2023, 1, 12))) == [5, 3, 7]
+    assert ids(index.in_month(2023, 1)) == [5, 3, 7, 1]
+    assert ids(index.in_month(2022, 12)) == [6]
+
+
+def test_get_transactions_by_date_with_index(index):
+    expected = get_transactions_by_date(TRANSACTIONS, "15.01.2023")
+    with_index = get_transactions_by_date(TRANSACTIONS, "15.01.2023", index=index)
+    assert sorted(ids(with_index)) == sorted(ids(expected)) == [3, 5, 7]
+    assert get_transactions_by_date(TRANSACTIONS, "2023-01-15", index=index) == []
+
+
+def test_get_transactions_by_dates_single_pass(index):
+    targets = ["15.01.2023", "01.02.2023", "16.01.2023", "2023-01-15"]
+    result = get_transactions_by_dates(iter(TRANSACTIONS), targets)
+    assert {day: ids(found) for day, found in result.items()} == {
+        "15.01.2023": [3, 5, 7],
+        "01.02.2023": [2],
+        "16.01.2023": [],
+    }
+    for day in result:
+        assert result[day] == get_transactions_by_date(TRANSACTIONS, day)
+
+    indexed = get_transactions_by_dates(TRANSACTIONS, targets, index=index)
+    assert ids(indexed["15.01.2023"]) == [5, 3, 7]
+    assert indexed.keys() == result.keys()
+
+
+def test_index_over_other_transactions_is_not_used(index):
+    subset = TRANSACTIONS[3:]
+    assert ids(get_transactions_by_date(subset, "15.01.2023", index=index)) == [5, 7]
+    copies = [t.copy() for t in TRANSACTIONS]
+    found = get_transactions_by_date(copies, "15.01.2023", index=index)
+    assert all(any(t is copy for copy in copies) for t in found)
+
+    result = get_transactions_by_dates(iter(subset), ["15.01.2023"], index=index)
+    assert ids(result["15.01.2023"]) == [5, 7]
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+
+from src.analysis.analytics import get_transactions_by_date
+from src.utils.dates import clear_date_cache, date_cache_info, parse_date
+from src.widget import get_date
+
+
+@pytest.mark.parametrize(
+    "date_str, expected",
+    [
+        ("2019-08-26T10:50:58.294041", datetime(2019, 8, 26, 10, 50, 58, 294041)),
+        ("2023-01-15T12:00:00Z", datetime(2023, 1, 15, 12)),
+        ("2023-01-15T12:00:00.5+03:00", datetime(2023, 1, 15, 12, 0, 0, 500000)),
+        ("2023-01-15 12:00:00", datetime(2023, 1, 15, 12)),
+        ("2023-01-15", datetime(2023, 1, 15)),
+        ("15.01.2023", datetime(2023, 1, 15)),
+    ],
+)
+def test_parse_date_supported_shapes(date_str, expected):
+    assert parse_date(date_str) == expected
+
+
+@pytest.mark.parametrize(
+    "date_str",
+    [None, "", "   ", "bad-date-1", "01-01-2023", "31.02.2023", 15],
+)
+def test_parse_date_rejects_invalid(date_str):
+    assert parse_date(date_str) is None
+
+
+@pytest.mark.parametrize(
+    "date_str, expected",
+    [
+        ("2023-01-01T10:00", datetime(2023, 1, 1, 10)),
+        ("2023-01-01T10:00:00+0300", datetime(2023, 1, 1, 10)),
+        ("2023-01-01T10", datetime(2023, 1, 1, 10)),
+        ("20230101", datetime(2023, 1, 1)),
+        ("1.2.2023", datetime(2023, 2, 1)),
+    ],
+)
+def test_parse_date_falls_back_to_fromisoformat(date_str, expected):
+    clear_date_cache()
+    assert parse_date(date_str) == expected
+    assert parse_date(date_str) == expected
+    assert date_cache_info().hits == 1
+
+
+def test_parse_date_cache_hits():
+    clear_date_cache()
+    for _ in range(3):
+        parse_date("2019-08-26T10:50:58.294041")
+    info = date_cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_get_date_and_transactions_by_date_share_parser():
+    assert get_date("2019-08-26T10:50:58.294041") == "26.08.2019"
+    assert get_date("26.08.2019") == "26.08.2019"
+    with pytest.raises(ValueError):
+        get_date("вчера")
+
+    transactions = [
+        {"id": 1, "date": "2019-08-26T10:50:58.294041"},
+        {"id": 2, "date": "26.08.2019"},
+        {"id": 3, "date": "27.08.2019"},
+        {"id": 4, "date": "не дата"},
+        {"id": 5, "date": 20190826},
+    ]
+    result = get_transactions_by_date(transactions, "26.08.2019")
+    assert [t["id"] for t in result] == [1, 2]
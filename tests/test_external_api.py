@@ -6,9 +6,12 @@ import requests
 from dotenv import load_dotenv
 
 from src.external_api.external_api import (
+    convert_minor_units,
     get_exchange_rate,
     get_transaction_amount_in_rub,
+    get_transaction_amount_in_rub_minor,
 )
+from src.models.operation import Operation
 
 load_dotenv()
 
@@ -98,3 +101,35 @@ def test_get_transaction_amount_in_rub_missing_data():
     transaction2 = {"operationAmount": {"amount": "100.00"}}
     assert get_transaction_amount_in_rub(transaction1) is None
     assert get_transaction_amount_in_rub(transaction2) is None
+
+
+def test_convert_minor_units_is_exact():
+    """Тест конвертации целых копеек без погрешности float."""
+    assert convert_minor_units(1001, 0.1) == 100
+    assert convert_minor_units(333, 75.4321) == 25119
+
+
+@patch("src.external_api.external_api.get_exchange_rate")
+def test_get_transaction_amount_in_rub_operation(mock_get_rate):
+    """Тест получения суммы в копейках для нормализованной операции."""
+    mock_get_rate.return_value = 90.5
+    operation = Operation.from_dict(
+        {"id": 1, "amount": "12.34", "currency_code": "USD", "state": "EXECUTED"}
+    )
+    assert get_transaction_amount_in_rub_minor(operation) == 111677
+    assert get_transaction_amount_in_rub(operation) == 12.34 * 90.5
+
+
+@patch("src.external_api.external_api.get_exchange_rate")
+def test_get_transaction_amount_in_rub_is_not_rounded(mock_get_rate):
+    """Тест: сумма в рублях не округляется до копеек, в отличие от суммы в копейках."""
+    mock_get_rate.return_value = 75.4321
+    transaction = {"operationAmount": {"amount": "3.33", "currency": {"code": "USD"}}}
+    assert get_transaction_amount_in_rub(transaction) == 3.33 * 75.4321
+    assert get_transaction_amount_in_rub_minor(transaction) == 25119
+
+
+def test_get_transaction_amount_in_rub_invalid_amount():
+    """Тест для некорректного значения суммы."""
+    transaction = {"operationAmount": {"amount": "abc", "currency": {"code": "RUB"}}}
+    assert get_transaction_amount_in_rub(transaction) is None
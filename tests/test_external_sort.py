@@ -0,0 +1,69 @@
+import json
+import os
+import random
+
+import pytest
+
+from src.models.operation import Operation
+from src.utils.external_sort import (
+    external_sort_by_date,
+    sort_file_by_date,
+    write_operations_to_json,
+)
+from src.utils.utils import sort_operations_by_date
+
+
+def make_operations(count):
+    rng = random.Random(42)
+    return [
+        {"id": i, "date": f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"}
+        for i in range(count)
+    ] + [{"id": count, "date": ""}]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("max_in_memory", [7, 100, 1000])
+def test_external_sort_matches_in_memory_sort(tmp_path, reverse, max_in_memory):
+    operations = make_operations(300)
+    expected = [op["id"] for op in sort_operations_by_date(operations, reverse)]
+    result = external_sort_by_date(
+        iter(operations), reverse, max_in_memory, tmp_dir=str(tmp_path)
+    )
+    assert [op["id"] for op in result] == expected
+    assert os.listdir(tmp_path) == []  # Временные прогоны удалены
+
+
+def test_external_sort_rejects_bad_budget():
+    with pytest.raises(ValueError):
+        list(external_sort_by_date([], max_in_memory=0))
+
+
+def test_write_operations_to_json_streams(tmp_path):
+    path = tmp_path / "out.json"
+    operation = Operation.from_dict(
+        {"id": 1, "amount": "1.5", "currency_code": "RUB", "state": "EXECUTED"}
+    )
+    assert write_operations_to_json(iter([operation, {"id": 2}]), str(path)) == 2
+    assert json.loads(path.read_text(encoding="utf-8"))[1] == {"id": 2}
+    assert write_operations_to_json([], str(path)) == 0
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+
+def test_sort_file_by_date_csv(tmp_path):
+    source = tmp_path / "transactions.csv"
+    source.write_text(
+        "id;state;date;amount;currency_name;currency_code;description;from;to\n"
+        "1;EXECUTED;2023-01-15T12:00:00Z;1.00;Рубли;RUB;Оплата;;Счет 1\n"
+        "2;EXECUTED;2022-05-01T08:00:00Z;2.00;Рубли;RUB;Оплата;;Счет 2\n"
+        "3;EXECUTED;2023-01-01T00:00:00Z;3.00;Рубли;RUB;Оплата;;Счет 3\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "sorted.json"
+    assert sort_file_by_date(str(source), str(output), max_in_memory=2) == 3
+    assert [op["id"] for op in json.loads(output.read_text(encoding="utf-8"))] == [
+        2,
+        3,
+        1,
+    ]
+    with pytest.raises(ValueError):
+        sort_file_by_date(str(tmp_path / "notes.txt"), str(output))
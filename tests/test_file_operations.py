@@ -6,9 +6,13 @@ import pytest
 
 # Обратите внимание, что здесь импорт из file_operations/file_operations.py
 from src.file_operations.file_operations import (
+    iter_operations_from_csv,
+    iter_operations_from_excel,
     read_operations_from_csv,
+    read_operations_from_csv_parallel,
     read_operations_from_excel,
 )
+from src.models.operation import Operation
 
 # --- Тесты для read_operations_from_csv ---
 
@@ -34,6 +38,7 @@ def test_read_operations_from_csv_success_mock():
                 "id": 1,
                 "description": "Оплата",
                 "amount": 100.50,
+                "amount_minor": 10050,
                 "currency_name": "Рубли",
                 "currency_code": "RUB",
                 "date": "2023-01-15",
@@ -45,6 +50,7 @@ def test_read_operations_from_csv_success_mock():
                 "id": 2,
                 "description": "Перевод",
                 "amount": 200.00,
+                "amount_minor": 20000,
                 "currency_name": "Доллары",
                 "currency_code": "USD",
                 "date": "2023-01-16",
@@ -56,6 +62,7 @@ def test_read_operations_from_csv_success_mock():
                 "id": 3,
                 "description": "Покупка",
                 "amount": 50.25,
+                "amount_minor": 5025,
                 "currency_name": "Евро",
                 "currency_code": "EUR",
                 "date": "2023-01-17",
@@ -125,6 +132,106 @@ def test_read_operations_from_csv_file_not_found_mock():
         assert operations == []
 
 
+CSV_HEADER = "id;state;date;amount;currency_name;currency_code;description;from;to\n"
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    rows = [
+        f"{i};executed;2023-01-{i:02d};{i}.5;Рубли;RUB;Оплата {i};Карта {i};Счет {i}\n"
+        for i in range(1, 8)
+    ]
+    rows.insert(2, "abc;EXECUTED;2023-01-15;1;Рубли;RUB;Битая строка;;\n")
+    path = tmp_path / "operations.csv"
+    path.write_text(CSV_HEADER + "".join(rows), encoding="utf-8")
+    return str(path)
+
+
+def test_csv_amount_parsed_to_minor_units_without_float(tmp_path):
+    """Сумма из текста CSV переводится в копейки точно, даже если float ее не вмещает."""
+    path = tmp_path / "big.csv"
+    path.write_text(
+        CSV_HEADER
+        + "1;EXECUTED;2023-01-15;12345678901234567.89;Рубли;RUB;Оплата;;\n"
+        + "2;EXECUTED;2023-01-15;0.29;Рубли;RUB;Оплата;;\n",
+        encoding="utf-8",
+    )
+    operations = read_operations_from_csv(str(path))
+    assert [op["amount_minor"] for op in operations] == [1234567890123456789, 29]
+    assert Operation.from_dict(operations[0]).amount_minor == 1234567890123456789
+
+
+def test_iter_operations_from_csv_matches_list_reader(csv_file):
+    """Итератор отдает те же операции, что и read_operations_from_csv."""
+    result = list(iter_operations_from_csv(csv_file))
+    assert result == read_operations_from_csv(csv_file)
+    assert [op["id"] for op in result] == [1, 2, 3, 4, 5, 6, 7]
+    assert result[0]["state"] == "EXECUTED"
+
+
+def test_iter_operations_from_csv_batches(csv_file):
+    """С batch_size операции отдаются пакетами фиксированного размера."""
+    batches = list(iter_operations_from_csv(csv_file, batch_size=3))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [op["id"] for batch in batches for op in batch] == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_iter_operations_from_csv_is_lazy(csv_file):
+    """Первая операция доступна без чтения остальных строк."""
+    gen = iter_operations_from_csv(csv_file)
+    assert next(gen)["id"] == 1
+    gen.close()
+
+
+def test_iter_operations_from_csv_missing_file_and_bad_batch_size(tmp_path):
+    assert list(iter_operations_from_csv(str(tmp_path / "missing.csv"))) == []
+    with pytest.raises(ValueError):
+        list(iter_operations_from_csv(str(tmp_path / "missing.csv"), batch_size=0))
+
+
+@pytest.fixture
+def large_csv_file(tmp_path):
+    rows = []
+    for i in range(1, 301):
+        if i % 50 == 0:
+            rows.append(f"{i};EXECUTED;2023-01-01;not_a_number;Рубли;RUB;Битая;;\r\n")
+        else:
+            rows.append(
+                f"{i};EXECUTED;2023-01-01;{i}.25;Рубли;RUB;Оплата {i};Карта;Счет\r\n"
+            )
+    path = tmp_path / "large.csv"
+    path.write_bytes((CSV_HEADER.replace("\n", "\r\n") + "".join(rows)).encode("utf-8"))
+    return str(path)
+
+
+def test_read_operations_from_csv_parallel_matches_serial(large_csv_file, caplog):
+    """Параллельный разбор дает те же операции и те же сообщения об ошибках строк."""
+    with caplog.at_level("ERROR", logger="src.file_operations.file_operations"):
+        serial = read_operations_from_csv(large_csv_file)
+        serial_errors = [r.getMessage() for r in caplog.records]
+        caplog.clear()
+        parallel = read_operations_from_csv_parallel(
+            large_csv_file, max_workers=2, min_chunk_bytes=512
+        )
+        parallel_errors = [r.getMessage() for r in caplog.records]
+
+    assert parallel == serial
+    assert len(parallel) == 294
+    assert parallel_errors == serial_errors
+    assert "строке 50 " in parallel_errors[0]
+
+
+def test_read_operations_from_csv_parallel_small_file_and_bad_headers(
+    tmp_path, csv_file
+):
+    assert read_operations_from_csv_parallel(csv_file, max_workers=2) == (
+        read_operations_from_csv(csv_file)
+    )
+    path = tmp_path / "bad.csv"
+    path.write_text("id;state\n" + "1;EXECUTED\n" * 200, encoding="utf-8")
+    assert read_operations_from_csv_parallel(str(path), 2, min_chunk_bytes=64) == []
+
+
 # --- Тесты для read_operations_from_excel ---
 
 
@@ -208,6 +315,7 @@ def test_read_operations_from_excel_success_mock():
                 "id": 1,
                 "description": "Оплата",
                 "amount": 100.50,
+                "amount_minor": 10050,
                 "currency_name": "Рубли",
                 "currency_code": "RUB",
                 "date": "2023-01-15T12:00:00Z",  # Excel-функция сохраняет Z для ISO
@@ -219,6 +327,7 @@ def test_read_operations_from_excel_success_mock():
                 "id": 2,
                 "description": "Перевод",
                 "amount": 200.00,
+                "amount_minor": 20000,
                 "currency_name": "Доллары",
                 "currency_code": "USD",
                 "date": "2023-01-16T09:30:00Z",  # Excel-функция сохраняет Z для ISO
@@ -432,3 +541,77 @@ def test_read_operations_from_excel_invalid_file_exception():
     ):
         operations = read_operations_from_excel("invalid.xlsx")
         assert operations == []
+
+
+# --- Тесты для iter_operations_from_excel (режим только для чтения) ---
+
+
+@pytest.fixture
+def excel_file(tmp_path):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(
+        [
+            "id",
+            "state",
+            "date",
+            "amount",
+            "currency_name",
+            "currency_code",
+            "description",
+            "from",
+            "to",
+        ]
+    )
+    sheet.append(
+        [
+            1,
+            "executed",
+            datetime(2023, 1, 15, 12, 0, 0),
+            100.5,
+            "Рубли",
+            "RUB",
+            "Оплата",
+            "Карта 1",
+            None,
+        ]
+    )
+    sheet.append([None, None, None, None, None, None, "Пустая строка", None, None])
+    sheet.append(
+        [
+            2,
+            "PENDING",
+            "2023-01-16",
+            "not_a_number",
+            "Доллары",
+            "USD",
+            "Перевод",
+            None,
+            None,
+        ]
+    )
+    sheet.append(
+        [3, "CANCELED", "2023-01-17", 7, "Евро", "EUR", "Покупка", "Счет 3", "Счет 4"]
+    )
+    path = tmp_path / "operations.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+def test_iter_operations_from_excel_matches_full_reader(excel_file):
+    """Потоковый reader возвращает то же, что и read_operations_from_excel."""
+    result = list(iter_operations_from_excel(excel_file))
+    assert result == read_operations_from_excel(excel_file)
+    assert [op["id"] for op in result] == [1, 3]
+    assert result[0]["date"] == "2023-01-15T12:00:00Z"
+    assert result[0]["state"] == "EXECUTED"
+    assert result[0]["to"] == ""
+
+
+def test_iter_operations_from_excel_invalid_file(tmp_path):
+    path = tmp_path / "broken.xlsx"
+    path.write_bytes(b"not a zip")
+    assert list(iter_operations_from_excel(str(path))) == []
+    assert list(iter_operations_from_excel(str(tmp_path / "missing.xlsx"))) == []
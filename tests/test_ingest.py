@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+from src.file_operations.ingest import ingest_directory, list_operation_files
+from src.models.operation import Operation
+
+JSON_OPERATION = {
+    "id": 441945886,
+    "state": "EXECUTED",
+    "date": "2019-08-26T10:50:58.294041",
+    "operationAmount": {
+        "amount": "31957.58",
+        "currency": {"name": "руб.", "code": "RUB"},
+    },
+    "description": "Перевод организации",
+    "from": "Maestro 1596837868705199",
+    "to": "Счет 64686473678894779589",
+}
+
+
+@pytest.fixture
+def exports_dir(tmp_path):
+    (tmp_path / "a_operations.json").write_text(
+        json.dumps([JSON_OPERATION], ensure_ascii=False), encoding="utf-8"
+    )
+    (tmp_path / "b_transactions.csv").write_text(
+        "id;state;date;amount;currency_name;currency_code;description;from;to\n"
+        "1;EXECUTED;2023-01-15;100.50;Рубли;RUB;Оплата;Карта 1;Счет 1\n"
+        "2;PENDING;2023-01-16;200.00;Доллары;USD;Перевод;;Карта 2\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "c_broken.csv").write_text("x;y\n1;2\n", encoding="utf-8")
+    (tmp_path / "d_empty.json").write_text("[]", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("не выгрузка", encoding="utf-8")
+    return tmp_path
+
+
+def test_list_operation_files_skips_unsupported(exports_dir):
+    names = [path.rsplit("/", 1)[-1] for path in list_operation_files(str(exports_dir))]
+    assert names == [
+        "a_operations.json",
+        "b_transactions.csv",
+        "c_broken.csv",
+        "d_empty.json",
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_ingest_directory_ordered(exports_dir, max_workers):
+    operations, report = ingest_directory(str(exports_dir), max_workers=max_workers)
+
+    assert [op.id for op in operations] == [441945886, 1, 2]
+    assert all(isinstance(op, Operation) for op in operations)
+    assert [op.currency_code for op in operations] == ["RUB", "RUB", "USD"]
+    counts = {path.rsplit("/", 1)[-1]: item["count"] for path, item in report.items()}
+    assert counts == {
+        "a_operations.json": 1,
+        "b_transactions.csv": 2,
+        "c_broken.csv": 0,
+        "d_empty.json": 0,
+    }
+    errors = [path for path, item in report.items() if item["error"]]
+    assert len(errors) == 1 and errors[0].endswith("c_broken.csv")
+    assert all(item["rejected"] == [] for item in report.values())
+
+
+def test_ingest_directory_unordered(exports_dir):
+    operations, report = ingest_directory(
+        str(exports_dir), max_workers=2, ordered=False
+    )
+    assert sorted(op.id for op in operations) == [1, 2, 441945886]
+    assert len(report) == 4
+
+
+def test_ingest_directory_missing_or_empty(tmp_path):
+    assert ingest_directory(str(tmp_path / "missing")) == ([], {})
+    assert ingest_directory(str(tmp_path)) == ([], {})
+
+
+def test_ingest_directory_empty_files_are_not_errors(tmp_path):
+    (tmp_path / "empty.json").write_text("  [ ]  ", encoding="utf-8")
+    (tmp_path / "header_only.csv").write_text(
+        "id;state;date;amount;currency_name;currency_code;description;from;to\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "broken.json").write_text("[{", encoding="utf-8")
+    operations, report = ingest_directory(str(tmp_path), max_workers=1)
+    assert operations == []
+    errors = {path.rsplit("/", 1)[-1]: item["error"] for path, item in report.items()}
+    assert errors["empty.json"] is None
+    assert errors["header_only.csv"] is None
+    assert "broken.json" in errors["broken.json"]
+
+
+def test_ingest_directory_skips_bad_records(tmp_path):
+    bad = dict(JSON_OPERATION, id=2)
+    bad["operationAmount"] = {"amount": "n/a", "currency": {"code": "RUB"}}
+    (tmp_path / "operations.json").write_text(
+        json.dumps([JSON_OPERATION, bad], ensure_ascii=False), encoding="utf-8"
+    )
+    operations, report = ingest_directory(str(tmp_path), max_workers=1)
+    assert [op.id for op in operations] == [441945886]
+    [item] = report.values()
+    assert item["count"] == 1 and item["error"] is None
+    assert len(item["rejected"]) == 1 and "ID: 2" in item["rejected"][0]
+
+
+def test_ingest_directory_reports_rejected_rows(tmp_path):
+    (tmp_path / "operations.csv").write_text(
+        "id;state;date;amount;currency_name;currency_code;description;from;to\n"
+        "1;EXECUTED;2023-01-15;100.50;Рубли;RUB;Оплата;Карта 1;Счет 1\n"
+        "2;PENDING;2023-01-16;n/a;Доллары;USD;Перевод;;Карта 2\n",
+        encoding="utf-8",
+    )
+    operations, report = ingest_directory(str(tmp_path), max_workers=1)
+    assert [op.id for op in operations] == [1]
+    [item] = report.values()
+    assert item["error"] is None
+    assert len(item["rejected"]) == 1
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from src.analysis.additional_analytics import count_transactions_by_category
+from src.analysis.keyword_matcher import KeywordMatcher, matcher_for
+
+
+def test_find_overlapping_and_nested_keywords():
+    matcher = KeywordMatcher(["he", "she", "his", "hers", "перевод", "вод"])
+    assert matcher.find("ushers") == {0, 1, 3}
+    assert matcher.find("перевод") == {4, 5}
+    assert matcher.find("") == set()
+
+
+def test_empty_keyword_is_rejected():
+    with pytest.raises(ValueError):
+        KeywordMatcher(["a", ""])
+
+
+def test_matcher_is_cached_by_keywords():
+    assert matcher_for(("a", "b")) is matcher_for(("a", "b"))
+    assert matcher_for(("a", "b")) is not matcher_for(("b", "a"))
+
+
+def test_random_keywords_match_substring_search():
+    rng = random.Random(0)
+    for _ in range(500):
+        keywords = list(
+            {"".join(rng.choices("абв", k=rng.randint(1, 4))) for _ in range(6)}
+        )
+        text = "".join(rng.choices("абвг", k=rng.randint(0, 20)))
+        expected = {
+            number for number, keyword in enumerate(keywords) if keyword in text
+        }
+        assert KeywordMatcher(keywords).find(text) == expected
+
+
+def _count_naive(transactions, categories):
+    counts = {cat: 0 for cat in categories}
+    for transaction in transactions:
+        description = transaction.get("description", "")
+        if description:
+            for cat in categories:
+                if cat.lower() in description.lower():
+                    counts[cat] += 1
+    return counts
+
+
+def test_count_by_category_keeps_semantics():
+    transactions = [
+        {"description": "Перевод с карты на карту"},
+        {"description": "Перевод организации"},
+        {"description": "Оплата услуг связи"},
+        {"description": ""},
+        {"id": 5},
+    ]
+    categories = ["перевод", "ПЕРЕВОД", "перевод", "карт", "", "связи", "такси"]
+    result = count_transactions_by_category(transactions, categories)
+    assert result == _count_naive(transactions, categories)
+    assert result == {
+        "перевод": 4,
+        "ПЕРЕВОД": 2,
+        "карт": 1,
+        "": 3,
+        "связи": 1,
+        "такси": 0,
+    }
@@ -0,0 +1,23 @@
+import pytest
+
+from src.main import format_transaction
+from src.models.operation import Operation
+
+
+@pytest.mark.parametrize(
+    "amount, expected",
+    [("6004.00", "6004.00"), ("82139.20", "82139.20"), (0.1, "0.10"), (7, "7.00")],
+)
+def test_format_transaction_amount_has_two_decimals(amount, expected):
+    op = Operation.from_dict(
+        {
+            "id": 1,
+            "date": "2023-01-01T00:00:00",
+            "state": "EXECUTED",
+            "amount": amount,
+            "currency_code": "RUB",
+            "description": "Открытие вклада",
+            "to": "Счет 64686473678894779589",
+        }
+    )
+    assert f"Сумма: {expected} RUB" in format_transaction(op)
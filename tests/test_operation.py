@@ -0,0 +1,120 @@
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src.models.operation import (
+    Operation,
+    sum_minor_units,
+    sum_minor_units_by,
+    to_operations,
+)
+from src.utils.utils import sort_operations_by_date
+
+JSON_OPERATION = {
+    "id": 441945886,
+    "state": "EXECUTED",
+    "date": "2019-08-26T10:50:58.294041",
+    "operationAmount": {
+        "amount": "31957.58",
+        "currency": {"name": "руб.", "code": "RUB"},
+    },
+    "description": "Перевод организации",
+    "from": "Maestro 1596837868705199",
+    "to": "Счет 64686473678894779589",
+}
+
+FLAT_OPERATION = {
+    "id": 441945886,
+    "description": "Перевод организации",
+    "amount": 31957.58,
+    "currency_name": "руб.",
+    "currency_code": "RUB",
+    "date": "2019-08-26T10:50:58.294041",
+    "state": "EXECUTED",
+    "from": "Maestro 1596837868705199",
+    "to": "Счет 64686473678894779589",
+}
+
+LOADER_TRANSACTION = {
+    "id": 441945886,
+    "description": "Перевод организации",
+    "amount": 31957.58,
+    "currency": "rub",
+    "date": "2019-08-26T10:50:58.294041",
+    "status": "executed",
+    "from": "Maestro 1596837868705199",
+    "to": "Счет 64686473678894779589",
+}
+
+
+@pytest.mark.parametrize("source", [JSON_OPERATION, FLAT_OPERATION, LOADER_TRANSACTION])
+def test_from_dict_normalizes_every_schema(source):
+    op = Operation.from_dict(source)
+    assert op.id == 441945886
+    assert op.amount_minor == 3195758
+    assert op.amount == 31957.58
+    assert op.currency_code == "RUB"
+    assert op.state == "EXECUTED"
+    assert op.from_ == "Maestro 1596837868705199"
+
+
+def test_to_dict_round_trip_and_mapping_access():
+    op = Operation.from_dict(JSON_OPERATION)
+    assert op.to_dict() == FLAT_OPERATION
+    assert Operation.from_dict(op.to_dict()) == op
+    assert op["from"] == "Maestro 1596837868705199"
+    assert op.get("missing", "default") == "default"
+    with pytest.raises(KeyError):
+        op["operationAmount"]
+
+
+def test_operation_has_no_instance_dict():
+    op = Operation.from_dict(FLAT_OPERATION)
+    assert not hasattr(op, "__dict__")
+    assert sys.getsizeof(op) < sys.getsizeof(FLAT_OPERATION)
+
+
+def test_to_operations_and_sort_by_date():
+    items = [
+        dict(FLAT_OPERATION, id=1, date="2023-01-15T12:00:00Z"),
+        dict(FLAT_OPERATION, id=2, date="10.01.2023"),
+    ]
+    operations = list(to_operations(iter(items)))
+    assert all(isinstance(op, Operation) for op in operations)
+    assert list(to_operations(operations)) == operations
+
+    sorted_ops = sort_operations_by_date(operations)
+    assert [op.id for op in sorted_ops] == [2, 1]
+    assert sorted_ops[0] is not operations[1]  # Возвращаются копии
+
+
+def test_invalid_amount_raises_value_error():
+    with pytest.raises(ValueError):
+        Operation.from_dict(dict(FLAT_OPERATION, amount="не число"))
+
+
+def test_sums_are_exact_integers():
+    operations = [
+        Operation.from_dict(dict(FLAT_OPERATION, amount="0.1")) for _ in range(10)
+    ]
+    operations.append(Operation.from_dict(dict(FLAT_OPERATION, currency_code="USD")))
+    assert sum_minor_units(operations) == 100 + 3195758
+    assert sum_minor_units_by(operations, "currency_code") == {
+        "RUB": 100,
+        "USD": 3195758,
+    }
+
+
+def test_to_operations_skips_unconvertible_records():
+    items = [
+        dict(FLAT_OPERATION, id=1),
+        dict(FLAT_OPERATION, id=2, amount="n/a"),
+        {"id": 3},
+        dict(FLAT_OPERATION, id=4),
+    ]
+    with patch("src.models.operation.logger") as mock_logger:
+        operations = list(to_operations(items, "test.json"))
+    assert [op.id for op in operations] == [1, 4]
+    message = mock_logger.warning.call_args.args[0]
+    assert "test.json" in message and "пропущено 2" in message
@@ -0,0 +1,107 @@
+from datetime import date
+
+from src.analysis.bitmap_index import OperationIndex
+from src.analysis.planner import Planner
+from src.analysis.query import Query
+from src.models.operation import Operation
+
+OPERATIONS = [
+    Operation.from_dict(
+        {
+            "id": i,
+            "date": f"2023-0{i % 3 + 1}-1{i % 10}T12:00:00",
+            "state": "EXECUTED" if i % 4 else "CANCELED",
+            "amount": i,
+            "currency_code": "USD" if i % 10 == 0 else "RUB",
+            "description": "Перевод организации" if i % 2 else "Открытие вклада",
+        }
+    )
+    for i in range(1, 101)
+]
+
+
+def _labels(plan):
+    return [stage.description for stage in plan.stages()]
+
+
+def test_regex_is_checked_last():
+    query = Query(OPERATIONS).description("перевод").where(lambda op: True).state()
+    plan = query.planner.plan(query.conditions)
+    labels = _labels(plan)
+    assert labels[0].startswith("фильтр: state")
+    assert labels[-1].startswith("фильтр: description")
+
+
+def test_stats_put_selective_equality_first():
+    planner = Planner(OPERATIONS)
+    query = Query(OPERATIONS, planner).state("EXECUTED").currency("USD")
+    plan = planner.plan(query.conditions)
+    assert plan.filter_stages[0].description.startswith("фильтр: currency_code")
+    assert plan.filter_stages[0].selectivity == 0.1
+    assert plan.filter_stages[1].selectivity == 0.75
+
+
+def test_date_range_selectivity():
+    planner = Planner(OPERATIONS)
+    whole = Query(OPERATIONS).between(date(2023, 1, 1), date(2024, 1, 1))
+    none = Query(OPERATIONS).between(date(2020, 1, 1), date(2021, 1, 1))
+    assert planner.selectivity(whole.conditions[0]) == 1.0
+    assert planner.selectivity(none.conditions[0]) == 0.0
+
+
+def test_planner_gives_same_results():
+    index = OperationIndex(OPERATIONS)
+    planners = [None, Planner(OPERATIONS), Planner(index=index)]
+    results = [
+        Query(index.operations, planner)
+        .description("вклад")
+        .state("CANCELED")
+        .currency("RUB", "USD")
+        .between(date(2023, 1, 1), date(2023, 3, 1))
+        .sort_by_date()
+        .to_list()
+        for planner in planners
+    ]
+    assert results[0]
+    assert results[0] == results[1] == results[2]
+
+
+def test_index_stage_with_operation_index():
+    index = OperationIndex(OPERATIONS)
+    query = Query(index.operations, Planner(index=index)).description("вклад").state()
+    plan = query.planner.plan(query.conditions)
+    assert plan.index_stage is not None
+    assert [stage.conditions[0].kind for stage in plan.filter_stages] == ["description"]
+    assert query.count() == 25
+
+
+def test_index_stage_falls_back_to_filter_for_other_source():
+    index = OperationIndex(OPERATIONS)
+    subset = OPERATIONS[:10]
+    query = Query(subset, Planner(index=index)).state("CANCELED")
+    assert query.to_list() == [op for op in subset if op.get("state") == "CANCELED"]
+
+
+def test_explain_counts_rows():
+    index = OperationIndex(OPERATIONS)
+    text = (
+        Query(index.operations, Planner(index=index))
+        .state()
+        .description("вклад")
+        .sort_by_date()
+        .limit(5)
+        .explain()
+    )
+    lines = text.splitlines()
+    assert lines[0] == "План запроса (строк на входе: 100):"
+    assert "индекс: state = 'EXECUTED'" in lines[1]
+    assert "просмотрено 100, прошло 75" in lines[1]
+    assert "просмотрено 75, прошло 25" in lines[2]
+    assert "сортировка по дате (по убыванию)" in lines[3]
+    assert lines[4].endswith("limit 5")
+    assert lines[5].endswith("результат: 5 строк")
+
+
+def test_explain_without_conditions():
+    text = Query(iter(OPERATIONS)).explain()
+    assert text.splitlines() == ["План запроса:", "  1. результат: 100 строк"]
@@ -1,6 +1,6 @@
 import pytest
 
-from src.processing import filter_by_state, sort_by_date
+from src.processing import filter_by_state, sort_by_date, top_k_by_date
 
 
 def test_filter_by_state_executed(transactions):
@@ -30,3 +30,29 @@ def test_sort_by_date_ascending(transactions):
     sorted_data = sort_by_date(transactions, descending=False)
     dates = [tx["date"] for tx in sorted_data]
     assert dates == sorted(dates)
+
+
+def test_top_k_by_date_latest_and_earliest(transactions):
+    latest = top_k_by_date(transactions, 2)
+    assert [tx["date"] for tx in latest] == [
+        "2025-04-27T14:00:00.000",
+        "2025-04-26T12:00:00.000",
+    ]
+    earliest = top_k_by_date(iter(transactions), 1, descending=False)
+    assert earliest == [transactions[1]]
+
+
+def test_top_k_by_date_with_predicates_and_bad_dates(transactions):
+    data = transactions + [{"state": "EXECUTED", "date": "не дата"}]
+    result = top_k_by_date(
+        data,
+        10,
+        predicates=[lambda tx: tx["state"] != "CANCELED", lambda tx: "date" in tx],
+    )
+    assert [tx["state"] for tx in result] == ["EXECUTED", "EXECUTED", "PENDING"]
+    assert top_k_by_date(data, 0) == []
+
+
+def test_top_k_by_date_options_are_keyword_only(transactions):
+    with pytest.raises(TypeError):
+        top_k_by_date(transactions, 1, False)
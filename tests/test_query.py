@@ -0,0 +1,101 @@
+from datetime import date
+
+import pytest
+
+from src.analysis.additional_analytics import find_transactions_by_description
+from src.analysis.query import Query
+from src.models.operation import Operation
+
+OPERATIONS = [
+    Operation.from_dict(item)
+    for item in [
+        {
+            "id": 1,
+            "date": "2023-01-15T12:00:00",
+            "state": "EXECUTED",
+            "amount": 1,
+            "currency_code": "RUB",
+            "description": "Перевод организации",
+        },
+        {
+            "id": 2,
+            "date": "2023-01-10T12:00:00",
+            "state": "EXECUTED",
+            "amount": 2,
+            "currency_code": "USD",
+            "description": "Перевод с карты на карту",
+        },
+        {
+            "id": 3,
+            "date": "2023-02-01T00:00:00",
+            "state": "CANCELED",
+            "amount": 3,
+            "currency_code": "RUB",
+            "description": "Открытие вклада",
+        },
+        {
+            "id": 4,
+            "date": "",
+            "state": "EXECUTED",
+            "amount": 4,
+            "currency_code": "RUB",
+            "description": "Перевод без даты",
+        },
+        {
+            "id": 5,
+            "date": "2023-01-20T09:00:00",
+            "state": "EXECUTED",
+            "amount": 5,
+            "currency_code": "rub",
+            "description": "Оплата",
+        },
+    ]
+]
+
+
+def ids(operations):
+    return [op.id for op in operations]
+
+
+def test_query_is_immutable_and_lazy():
+    base = Query(OPERATIONS)
+    executed = base.state("EXECUTED")
+    assert ids(base) == [1, 2, 3, 4, 5]
+    assert ids(executed) == [1, 2, 4, 5]
+    assert ids(executed.currency("rub")) == [1, 4, 5]
+
+
+def test_query_matches_step_by_step_filters():
+    query = Query(OPERATIONS).state("EXECUTED").currency("RUB").description("перевод")
+    expected = find_transactions_by_description(
+        [
+            op
+            for op in OPERATIONS
+            if op.state == "EXECUTED" and op.currency_code == "RUB"
+        ],
+        "перевод",
+    )
+    assert query.to_list() == expected
+
+
+def test_sort_and_limit_are_applied_last():
+    query = Query(OPERATIONS).state("EXECUTED")
+    assert ids(query.sort_by_date()) == [5, 1, 2]
+    assert ids(query.sort_by_date(descending=False).limit(2)) == [2, 1]
+    assert ids(query.limit(2)) == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "search, expected",
+    [("", [1, 2, 3, 4, 5]), ("[", []), ("ВКЛАД|оплата", [3, 5])],
+)
+def test_description_filter(search, expected):
+    assert ids(Query(OPERATIONS).description(search)) == expected
+
+
+def test_between_count_and_exists():
+    january = Query(OPERATIONS).between(date(2023, 1, 1), date(2023, 2, 1))
+    assert january.count() == 3
+    assert january.exists()
+    assert not january.state("PENDING").exists()
+    assert ids(Query(iter(OPERATIONS)).where(lambda op: op.amount > 3)) == [4, 5]
@@ -0,0 +1,117 @@
+from datetime import date
+
+from src.analysis.bitmap_index import OperationIndex
+from src.analysis.planner import Planner
+from src.analysis.query import Query
+from src.analysis.query_cache import QueryCache, query_key
+from src.models.operation import Operation
+from src.models.versioned_list import VersionedList
+
+
+def _operation(i: int, state: str = "EXECUTED", currency: str = "RUB") -> Operation:
+    return Operation.from_dict(
+        {
+            "id": i,
+            "date": f"2023-01-{i % 28 + 1:02d}T12:00:00",
+            "state": state,
+            "amount": i,
+            "currency_code": currency,
+            "description": "Перевод организации",
+        }
+    )
+
+
+DATASET = [_operation(1), _operation(2, "CANCELED"), _operation(3, currency="USD")]
+
+
+def test_versioned_list_counts_mutations():
+    items = VersionedList([1, 2])
+    assert items.version == 0
+    items.append(3)
+    items.extend([4])
+    items += [5]
+    items[0] = 0
+    del items[0]
+    items.sort(reverse=True)
+    assert items == [5, 4, 3, 2]
+    assert items.version == 6
+
+
+def test_query_key_ignores_condition_order():
+    first = Query(DATASET).state().currency("rub", "usd")
+    second = Query(DATASET).currency("USD", "RUB").state().state()
+    assert query_key(first) == query_key(second)
+    assert query_key(first) != query_key(first.limit(1))
+
+
+def test_repeated_query_is_a_hit():
+    dataset = VersionedList(DATASET)
+    cache = QueryCache()
+    first = cache.run(Query(dataset).state().sort_by_date())
+    second = cache.run(Query(dataset).sort_by_date().state())
+    assert first == second == Query(dataset).state().sort_by_date().to_list()
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    second.clear()
+    assert cache.run(Query(dataset).state().sort_by_date()) == first
+
+
+def test_mutation_invalidates_results():
+    dataset = VersionedList(DATASET)
+    cache = QueryCache()
+    assert len(cache.run(Query(dataset).state())) == 2
+    dataset.append(_operation(4))
+    assert len(cache.run(Query(dataset).state())) == 3
+    assert cache.stats.misses == 2
+    assert cache.stats.invalidations == 1
+    assert len(cache) == 1
+
+
+def test_operation_index_append_invalidates():
+    index = OperationIndex(DATASET)
+    cache = QueryCache()
+    query = Query(index.operations, Planner(index=index)).currency("USD")
+    assert len(cache.run(query)) == 1
+    index.append(_operation(5, currency="USD"))
+    assert len(cache.run(query)) == 2
+
+
+def test_plain_list_bypasses_cache():
+    cache = QueryCache()
+    assert len(cache.run(Query(DATASET).state())) == 2
+    assert cache.stats.bypassed == 1
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entries():
+    dataset = VersionedList(DATASET)
+    cache = QueryCache(max_entries=2)
+    cache.run(Query(dataset).state("EXECUTED"))
+    cache.run(Query(dataset).state("CANCELED"))
+    cache.run(Query(dataset).state("EXECUTED"))
+    cache.run(Query(dataset).currency("USD"))
+    assert cache.stats.evictions == 1
+    cache.run(Query(dataset).state("EXECUTED"))
+    assert cache.stats.hits == 2
+    cache.run(Query(dataset).state("CANCELED"))
+    assert cache.stats.misses == 4
+
+
+def test_lru_eviction_by_bytes():
+    dataset = VersionedList(_operation(i) for i in range(2000))
+    cache = QueryCache(max_bytes=10_000)
+    cache.run(Query(dataset).state())
+    assert len(cache) == 0 and cache.size_bytes == 0
+    cache.run(Query(dataset).between(date(2023, 1, 1), date(2023, 1, 2)))
+    assert len(cache) == 1 and 0 < cache.size_bytes <= 10_000
+
+
+def test_invalidate():
+    dataset = VersionedList(DATASET)
+    cache = QueryCache()
+    cache.run(Query(dataset).state())
+    cache.invalidate(dataset)
+    assert len(cache) == 0 and cache.size_bytes == 0
+    cache.run(Query(dataset).state())
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.stats.hit_rate == 0.0
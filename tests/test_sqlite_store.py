@@ -0,0 +1,80 @@
+import pytest
+
+from src.file_operations.file_operations import read_operations_from_csv
+from src.file_operations.sqlite_store import OperationStore
+
+CSV_TEXT = (
+    "id;state;date;amount;currency_name;currency_code;description;from;to\n"
+    "1;EXECUTED;2023-01-15T12:00:00Z;100.50;Рубли;RUB;Оплата услуг;Карта 1;Счет 1\n"
+    "2;PENDING;2023-01-16T09:00:00Z;200.00;Доллары;USD;Перевод организации;;Счет 2\n"
+    "3;EXECUTED;2023-01-15T23:59:59Z;3.00;Доллары;USD;Открытие вклада;;Счет 3\n"
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    csv_path = tmp_path / "transactions.csv"
+    csv_path.write_text(CSV_TEXT, encoding="utf-8")
+    with OperationStore(str(tmp_path / "operations.db")) as store:
+        store.load_file(str(csv_path), read_operations_from_csv)
+        yield store
+
+
+def test_bulk_load_is_idempotent_and_uses_wal(store, tmp_path):
+    assert len(store) == 3
+    assert (
+        store.load_file(str(tmp_path / "transactions.csv"), read_operations_from_csv)
+        == 3
+    )
+    assert len(store) == 3
+    mode = store.connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_small_batches(tmp_path):
+    operations = [
+        {"id": i, "amount": "1.01", "currency_code": "RUB", "state": "EXECUTED"}
+        for i in range(25)
+    ]
+    with OperationStore(str(tmp_path / "batches.db")) as store:
+        assert store.bulk_load(iter(operations), batch_size=10) == 25
+        assert sum(op.amount_minor for op in store.iter_operations()) == 2525
+
+
+def test_queries_mirror_list_functions(store):
+    assert [op.id for op in store.filter_by_state()] == [1, 3]
+    assert [op.id for op in store.filter_by_currency("usd")] == [2, 3]
+    assert [
+        op.id for op in store.find_transactions_by_description("перевод|ВКЛАД")
+    ] == [
+        2,
+        3,
+    ]
+    assert store.find_transactions_by_description("[") == []
+    assert [op.id for op in store.get_transactions_by_date("15.01.2023")] == [1, 3]
+    assert store.get_transactions_by_date("2023-01-15") == []
+
+
+def test_indexes_are_used(store):
+    plan = store.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM operations WHERE state = ?", ("EXECUTED",)
+    ).fetchall()
+    assert any("idx_operations_state" in row[-1] for row in plan)
+    names = {
+        row[0]
+        for row in store.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    assert "idx_operations_description" not in names
+
+
+def test_iter_operations_takes_parameterised_equality(store):
+    assert [op.id for op in store.iter_operations(state="EXECUTED")] == [1, 3]
+    assert [
+        op.id for op in store.iter_operations(state="EXECUTED", currency_code="USD")
+    ] == [3]
+    # Значение передается параметром, а не подставляется в текст запроса
+    assert list(store.iter_operations(state="x' OR '1'='1")) == []
+    with pytest.raises(ValueError):
+        store.iter_operations(**{"1=1 OR state": "EXECUTED"})
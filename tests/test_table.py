@@ -0,0 +1,133 @@
+import pytest
+
+from src.models.operation import Operation, to_minor_units
+from src.models.table import MISSING_DATE, OperationTable, mask_and, mask_or
+
+OPERATIONS = [
+    {
+        "id": 1,
+        "state": "EXECUTED",
+        "date": "2023-01-15T12:00:00Z",
+        "operationAmount": {
+            "amount": "100.50",
+            "currency": {"name": "руб.", "code": "RUB"},
+        },
+        "description": "Оплата",
+        "from": "Карта 1",
+        "to": "Счет 1",
+    },
+    {
+        "id": 2,
+        "description": "Перевод",
+        "amount": 200.0,
+        "currency_name": "Доллары",
+        "currency_code": "usd",
+        "date": "2023-01-16T09:30:00",
+        "state": "CANCELED",
+        "from": "",
+        "to": "Карта 2",
+    },
+    {
+        "id": 3,
+        "description": "Оплата",
+        "amount": 0.1,
+        "currency": "RUB",
+        "date": "15.01.2023",
+        "status": "executed",
+    },
+    {
+        "id": 4,
+        "description": "Без даты",
+        "amount": 5,
+        "currency_code": "RUB",
+        "date": "",
+        "state": "EXECUTED",
+    },
+]
+
+
+@pytest.fixture
+def table():
+    return OperationTable.from_operations(OPERATIONS)
+
+
+def test_to_minor_units_avoids_float_error():
+    assert to_minor_units("31957.58") == 3195758
+    assert to_minor_units(0.1 + 0.2) == 30
+    assert to_minor_units(16210) == 1621000
+
+
+def test_columns_and_round_trip(table):
+    assert len(table) == 4
+    assert list(table.amounts) == [10050, 20000, 10, 500]
+    assert table.dates[3] == MISSING_DATE
+    assert table.descriptions[0] is table.descriptions[2]
+    assert table.to_operations() == [Operation.from_dict(item) for item in OPERATIONS]
+
+
+def test_filters_match_list_semantics(table):
+    executed = table.filter_by_state()
+    assert list(executed.ids) == [1, 3, 4]
+    assert list(executed.filter_by_currency("rub").ids) == [1, 3, 4]
+    assert list(table.filter_by_currency("USD").ids) == [2]
+    assert len(table.filter_by_state("PENDING")) == 0
+
+
+def test_mask_combinators(table):
+    rub = table.currency_mask("RUB")
+    canceled = table.state_mask("CANCELED")
+    assert mask_and(rub, canceled) == bytes([0, 0, 0, 0])
+    assert mask_or(rub, canceled) == bytes([1, 1, 1, 1])
+    assert list(table.filter(mask_and(rub, table.state_mask("EXECUTED"))).ids) == [
+        1,
+        3,
+        4,
+    ]
+
+
+def test_sort_and_date_lookup(table):
+    assert table.argsort_by_date() == [1, 0, 2]
+    assert list(table.sort_by_date(descending=False).ids) == [3, 1, 2]
+    assert list(table.get_transactions_by_date("15.01.2023").ids) == [1, 3]
+    assert len(table.get_transactions_by_date("01.01.2020")) == 0
+
+
+def test_integer_aggregates(table):
+    assert table.total_amount() == 30560
+    assert table.total_amount(table.state_mask("EXECUTED")) == 10560
+    assert table.sum_by_currency() == {"RUB": 10560, "USD": 20000}
+    assert table.filter_by_state().sum_by_state() == {"EXECUTED": 10560}
+
+
+def test_find_transactions_by_description(table):
+    assert table.folded_descriptions == ["оплата", "перевод", "оплата", "без даты"]
+    assert list(table.find_transactions_by_description("ОПЛАТ").ids) == [1, 3]
+    assert list(table.find_transactions_by_description("^пер|даты$").ids) == [2, 4]
+    assert table.find_transactions_by_description("") is table
+    filtered = table.filter_by_state("EXECUTED").find_transactions_by_description("оп")
+    assert filtered.folded_descriptions == ["оплата", "оплата"]
+
+
+def test_append_failure_keeps_columns_aligned():
+    table = OperationTable()
+    for i in range(256):
+        table.append(dict(OPERATIONS[1], id=i, state=f"STATE_{i}"))
+    with pytest.raises(ValueError):
+        table.append(dict(OPERATIONS[1], id=256, state="ЛИШНИЙ"))
+    with pytest.raises(OverflowError):
+        table.append(dict(OPERATIONS[1], id=2**63, state="STATE_0"))
+    table.append(dict(OPERATIONS[1], id=257, state="STATE_0"))
+    assert len(table) == 257
+    assert {
+        len(column)
+        for column in (
+            table.ids,
+            table.dates,
+            table.amounts,
+            table.states,
+            table.currencies,
+            table.descriptions,
+            table.recipients,
+        )
+    } == {257}
+    assert table.row(256).id == 257
@@ -0,0 +1,81 @@
+import pytest
+
+from src.analysis.additional_analytics import find_transactions_by_description
+from src.analysis.text_index import TextIndex, stem_word, tokenize
+
+OPERATIONS = [
+    {"id": 1, "description": "Перевод организации"},
+    {"id": 2, "description": "Перевод с карты на карту"},
+    {"id": 3, "description": "Открытие вклада"},
+    {"id": 4, "description": "Перевод организации"},
+    {"id": 5, "description": "Оплата переводов ЁЖ"},
+    {"id": 6, "description": ""},
+    {"id": 7},
+]
+
+
+def _ids(operations):
+    return [op["id"] for op in operations]
+
+
+@pytest.fixture
+def index():
+    return TextIndex(OPERATIONS)
+
+
+def test_distinct_descriptions_are_indexed_once(index):
+    assert len(index) == 7
+    assert len(index.descriptions) == 5
+    assert list(index.postings["перевод"]) == [0, 1]
+
+
+def test_tokenize_and_stem():
+    assert tokenize("Ёлка, ПЕРЕВОД-2") == ["елка", "перевод", "2"]
+    assert stem_word("переводов") == "перевод"
+    assert stem_word("сам") == "сам"
+
+
+def test_word_query(index):
+    assert _ids(index.word("ПЕРЕВОД")) == [1, 2, 4]
+    assert _ids(index.word("еж")) == [5]
+    assert index.word("кредит") == []
+
+
+def test_word_query_with_stemming():
+    index = TextIndex(OPERATIONS, stem=True)
+    assert _ids(index.word("переводы")) == [1, 2, 4, 5]
+    assert _ids(index.word("карта")) == [2]
+
+
+def test_phrase_query(index):
+    assert _ids(index.phrase("перевод организации")) == [1, 4]
+    assert _ids(index.phrase("на карту")) == [2]
+    assert index.phrase("карту на") == []
+    assert index.phrase("") == []
+
+
+def test_prefix_query(index):
+    assert _ids(index.prefix("Пере")) == [1, 2, 4, 5]
+    assert _ids(index.prefix("вкл")) == [3]
+    assert index.prefix(" ") == []
+
+
+@pytest.mark.parametrize("search_string", ["перевод", "^Перевод|вклад", "вод орг"])
+def test_search_matches_scan(index, search_string):
+    assert find_transactions_by_description(
+        OPERATIONS, search_string, index=index
+    ) == find_transactions_by_description(OPERATIONS, search_string)
+
+
+def test_search_invalid_regex(index):
+    assert find_transactions_by_description(OPERATIONS, "[", index=index) == []
+
+
+def test_search_ignores_index_over_other_operations(index):
+    subset = OPERATIONS[:2]
+    assert find_transactions_by_description(
+        subset, "перевод", index=index
+    ) == find_transactions_by_description(subset, "перевод")
+    copies = [op.copy() for op in OPERATIONS]
+    result = find_transactions_by_description(copies, "перевод", index=index)
+    assert all(any(op is copy for copy in copies) for op in result)
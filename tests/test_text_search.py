@@ -0,0 +1,47 @@
+import re
+
+import pytest
+
+from src.utils.text_search import compile_pattern, description_matcher, is_literal
+
+
+@pytest.mark.parametrize(
+    "search_string, expected",
+    [
+        ("Перевод", True),
+        ("перевод организации", True),
+        ("Перевод.*", False),
+        ("a|b", False),
+        ("(вклад)", False),
+        ("[", False),
+    ],
+)
+def test_is_literal(search_string, expected):
+    assert is_literal(search_string) is expected
+
+
+@pytest.mark.parametrize(
+    "search_string",
+    ["перевод", "ПЕРЕВОД С", "карт", "^Перевод", "вклад|карт", "x"],
+)
+def test_matcher_agrees_with_regex(search_string):
+    descriptions = ["Перевод с карты на карту", "Открытие вклада", "", "ПЕРЕВОД"]
+    matches = description_matcher(search_string)
+    pattern = re.compile(search_string, re.IGNORECASE)
+    assert [matches(d) for d in descriptions] == [
+        pattern.search(d) is not None for d in descriptions
+    ]
+
+
+def test_compiled_patterns_are_cached():
+    compile_pattern.cache_clear()
+    description_matcher("вклад|карт")
+    description_matcher("вклад|карт")
+    assert compile_pattern.cache_info().hits == 1
+    description_matcher("вклад")
+    assert compile_pattern.cache_info().misses == 1
+
+
+def test_invalid_pattern_raises():
+    with pytest.raises(re.error):
+        description_matcher("[")
@@ -1,3 +1,4 @@
+import io
 import json
 from datetime import datetime
 from pathlib import Path
@@ -6,7 +7,13 @@ from unittest.mock import patch
 import pytest
 
 # ИМПОРТЫ ИСПРАВЛЕНЫ: Обе функции импортируются из src.utils.utils
-from src.utils.utils import load_operations_from_json, sort_operations_by_date
+from src.utils.utils import (
+    _iter_json_array,
+    argsort_operations_by_date,
+    iter_operations_from_json,
+    load_operations_from_json,
+    sort_operations_by_date,
+)
 
 
 # Тесты для load_operations_from_json (из src/utils/utils.py)
@@ -321,3 +328,122 @@ def test_sort_operations_by_date_with_duplicate_dates():
     # Если важен порядок, то нужно добавлять вторую ключ для сортировки (например, id)
     # Но для данного теста достаточно, чтобы они были сгруппированы по дате
     assert [op["id"] for op in sorted_ops] == [2, 1, 3, 4]
+
+
+def test_argsort_operations_by_date_returns_permutation():
+    """Тест перестановки индексов: операции без даты не попадают в результат."""
+    operations = [
+        {"id": 1, "date": "2023-01-15T12:00:00Z"},
+        {"id": 2, "date": "10.01.2023"},
+        {"id": 3, "date": ""},
+        {"id": 4, "date": "2023-01-15T12:00:00"},
+        {"id": 5, "date": "invalid-date"},
+    ]
+    assert argsort_operations_by_date(operations) == [1, 0, 3]
+    assert argsort_operations_by_date(operations, reverse=True) == [0, 3, 1]
+
+
+def test_sort_operations_by_date_in_place():
+    """Тест сортировки на месте: возвращаются исходные объекты без копий."""
+    first = {"id": 1, "date": "2023-01-15T12:00:00Z"}
+    second = {"id": 2, "date": "2023-01-10T12:00:00Z"}
+    operations = [first, {"id": 3, "date": None}, second]
+    result = sort_operations_by_date(operations, in_place=True)
+    assert result is operations
+    assert result[0] is second and result[1] is first
+    assert len(operations) == 2
+
+
+# Тесты для iter_operations_from_json (потоковая загрузка)
+def test_iter_operations_from_json_matches_full_load(tmp_path):
+    """Потоковый загрузчик отдает те же операции, что и load_operations_from_json."""
+    filepath = tmp_path / "operations.json"
+    data = [
+        {
+            "id": i,
+            "state": "EXECUTED",
+            "date": "2023-01-01T00:00:00Z",
+            "operationAmount": {
+                "amount": f"{i}.50",
+                "currency": {"name": "руб.", "code": "RUB"},
+            },
+            "description": "Перевод организации",
+        }
+        for i in range(1, 50)
+    ]
+    data.insert(3, {"id": 999, "description": "Неполная операция"})
+    data.insert(7, "не словарь")
+    filepath.write_text(
+        json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+
+    # Маленький блок, чтобы элементы гарантированно разрывались границами блоков
+    result = list(iter_operations_from_json(str(filepath), chunk_size=7))
+
+    assert result == load_operations_from_json(str(filepath))
+    assert len(result) == 49
+
+
+def test_iter_operations_from_json_is_lazy(tmp_path):
+    """Генератор отдает первые операции до того, как дочитан весь файл."""
+    filepath = tmp_path / "operations.json"
+    op = {
+        "id": 1,
+        "state": "EXECUTED",
+        "date": "2023-01-01T00:00:00Z",
+        "operationAmount": {
+            "amount": "1.00",
+            "currency": {"name": "RUB", "code": "RUB"},
+        },
+        "description": "Op",
+    }
+    # Второй элемент испорчен: первый все равно должен быть получен
+    filepath.write_text("[" + json.dumps(op) + ", {broken", encoding="utf-8")
+
+    result = list(iter_operations_from_json(str(filepath), chunk_size=16))
+    assert result == [op]
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["", "not a json", '{"key": "value"}', "[1, 2"],
+)
+def test_iter_operations_from_json_invalid_content(tmp_path, content):
+    """Пустой, некорректный или не-списочный JSON не дает операций."""
+    filepath = tmp_path / "bad.json"
+    filepath.write_text(content, encoding="utf-8")
+    assert list(iter_operations_from_json(str(filepath))) == []
+
+
+def test_iter_operations_from_json_empty_list_and_missing_file(tmp_path):
+    """Пустой массив и отсутствующий файл дают пустой результат."""
+    filepath = tmp_path / "empty_list.json"
+    filepath.write_text("  [ ]  ", encoding="utf-8")
+    assert list(iter_operations_from_json(str(filepath))) == []
+    assert list(iter_operations_from_json(str(tmp_path / "missing.json"))) == []
+
+
+def test_iter_json_array_fails_fast_on_malformed_element():
+    """Испорченный элемент не заставляет дочитывать файл до конца."""
+    tail = ", ".join(json.dumps({"id": i}) for i in range(10_000))
+    f = io.StringIO('[{"id": 0}, {"id": 1,, "x": 2}, ' + tail + "]")
+    items = _iter_json_array(f, chunk_size=64)
+    assert next(items) == {"id": 0}
+    with pytest.raises(json.JSONDecodeError):
+        next(items)
+    assert f.tell() <= 256
+
+
+def test_iter_json_array_limits_item_size():
+    """Незакрытая строка прерывает разбор по достижении max_item_size."""
+    f = io.StringIO('[{"id": "' + "x" * 10_000)
+    items = _iter_json_array(f, chunk_size=64, max_item_size=1_000)
+    with pytest.raises(json.JSONDecodeError):
+        next(items)
+    assert f.tell() <= 1_200
+
+
+def test_iter_json_array_waits_for_truncated_number():
+    """Число, разорванное границей блока, дочитывается, а не считается ошибкой."""
+    f = io.StringIO("[" + ", ".join(["12345.678e-2"] * 100) + "]")
+    assert list(_iter_json_array(f, chunk_size=5)) == [123.45678] * 100
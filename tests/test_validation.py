@@ -0,0 +1,79 @@
+import logging
+
+import pytest
+
+from src.utils.utils import load_operations_from_json
+from src.utils.validation import (
+    REQUIRED,
+    RejectionReport,
+    compile_validator,
+    filter_valid,
+    validate_operation,
+)
+
+VALID = {
+    "id": 1,
+    "state": "EXECUTED",
+    "date": "2019-08-26T10:50:58.294041",
+    "operationAmount": {"amount": "1.00", "currency": {"name": "руб.", "code": "RUB"}},
+    "description": "Перевод",
+}
+
+
+@pytest.mark.parametrize(
+    "item, reason",
+    [
+        (VALID, None),
+        ([], "элемент не является словарем"),
+        ({**VALID, "state": None}, "нет поля 'state'"),
+        (
+            {k: v for k, v in VALID.items() if k != "description"},
+            "нет поля 'description'",
+        ),
+        (
+            {**VALID, "operationAmount": "1.00"},
+            "'operationAmount' не является словарем",
+        ),
+        (
+            {**VALID, "operationAmount": {"amount": "1.00"}},
+            "нет поля 'operationAmount.currency'",
+        ),
+        (
+            {**VALID, "operationAmount": {"amount": "1", "currency": {"name": "руб."}}},
+            "нет поля 'operationAmount.currency.code'",
+        ),
+    ],
+)
+def test_validate_operation_reasons(item, reason):
+    assert validate_operation(item) == reason
+
+
+def test_compile_validator_rejects_unknown_rule():
+    with pytest.raises(ValueError):
+        compile_validator({"id": int})
+    assert compile_validator({"id": REQUIRED})({"id": 0}) is None
+
+
+def test_report_counts_all_but_samples_are_bounded(caplog):
+    items = [VALID] + [{"id": i} for i in range(100)] + [None]
+    report = RejectionReport(sample_size=3)
+    assert list(filter_valid(items, report)) == [VALID]
+    assert report.total == 101
+    assert report.counts == {"нет поля 'state'": 100, "элемент не является словарем": 1}
+    assert [index for index, _, _ in report.samples] == [1, 2, 3]
+
+    with caplog.at_level(logging.WARNING):
+        report.log(logging.getLogger("test"), "source.json")
+    assert len(caplog.records) == 1
+    assert "пропущено 101" in caplog.records[0].getMessage()
+
+
+def test_loader_logs_one_summary(tmp_path, caplog):
+    path = tmp_path / "ops.json"
+    path.write_text(
+        "[" + ",".join(['{"id": 1}'] * 50 + ['"строка"']) + "]", encoding="utf-8"
+    )
+    with caplog.at_level(logging.WARNING, logger="src.utils.utils"):
+        assert load_operations_from_json(str(path)) == []
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 1
@@ -0,0 +1,117 @@
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from openpyxl import Workbook
+
+from src.file_operations.file_operations import read_operations_from_excel
+from src.file_operations.xlsx_reader import (
+    iter_operations_from_xlsx,
+    iter_xlsx_rows,
+    read_operations_from_xlsx,
+)
+
+HEADERS = [
+    "id",
+    "state",
+    "date",
+    "amount",
+    "currency_name",
+    "currency_code",
+    "description",
+    "from",
+    "to",
+]
+
+ROWS = [
+    [
+        1,
+        "executed",
+        datetime(2023, 1, 15, 12, 0, 0),
+        100.5,
+        "Рубли",
+        "RUB",
+        "Оплата",
+        "Карта 1",
+        None,
+    ],
+    [None, None, None, None, None, None, "Пустая строка", None, None],
+    [
+        2,
+        "PENDING",
+        "2023-01-16",
+        "not_a_number",
+        "Доллары",
+        "USD",
+        "Перевод",
+        None,
+        None,
+    ],
+    [3, "CANCELED", "2023-01-17", 7, "Евро", "EUR", "Покупка", "Счет 3", "Счет 4"],
+    [4, "EXECUTED", "2023-01-18", None, "Евро", "EUR", "Без суммы", None, None],
+]
+
+
+@pytest.fixture(params=[False, True], ids=["shared_strings", "inline_strings"])
+def excel_file(tmp_path, request):
+    """Книга с общими строками (обычный режим) и со встроенными строками (write_only)."""
+    workbook = Workbook(write_only=request.param)
+    sheet = workbook.create_sheet() if request.param else workbook.active
+    sheet.append(HEADERS)
+    for row in ROWS:
+        sheet.append(row)
+    path = tmp_path / "operations.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+def test_read_operations_from_xlsx_matches_openpyxl_reader(excel_file):
+    """XML-парсер возвращает те же словари, что и read_operations_from_excel."""
+    result = read_operations_from_xlsx(excel_file)
+    assert result == read_operations_from_excel(excel_file)
+    assert [op["id"] for op in result] == [1, 3]
+    assert result[0]["date"] == "2023-01-15T12:00:00Z"
+
+
+def test_xlsx_row_errors_logged_like_openpyxl_reader(excel_file):
+    """Ошибки строк записываются в лог в том же формате, что и у openpyxl-загрузчика."""
+    with patch("src.file_operations.xlsx_reader.logger") as xlsx_logger:
+        read_operations_from_xlsx(excel_file)
+    with patch("src.file_operations.file_operations.logger") as openpyxl_logger:
+        read_operations_from_excel(excel_file)
+    assert xlsx_logger.error.call_args_list == openpyxl_logger.error.call_args_list
+    assert len(xlsx_logger.error.call_args_list) == 2
+
+
+def test_iter_xlsx_rows_values(excel_file):
+    rows = list(iter_xlsx_rows(excel_file, chunk_size=64))
+    assert rows[0] == (1, HEADERS)
+    number, values = rows[1]
+    assert number == 2
+    assert values[0] == 1
+    assert values[2] == datetime(2023, 1, 15, 12, 0, 0)
+    assert values[3] == 100.5
+
+
+def test_read_operations_from_xlsx_sample_file():
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "data", "transactions_excel.xlsx"
+    )
+    assert read_operations_from_xlsx(path) == read_operations_from_excel(path)
+
+
+def test_read_operations_from_xlsx_missing_headers(tmp_path):
+    workbook = Workbook()
+    workbook.active.append(["id", "state"])
+    workbook.active.append([1, "EXECUTED"])
+    path = tmp_path / "bad_headers.xlsx"
+    workbook.save(path)
+    assert read_operations_from_xlsx(str(path)) == []
+
+
+def test_read_operations_from_xlsx_invalid_file(tmp_path):
+    path = tmp_path / "broken.xlsx"
+    path.write_bytes(b"not a zip")
+    assert read_operations_from_xlsx(str(path)) == []
+    assert list(iter_operations_from_xlsx(str(tmp_path / "missing.xlsx"))) == []